@@ -10,6 +10,17 @@ if str(project_root) not in sys.path:
 # Switch to control whether to hide TOOLS instruction content
 class AppConfig:
     HIDE_TOOLS_CONTENT = False
+    # Connection pool limits for the shared async LLM client
+    LLM_MAX_CONNECTIONS = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+    # Number of pre-initialized Manus agents kept for tool requests
+    AGENT_POOL_SIZE = 2
+    # Minimum interval between tool progress re-renders in the chat UI (ms)
+    PROGRESS_UPDATE_INTERVAL_MS = 250
+    # Streaming render throttling: target frames per second and the pending
+    # output size (bytes) that forces an early frame
+    RENDER_FPS = 20
+    RENDER_FLUSH_BYTES = 2048
 
 
 # =====================================================================
@@ -17,8 +28,11 @@ class AppConfig:
 # =====================================================================
 # Initialize OpenAI client, configured to use DeepSeek's API service
 # Note: API key is hardcoded; in production, use environment variables or config files
+# The client is asynchronous and shared by all sessions, so one slow stream
+# never blocks the event loop that serves the other Gradio sessions.
 # IMPORT APP MAIN KEY
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 try:
     from key.key import MAIN_APP_KEY, MAIN_APP_URL
@@ -29,7 +43,13 @@ except ImportError:
     MAIN_APP_URL = "" 
 
 
-client = OpenAI(
+client = AsyncOpenAI(
     api_key=MAIN_APP_KEY,
-    base_url=MAIN_APP_URL
-)
\ No newline at end of file
+    base_url=MAIN_APP_URL,
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=AppConfig.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=AppConfig.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        )
+    ),
+)
@@ -15,6 +15,7 @@ from watchdog.events import FileSystemEventHandler
 # 导入应用的核心组件
 from app.llm import chat_with_cfo
 from app.config import AppConfig
+from app.tools.ToolsProcessor import ToolsProcessor
 from app.interface.file_manager import (
     FileChangeHandler, 
     create_file_directories, 
@@ -24,6 +25,8 @@ from app.interface.file_manager import (
     generate_file_list_html
 )
 
+from app.interface.render import convert_to_messages_format, update_messages_format
+
 # 导入CSS和JS
 from app.interface.ui_assets import get_css, get_ui_js, get_sidebar_js
 
@@ -160,6 +163,9 @@ def create_interface():
             outputs=[file_list, gr.HTML()]
         )
         
+        # 预热 Manus agent 池（幂等，仅首次加载时创建 agent）
+        demo.load(fn=ToolsProcessor.warm_up_agents, inputs=None, outputs=None)
+        
         # 隐藏TOOLS内容切换事件
         hide_tools_toggle.change(
             fn=update_hide_tools_setting,
@@ -324,16 +330,6 @@ def refresh_file_list(session_dir):
     files = get_directory_files(Path(session_dir))
     return generate_file_list_html(files)
 
-# 消息格式转换
-def convert_to_messages_format(conversation):
-    """将对话历史转换为消息格式"""
-    messages = []
-    for msg in conversation:
-        # 只包含用户和助手消息（跳过系统消息）
-        if msg["role"] in ["user", "assistant"]:
-            messages.append({"role": msg["role"], "content": msg["content"]})
-    return messages
-
 # 消息渲染函数
 def format_message(msg):
     """格式化聊天消息，增强工具进度显示"""
@@ -428,9 +424,12 @@ async def respond(user_message, conversation, generating):
         return
     
     # 调用chat_with_cfo函数获取流式回复
+    messages, converted = [], 0
     async for updated_conv, _debug, is_generating in chat_with_cfo(conversation, user_message):
+        # 增量转换：只更新最后一条消息，不再每帧重新转换全部历史
+        converted = update_messages_format(messages, updated_conv, converted)
         # 返回更新后的对话历史和状态
-        yield convert_to_messages_format(updated_conv), updated_conv, "", is_generating
+        yield list(messages), updated_conv, "", is_generating
 
 # 切换按钮可见性
 def toggle_button_visibility(generating):
@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import time
+
+from app.config import AppConfig
+
+
+# =====================================================================
+# 渲染节流（帧合并）
+# =====================================================================
+class FrameCoalescer:
+    """
+    将流式输出的多个 token 合并为一帧再刷新界面
+
+    满足任一条件即刷新：
+        1. 距上一帧已超过 1 / fps 秒
+        2. 未刷新的内容累计达到 max_pending_bytes
+    """
+
+    def __init__(self, fps=None, max_pending_bytes=None):
+        """
+        Parameters:
+            fps (float): 目标刷新帧率，默认 AppConfig.RENDER_FPS
+            max_pending_bytes (int): 未刷新内容达到该字节数时立即刷新，默认 AppConfig.RENDER_FLUSH_BYTES
+        """
+        fps = fps or AppConfig.RENDER_FPS
+        self.interval = 1.0 / fps
+        self.max_pending_bytes = max_pending_bytes or AppConfig.RENDER_FLUSH_BYTES
+        self.pending_bytes = 0
+        self.frames = 0
+        self._last_flush = 0.0
+
+    def add(self, content):
+        """
+        记录新的输出内容，返回本次是否应该刷新界面
+
+        Parameters:
+            content (str): 新增的文本片段
+        """
+        self.pending_bytes += len(content.encode("utf-8"))
+        now = time.monotonic()
+        if self.pending_bytes >= self.max_pending_bytes or now - self._last_flush >= self.interval:
+            self.pending_bytes = 0
+            self.frames += 1
+            self._last_flush = now
+            return True
+        return False
+
+
+# =====================================================================
+# 消息格式转换
+# =====================================================================
+def convert_to_messages_format(conversation):
+    """将对话历史转换为消息格式"""
+    messages = []
+    for msg in conversation:
+        # 只包含用户和助手消息（跳过系统消息）
+        if msg["role"] in ["user", "assistant"]:
+            messages.append({"role": msg["role"], "content": msg["content"]})
+    return messages
+
+
+def update_messages_format(messages, conversation, converted):
+    """
+    convert_to_messages_format 的增量版本
+
+    流式输出只会原地修改最后一条消息或追加新消息，因此只需重新转换
+    上次的最后一条及之后新增的消息，每帧开销与历史长度无关。
+
+    Parameters:
+        messages (list): 上一次的转换结果，原地更新
+        conversation (list): 当前对话历史
+        converted (int): 上一次已转换的对话条数
+
+    Returns:
+        int: 本次已转换的对话条数（传给下一次调用）
+    """
+    start = max(converted - 1, 0)
+    if converted and messages and conversation[start]["role"] in ["user", "assistant"]:
+        messages.pop()
+    for msg in conversation[start:]:
+        if msg["role"] in ["user", "assistant"]:
+            messages.append({"role": msg["role"], "content": msg["content"]})
+    return len(conversation)
@@ -5,8 +5,9 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from app.logger import logger
-from app.config import client
+from app.config import AppConfig, client
 from app.tools.ToolsProcessor import ToolsProcessor
+from app.interface.render import FrameCoalescer
 import asyncio
 
 
@@ -27,7 +28,7 @@ async def chat_with_cfo(conversation, user_message: str):
     Workflow:
         1. Add user message to dialogue history
         2. Construct complete message list, including system prompt and dialogue history
-        3. Call DeepSeek API to get streaming response
+        3. Call DeepSeek API (shared async client) to get streaming response
         4. Receive and process response incrementally, update dialogue history
         5. Return updated dialogue history in real-time
     """
@@ -86,7 +87,7 @@ async def chat_with_cfo(conversation, user_message: str):
 
     try:
         # Call DeepSeek API, enable streaming response
-        stream = client.chat.completions.create(
+        stream = await client.chat.completions.create(
             model="deepseek-chat",
             messages=messages,
             stream=True,
@@ -101,9 +102,11 @@ async def chat_with_cfo(conversation, user_message: str):
 
     # List for accumulating partial responses
     partial_response = []
+    # Coalesce chunks into frames instead of re-rendering on every token
+    frames = FrameCoalescer()
     
     # Process streaming response chunk by chunk
-    for chunk in stream:
+    async for chunk in stream:
         # Safely extract this increment's content
         try:
             content = chunk.choices[0].delta.content
@@ -121,11 +124,11 @@ async def chat_with_cfo(conversation, user_message: str):
             else:
                 updated_conv[-1]["content"] = current_text
 
-            # Return updated dialogue history, generating state
-            yield updated_conv, "", True
-            
-            # Brief delay to avoid interface becoming unresponsive due to too frequent updates
-            await asyncio.sleep(0.05)
+            # Return updated dialogue history, generating state (at most one frame per interval)
+            if frames.add(content):
+                yield updated_conv, "", True
+
+    # Any content still pending is rendered by the next yield below
 
     # Complete LLM response
     final_response = "".join(partial_response)
@@ -145,41 +148,68 @@ async def chat_with_cfo(conversation, user_message: str):
             # Return update to show tool processing has started
             yield updated_conv, "", True
             
-            # Set up progress tracking
+            # Progress events from the agent flow through this queue so they can be
+            # yielded to the UI while the tool request is still running
             progress_updates = []
-            
-            # Progress callback function
+            progress_events = asyncio.Queue()
+            base_content = updated_conv[-1]["content"]
+
+            # Progress callback function (called on this event loop by the agent)
             def progress_handler(message):
-                progress_updates.append(message)
-                # Update conversation with progress in real-time
-                if updated_conv[-1]["role"] == "assistant":
-                    current_content = updated_conv[-1]["content"]
-                    if "[Tool Processing Progress]" not in current_content:
-                        updated_content = f"{current_content}\n\n[Tool Processing Progress]\n{message}"
-                    else:
-                        parts = current_content.split("[Tool Processing Progress]")
-                        updated_content = f"{parts[0]}[Tool Processing Progress]{parts[1]}\n{message}"
-                    
-                    updated_conv[-1]["content"] = updated_content
-                    # We can't yield here directly - we'll store updates and process them later
-            
-            # Process the tool request with progress tracking
-            tools_result = await ToolsProcessor.process_tools_request_async_with_progress(
-                tools_content, progress_callback=progress_handler
+                progress_events.put_nowait(message)
+
+            def render_progress(footer=""):
+                progress_text = "\n".join(progress_updates)
+                updated_conv[-1]["content"] = f"{base_content}\n\n[Tool Processing Progress]\n{progress_text}{footer}"
+
+            # Run the tool request in the background and stream its progress
+            tools_task = asyncio.create_task(
+                ToolsProcessor.process_tools_request_async_with_progress(
+                    tools_content, progress_callback=progress_handler
+                )
             )
-            
+            interval = AppConfig.PROGRESS_UPDATE_INTERVAL_MS / 1000
+            loop = asyncio.get_running_loop()
+            last_render = 0.0
+            pending = False  # progress received but not rendered yet
+            try:
+                while not tools_task.done() or not progress_events.empty():
+                    # Nothing to show: wait for the next event or for the task to finish
+                    if progress_events.empty() and not pending:
+                        next_event = asyncio.create_task(progress_events.get())
+                        await asyncio.wait({next_event, tools_task}, return_when=asyncio.FIRST_COMPLETED)
+                        if next_event.done():
+                            progress_updates.append(next_event.result())
+                            pending = True
+                        else:
+                            next_event.cancel()
+
+                    # Coalesce everything queued so far into one render
+                    while not progress_events.empty():
+                        progress_updates.append(progress_events.get_nowait())
+                        pending = True
+
+                    if not pending or tools_task.done():
+                        continue
+                    wait = last_render + interval - loop.time()
+                    if wait > 0:
+                        # Let more events accumulate, but stop waiting if the task ends
+                        await asyncio.wait({tools_task}, timeout=wait)
+                        continue
+                    render_progress()
+                    last_render = loop.time()
+                    pending = False
+                    yield updated_conv, "", True
+
+                tools_result = await tools_task
+            finally:
+                # The generator was closed (e.g. the user left the page); stop the tool run
+                if not tools_task.done():
+                    tools_task.cancel()
+
             # After tool execution, update conversation with latest progress
             if updated_conv[-1]["role"] == "assistant":
-                current_content = updated_conv[-1]["content"]
-                if "[Tool Processing Progress]" in current_content:
-                    progress_text = "\n".join(progress_updates)
-                    parts = current_content.split("[Tool Processing Progress]")
-                    updated_content = f"{parts[0]}[Tool Processing Progress]\n{progress_text}\n\n[Tool Execution Complete]"
-                else:
-                    progress_text = "\n".join(progress_updates)
-                    updated_content = f"{current_content}\n\n[Tool Processing Progress]\n{progress_text}\n\n[Tool Execution Complete]"
-                
-                updated_conv[-1]["content"] = updated_content
+                render_progress("\n\n[Tool Execution Complete]")
                 yield updated_conv, "", True
             
             # Now generate a summary of the tool results
@@ -213,7 +243,7 @@ async def chat_with_cfo(conversation, user_message: str):
             
             try:
                 # Call DeepSeek API for summary
-                summary_stream = client.chat.completions.create(
+                summary_stream = await client.chat.completions.create(
                     model="deepseek-chat",
                     messages=summary_messages,
                     stream=True,
@@ -223,8 +253,9 @@ async def chat_with_cfo(conversation, user_message: str):
                 
                 # Process summary stream
                 summary_parts = []
+                summary_frames = FrameCoalescer()
                 
-                for chunk in summary_stream:
+                async for chunk in summary_stream:
                     try:
                         content = chunk.choices[0].delta.content
                     except Exception:
@@ -242,8 +273,8 @@ async def chat_with_cfo(conversation, user_message: str):
                         else:
                             updated_conv[-1]["content"] = f"{current_content}\n\n[Tool Execution Summary]\n{current_summary}"
                         
-                        yield updated_conv, "", True
-                        await asyncio.sleep(0.05)
+                        if summary_frames.add(content):
+                            yield updated_conv, "", True
                 
                 # Final summary
                 final_summary = "".join(summary_parts)
@@ -0,0 +1,154 @@
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+from app.logger import logger
+from contextlib import asynccontextmanager
+import asyncio
+
+
+# =====================================================================
+# Agent Pool Module
+# =====================================================================
+class AgentPool:
+    """
+    Pool of pre-initialized agents shared by tool requests
+
+    Building a Manus agent rebuilds its ToolCollection and tool models, so the pool
+    keeps a few idle agents ready, resets their state between requests and
+    bounds the number of agents running at the same time.
+
+    Agents that fail (an exception escapes the request, or the agent's last run
+    raised and set its `failed` flag even though the caller handled the error)
+    are evicted: their resources are released and a fresh agent takes their
+    place on the next acquire.
+
+    The pool is bound to the event loop it is first used on. Requests coming
+    from another loop (e.g. the synchronous wrapper running its own loop in a
+    thread) get a one-off agent that is cleaned up after use.
+    """
+
+    def __init__(self, factory, size=2):
+        """
+        Parameters:
+            factory (callable): Function returning a new agent instance
+            size (int): Maximum number of agents (idle + running)
+        """
+        self.factory = factory
+        self.size = max(1, int(size))
+        self._idle = []
+        self._semaphore = None
+        self._loop = None
+        self._warmed_up = False
+        self.stats = {"created": 0, "reused": 0, "evicted": 0, "one_off": 0}
+
+    def _bind_loop(self):
+        """Bind the pool to the running loop; return False if it belongs to another loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.size)
+        return self._loop is loop
+
+    def _create_agent(self, pooled=True):
+        """Create a new agent, keeping its tool resources alive across runs if pooled"""
+        agent = self.factory()
+        if pooled and hasattr(agent, "cleanup_on_finish"):
+            agent.cleanup_on_finish = False
+        self.stats["created"] += 1
+        return agent
+
+    async def warm_up(self):
+        """Pre-create agents up to the pool size (idempotent)"""
+        if self._warmed_up or not self._bind_loop():
+            return
+        self._warmed_up = True
+        missing = self.size - len(self._idle)
+        for _ in range(missing):
+            try:
+                self._idle.append(self._create_agent())
+            except Exception as e:
+                logger.error(f"Agent pool warm-up failed: {e}")
+                break
+        logger.info(f"Agent pool warmed up with {len(self._idle)} agent(s)")
+
+    @asynccontextmanager
+    async def acquire(self, progress_callback=None):
+        """
+        Borrow an agent for one request
+
+        Parameters:
+            progress_callback (callable): Progress callback attached for this request only
+
+        Yields:
+            Agent instance in IDLE state with empty memory
+        """
+        if not self._bind_loop():
+            self.stats["one_off"] += 1
+            agent = self._create_agent(pooled=False)
+            if progress_callback and hasattr(agent, "set_progress_callback"):
+                agent.set_progress_callback(progress_callback)
+            try:
+                yield agent
+            finally:
+                await self._close_agent(agent)
+            return
+
+        async with self._semaphore:
+            if self._idle:
+                agent = self._idle.pop()
+                self.stats["reused"] += 1
+            else:
+                agent = self._create_agent()
+
+            if progress_callback and hasattr(agent, "set_progress_callback"):
+                agent.set_progress_callback(progress_callback)
+
+            failed = False
+            try:
+                yield agent
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                if failed or getattr(agent, "failed", False):
+                    await self.evict(agent)
+                else:
+                    await self._release(agent)
+
+    async def _release(self, agent):
+        """Reset an agent and return it to the idle list"""
+        try:
+            # Release per-request tool state (browser session, etc.) but keep the agent
+            await self._close_agent(agent)
+            if hasattr(agent, "reset"):
+                agent.reset()
+        except Exception as e:
+            logger.error(f"Failed to reset pooled agent, evicting it: {e}")
+            self.stats["evicted"] += 1
+            return
+        self._idle.append(agent)
+
+    async def evict(self, agent):
+        """Drop an agent from the pool after releasing its resources"""
+        self.stats["evicted"] += 1
+        logger.warning("Evicting agent from pool after error")
+        await self._close_agent(agent)
+
+    @staticmethod
+    async def _close_agent(agent):
+        """Run agent cleanup, logging instead of raising on failure"""
+        try:
+            await agent.cleanup()
+        except Exception as e:
+            logger.error(f"Error cleaning up agent: {e}")
+
+    async def close(self):
+        """Clean up all idle agents"""
+        idle, self._idle = self._idle, []
+        for agent in idle:
+            await self._close_agent(agent)
+        self._warmed_up = False
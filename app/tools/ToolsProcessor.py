@@ -7,6 +7,7 @@ if str(project_root) not in sys.path:
 
 from app.config import AppConfig
 from app.logger import logger
+from app.tools.AgentPool import AgentPool
 import asyncio
 
 
@@ -27,6 +28,16 @@ except ImportError as e:
 
 
 
+def create_manus_agent():
+    """Factory used by the agent pool; imports Manus lazily so import errors surface per request"""
+    from open_manus.app.agent.manus import Manus
+    return Manus()
+
+
+# Shared pool of pre-initialized Manus agents
+agent_pool = AgentPool(create_manus_agent, size=AppConfig.AGENT_POOL_SIZE)
+
+
 # =====================================================================
 # Tools Processing Module
 # =====================================================================
@@ -38,6 +49,14 @@ class ToolsProcessor:
     from LLM responses and determining subsequent actions based on instruction status
     """
     
+    @staticmethod
+    async def warm_up_agents():
+        """Pre-create the pooled Manus agents so the first tool request skips construction"""
+        try:
+            await agent_pool.warm_up()
+        except Exception as e:
+            logger.error(f"Error warming up agent pool: {e}")
+    
     @staticmethod
     def extract_tools_content(message):
         """Extract TOOLS instruction content from a message"""
@@ -92,52 +111,44 @@ class ToolsProcessor:
                     progress_callback(f"Failed to import Manus module: {e}")
                 return f"Tool initialization failed: Cannot import Manus module ({e})"
             
-            # Create Manus agent instance
-            agent = Manus()
-            
-            # Set progress callback if provided
-            if progress_callback:
-                agent.set_progress_callback(progress_callback)
-                progress_callback("Manus agent initialized")
-            
-            try:
-                # Ensure prompt is not empty
-                if not content.strip():
-                    logger.warning("Received empty tool request")
-                    if progress_callback:
-                        progress_callback("Tool request content is empty")
-                    return "Tool request content is empty, cannot process"
-                
-                logger.info(f"Submitting request to Open Manus: {content}")
+            # Ensure prompt is not empty
+            if not content.strip():
+                logger.warning("Received empty tool request")
                 if progress_callback:
-                    progress_callback(f"Starting execution with prompt: {content[:100]}...")
-                
-                # Run the agent with the provided content
-                result = await agent.run(content)
-                
-                logger.info("Open Manus toolchain execution completed")
+                    progress_callback("Tool request content is empty")
+                return "Tool request content is empty, cannot process"
+            
+            # Borrow a pre-initialized Manus agent from the pool; it is reset and
+            # returned afterwards, or evicted if the run fails
+            async with agent_pool.acquire(progress_callback) as agent:
                 if progress_callback:
-                    progress_callback("Tool execution completed successfully")
+                    progress_callback("Manus agent initialized")
                 
-                return result
-                
-            except Exception as e:
-                logger.error(f"Error executing Open Manus toolchain: {e}")
-                if progress_callback:
-                    progress_callback(f"Error during execution: {str(e)}")
-                return f"Tool execution failed: {str(e)}"
-            finally:
-                # Ensure resources are cleaned up
-                logger.info("Cleaning up Open Manus resources")
-                if progress_callback:
-                    progress_callback("Cleaning up resources")
-                await agent.cleanup()
+                try:
+                    logger.info(f"Submitting request to Open Manus: {content}")
+                    if progress_callback:
+                        progress_callback(f"Starting execution with prompt: {content[:100]}...")
+                    
+                    # Run the agent with the provided content
+                    result = await agent.run(content)
+                    
+                    logger.info("Open Manus toolchain execution completed")
+                    if progress_callback:
+                        progress_callback("Tool execution completed successfully")
+                    
+                    return result
+                    
+                finally:
+                    # Resources are released by the pool when the agent is returned
+                    logger.info("Cleaning up Open Manus resources")
+                    if progress_callback:
+                        progress_callback("Cleaning up resources")
                 
         except Exception as e:
-            logger.error(f"Error initializing Open Manus agent: {e}")
+            logger.error(f"Error executing Open Manus toolchain: {e}")
             if progress_callback:
-                progress_callback(f"Tool initialization error: {str(e)}")
-            return f"Tool initialization failed: {str(e)}"
+                progress_callback(f"Error during execution: {str(e)}")
+            return f"Tool execution failed: {str(e)}"
         finally:
             # Restore original logging configuration
             if progress_callback:
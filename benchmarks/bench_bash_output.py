@@ -0,0 +1,112 @@
+"""
+Benchmark for reading command output in the local Bash tool session.
+
+Runs a command that writes --megabytes MB to stdout, then --short quick
+commands, through two session implementations:
+
+- polling: the previous reader, which sleeps 0.2 s between polls and decodes
+  the whole StreamReader buffer on every poll to look for the sentinel
+- streaming: _BashSession, where reader tasks consume both pipes as data
+  arrives and keep only the head and tail of large outputs
+
+asyncio pauses a pipe once ~128 KB sit unread in its StreamReader, so the
+polling reader never sees the sentinel of a large output and runs into
+--timeout.
+
+Usage:
+    python benchmarks/bench_bash_output.py --megabytes 50 --short 20
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import os
+import signal
+import time
+
+from open_manus.app.tool.bash import _BashSession
+
+
+class PollingSession:
+    """The previous _BashSession reader, kept for comparison"""
+
+    sentinel = "<<exit>>"
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_shell(
+            "/bin/bash",
+            preexec_fn=os.setsid,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+    def stop(self) -> None:
+        if self.process.returncode is None:
+            self.process.kill()
+
+    async def run(self, command: str) -> str:
+        self.process.stdin.write(command.encode() + f"; echo '{self.sentinel}'\n".encode())
+        await self.process.stdin.drain()
+        async with asyncio.timeout(self.timeout):
+            while True:
+                await asyncio.sleep(0.2)
+                output = self.process.stdout._buffer.decode()
+                if self.sentinel in output:
+                    output = output[: output.index(self.sentinel)]
+                    break
+        self.process.stdout._buffer.clear()
+        self.process.stderr._buffer.clear()
+        return output
+
+
+async def measure(session, megabytes: int, short: int) -> tuple:
+    await session.start()
+    try:
+        start = time.perf_counter()
+        try:
+            result = await session.run(f"head -c {megabytes * 1024 * 1024} /dev/zero | tr '\\0' x")
+            big = time.perf_counter() - start
+            kept = len(result if isinstance(result, str) else result.output)
+        except (TimeoutError, Exception) as e:
+            return f"failed after {time.perf_counter() - start:.1f}s ({type(e).__name__})", None, None
+
+        start = time.perf_counter()
+        for i in range(short):
+            await session.run(f"echo {i}")
+        per_command = (time.perf_counter() - start) / short
+        return f"{big * 1000:.0f}ms", per_command, kept
+    finally:
+        # Kill the whole process group; a stalled pipeline keeps the pipes open
+        process = session.process if isinstance(session, PollingSession) else session._process
+        session.stop()
+        os.killpg(process.pid, signal.SIGKILL)
+        if isinstance(session, PollingSession):
+            # Drain to EOF, otherwise the paused pipe is never closed
+            await process.stdout.read()
+        await process.wait()
+
+
+async def main(megabytes: int, short: int, timeout: float) -> None:
+    print(f"{megabytes} MB of output, then {short} short commands\n")
+    print(f"{'reader':<10} {'large output':>28} {'per short cmd':>14} {'chars kept':>11}")
+    for name, session in (("polling", PollingSession(timeout)), ("streaming", _BashSession())):
+        big, per_command, kept = await measure(session, megabytes, short)
+        per_command = f"{per_command * 1000:.1f}ms" if per_command is not None else "-"
+        print(f"{name:<10} {big:>28} {per_command:>14} {kept if kept is not None else '-':>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megabytes", type=int, default=50)
+    parser.add_argument("--short", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.megabytes, args.short, args.timeout))
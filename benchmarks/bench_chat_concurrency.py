@@ -0,0 +1,95 @@
+"""
+Concurrency benchmark for the front-end dialogue path (app.llm.chat_with_cfo).
+
+Starts a local OpenAI-compatible streaming stub, points the shared async client
+at it and runs N chat sessions at the same time. If the sessions stream
+concurrently, the wall time stays close to the time of a single session instead
+of growing linearly with N.
+
+Usage:
+    python benchmarks/bench_chat_concurrency.py --sessions 1 8 32 --chunks 20 --delay 0.02
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import json
+import time
+
+from aiohttp import web
+from openai import AsyncOpenAI
+
+import app.llm as chat_module
+
+
+def make_stub_app(chunks: int, delay: float) -> web.Application:
+    """Build an aiohttp app that streams `chunks` SSE deltas, `delay` seconds apart"""
+
+    async def completions(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for i in range(chunks):
+            payload = {
+                "id": "bench",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "deepseek-chat",
+                "choices": [{"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(payload)}\n\n".encode())
+            await asyncio.sleep(delay)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    stub = web.Application()
+    stub.router.add_post("/v1/chat/completions", completions)
+    return stub
+
+
+async def run_session() -> int:
+    """Run one chat session to completion and return the number of UI updates"""
+    updates = 0
+    async for _conv, _debug, _generating in chat_module.chat_with_cfo([], "hello"):
+        updates += 1
+    return updates
+
+
+async def main(sessions: list, chunks: int, delay: float, port: int):
+    runner = web.AppRunner(make_stub_app(chunks, delay))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+
+    chat_module.client = AsyncOpenAI(api_key="bench", base_url=f"http://127.0.0.1:{port}/v1")
+    try:
+        # Warm up the connection pool
+        await run_session()
+
+        single = None
+        print(f"{'sessions':>8} {'wall (s)':>10} {'serialized (s)':>15} {'speedup':>8}")
+        for n in sessions:
+            start = time.perf_counter()
+            await asyncio.gather(*(run_session() for _ in range(n)))
+            elapsed = time.perf_counter() - start
+            if single is None:
+                single = elapsed / n
+            serialized = single * n
+            print(f"{n:>8} {elapsed:>10.3f} {serialized:>15.3f} {serialized / elapsed:>8.1f}x")
+    finally:
+        await chat_module.client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--chunks", type=int, default=20, help="Streamed chunks per response")
+    parser.add_argument("--delay", type=float, default=0.02, help="Seconds between chunks")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.chunks, args.delay, args.port))
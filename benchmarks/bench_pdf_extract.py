@@ -0,0 +1,115 @@
+"""
+Benchmark for PDF page extraction on a generated multi-hundred-page PDF.
+
+Each scenario extracts every page while a ticker task measures how long the
+event loop is blocked (the largest gap between 10 ms ticks):
+
+- legacy: page.get_text() for every page inline in the coroutine
+- pool cold: PDFTextExtractor without cache, page ranges in a process pool
+- cache cold: with an empty page cache (parse + store)
+- cache warm: same file again, served from the page cache
+
+Usage:
+    python benchmarks/bench_pdf_extract.py --pages 400 --workers 4
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from open_manus.app.tool.pdf_extract import PDFPageCache, PDFTextExtractor
+
+
+def make_pdf(path: Path, pages: int) -> None:
+    """Write a text-heavy PDF resembling an annual report"""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        lines = [
+            f"Note {i}.{j}: Segment revenue {1000 + i * 7 + j} million, operating margin {j % 30}.{i % 10}%."
+            for j in range(60)
+        ]
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), "\n".join(lines), fontsize=7)
+    doc.save(str(path))
+    doc.close()
+
+
+async def ticker(gaps: list, stop: asyncio.Event, interval: float = 0.01) -> None:
+    """Record the largest delay between consecutive ticks"""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        gaps.append(now - last - interval)
+        last = now
+
+
+async def measure(extract) -> tuple:
+    gaps: list = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(gaps, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    chars = await extract()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, max(gaps, default=0.0), chars
+
+
+async def legacy(path: Path) -> int:
+    doc = fitz.open(path)
+    text = ""
+    for page in doc:
+        text += page.get_text()
+    return len(text)
+
+
+async def extractor_run(extractor: PDFTextExtractor, path: Path) -> int:
+    return sum([len(text) async for _, text, _ in extractor.iter_pages(path)])
+
+
+async def main(pages: int, workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "report.pdf"
+        make_pdf(pdf_path, pages)
+        size_mb = pdf_path.stat().st_size / 1024 / 1024
+        print(f"Generated {pages}-page PDF ({size_mb:.1f} MB), {workers} workers\n")
+
+        pool = PDFTextExtractor(cache=None, max_workers=workers)
+        cached = PDFTextExtractor(
+            cache=PDFPageCache(Path(tmp) / "pages.sqlite"), max_workers=workers
+        )
+        # Start the worker processes outside the timed runs
+        await extractor_run(pool, pdf_path)
+        cached._executor = pool._get_executor()
+
+        scenarios = [
+            ("legacy", lambda: legacy(pdf_path)),
+            ("pool cold", lambda: extractor_run(pool, pdf_path)),
+            ("cache cold", lambda: extractor_run(cached, pdf_path)),
+            ("cache warm", lambda: extractor_run(cached, pdf_path)),
+        ]
+        print(f"{'scenario':<12} {'wall':>9} {'max loop stall':>15} {'chars':>10}")
+        for name, run in scenarios:
+            elapsed, stall, chars = await measure(run)
+            print(f"{name:<12} {elapsed * 1000:>7.0f}ms {stall * 1000:>13.1f}ms {chars:>10}")
+
+        cached.cache.close()
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.workers))
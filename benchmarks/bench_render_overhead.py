@@ -0,0 +1,107 @@
+"""
+Per-token render overhead of the chat stream against conversation length.
+
+Replays a streamed reply through the two rendering paths used by the Gradio
+front end and measures the CPU time spent per token:
+
+- baseline: one frame per token, every frame re-converts the whole history
+  with convert_to_messages_format (the pre-throttling behaviour)
+- coalesced: FrameCoalescer decides when to emit a frame and frames are built
+  incrementally with update_messages_format
+
+The coalescer is time based, so the benchmark feeds tokens at a fixed
+simulated rate (--tps tokens per second) without sleeping.
+
+Usage:
+    python benchmarks/bench_render_overhead.py --history 10 100 1000 --tokens 500
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import time
+from unittest import mock
+
+from app.interface import render
+from app.interface.render import FrameCoalescer, convert_to_messages_format, update_messages_format
+
+
+def build_history(n: int) -> list:
+    """Alternate user / assistant turns of realistic length"""
+    history = []
+    for i in range(n):
+        role = "user" if i % 2 == 0 else "assistant"
+        history.append({"role": role, "content": f"Message {i}: " + "quarterly revenue analysis " * 30})
+    return history
+
+
+def serialize(messages: list) -> int:
+    """Stand-in for the payload Gradio sends for a frame"""
+    return len(json.dumps(messages))
+
+
+def run_baseline(history: list, tokens: int) -> tuple:
+    conv = list(history) + [{"role": "user", "content": "hello"}]
+    parts = []
+    frames = 0
+    start = time.perf_counter()
+    for i in range(tokens):
+        parts.append(f"tok{i} ")
+        text = "".join(parts)
+        if conv[-1]["role"] == "user":
+            conv.append({"role": "assistant", "content": text})
+        else:
+            conv[-1]["content"] = text
+        serialize(convert_to_messages_format(conv))
+        frames += 1
+    return time.perf_counter() - start, frames
+
+
+def run_coalesced(history: list, tokens: int, tps: float) -> tuple:
+    conv = list(history) + [{"role": "user", "content": "hello"}]
+    parts = []
+    messages, converted = [], 0
+    clock = [1000.0]
+    start = time.perf_counter()
+    with mock.patch.object(render.time, "monotonic", lambda: clock[0]):
+        coalescer = FrameCoalescer()
+        for i in range(tokens):
+            clock[0] += 1.0 / tps
+            token = f"tok{i} "
+            parts.append(token)
+            text = "".join(parts)
+            if conv[-1]["role"] == "user":
+                conv.append({"role": "assistant", "content": text})
+            else:
+                conv[-1]["content"] = text
+            if coalescer.add(token):
+                converted = update_messages_format(messages, conv, converted)
+                # Only the last message changes between frames
+                serialize(messages[-1:])
+    return time.perf_counter() - start, coalescer.frames
+
+
+def main(histories: list, tokens: int, tps: float):
+    print(f"tokens={tokens}, simulated rate={tps:.0f} tok/s, target fps={render.AppConfig.RENDER_FPS}")
+    print(f"{'history':>8} {'baseline us/tok':>16} {'frames':>7} {'coalesced us/tok':>17} {'frames':>7} {'speedup':>8}")
+    for n in histories:
+        history = build_history(n)
+        base, base_frames = run_baseline(history, tokens)
+        fast, fast_frames = run_coalesced(history, tokens, tps)
+        print(
+            f"{n:>8} {base / tokens * 1e6:>16.1f} {base_frames:>7} "
+            f"{fast / tokens * 1e6:>17.1f} {fast_frames:>7} {base / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--history", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--tokens", type=int, default=500)
+    parser.add_argument("--tps", type=float, default=60.0, help="Simulated tokens per second")
+    args = parser.parse_args()
+    main(args.history, args.tokens, args.tps)
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark for token counting over a growing agent history.
+
+Simulates the think loop of a Manus run: every step appends a few messages to a
+100-message history and recounts the whole prompt plus the tool schemas, the
+way LLM.ask_tool does. Compares the uncached TokenCounter with the memoized one.
+
+Usage:
+    python benchmarks/bench_token_counting.py --messages 100 --steps 30
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import time
+
+import tiktoken
+
+from open_manus.app.llm import LLM, TokenCounter
+from open_manus.app.schema import Memory, Message, ToolCall
+
+
+def build_history(n: int) -> list:
+    """Build a realistic mix of user, assistant tool-call and tool messages"""
+    messages = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            messages.append(Message.user_message(f"Step {i}: analyse the quarterly revenue table. " * 20))
+        elif kind == 1:
+            call = ToolCall(
+                id=f"call_{i}",
+                function={"name": "browser_use", "arguments": json.dumps({"action": "go_to_url", "url": f"https://example.com/{i}"})},
+            )
+            messages.append(Message.from_tool_calls(tool_calls=[call], content=f"Opening page {i}"))
+        else:
+            messages.append(
+                Message.tool_message(
+                    content="Observed output: " + "revenue grew 12% year over year. " * 80,
+                    name="browser_use",
+                    tool_call_id=f"call_{i - 1}",
+                )
+            )
+    return messages
+
+
+def build_tools(count: int = 6) -> list:
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": f"tool_{i}",
+                "description": "A tool description with several sentences of documentation. " * 15,
+                "parameters": {"type": "object", "properties": {"arg": {"type": "string"}}},
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def run(counter: TokenCounter, history: list, tools: list, steps: int) -> float:
+    """Return seconds per think step"""
+    memory = Memory(messages=list(history), max_messages=len(history) + steps * 3)
+    start = time.perf_counter()
+    for step in range(steps):
+        memory.add_message(Message.user_message("What should we do next?"))
+        formatted = LLM.format_messages(memory.messages)
+        counter.count_message_tokens(formatted)
+        counter.count_tools(tools)
+        memory.add_message(Message.assistant_message(f"Thinking about step {step}"))
+    return (time.perf_counter() - start) / steps
+
+
+def main(messages: int, steps: int):
+    tokenizer = tiktoken.get_encoding("cl100k_base")
+    history = build_history(messages)
+    tools = build_tools()
+
+    uncached = run(TokenCounter(tokenizer, cache_size=0), history, tools, steps)
+    cached = run(TokenCounter(tokenizer), history, tools, steps)
+
+    memory = Memory(messages=list(history), max_messages=len(history) + 1)
+    counter = TokenCounter(tokenizer)
+    memory.count_tokens(counter)
+    memory.add_message(Message.user_message("one more message"))
+    start = time.perf_counter()
+    memory.count_tokens(counter)
+    incremental = time.perf_counter() - start
+
+    print(f"history={messages} messages, steps={steps}")
+    print(f"uncached count per step : {uncached * 1000:8.3f} ms")
+    print(f"memoized count per step : {cached * 1000:8.3f} ms  ({uncached / cached:.1f}x faster)")
+    print(f"Memory running total    : {incremental * 1000:8.3f} ms for one appended message")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=30)
+    args = parser.parse_args()
+    main(args.messages, args.steps)
@@ -0,0 +1,116 @@
+"""
+Benchmark for WebContentFetcher against a local HTTP stub server.
+
+The stub serves --pages HTML pages with ETag / Last-Modified headers and a
+fixed --latency per response. Each scenario fetches every page --rounds times,
+the way DeepResearch refetches result URLs across follow-up queries:
+
+- legacy: requests.get in the default thread executor, no reuse, no cache
+- pooled cold: pooled aiohttp session, empty cache
+- pooled warm: repeated rounds served from cache within the TTL
+- revalidate: TTL 0, every repeat is a conditional request answered with 304
+
+Usage:
+    python benchmarks/bench_web_fetch.py --pages 50 --rounds 3 --latency 0.02
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import hashlib
+import time
+
+import requests
+from aiohttp import web
+from bs4 import BeautifulSoup
+
+from open_manus.app.tool.web_search import WebContentFetcher
+
+
+def make_stub_app(latency: float, counters: dict) -> web.Application:
+    """Build an aiohttp app serving /page/<n> with validators"""
+
+    async def page(request: web.Request) -> web.Response:
+        n = request.match_info["n"]
+        body = f"<html><body><nav>menu</nav><h1>Page {n}</h1>" + "<p>Quarterly revenue grew.</p>" * 400 + "</body></html>"
+        etag = '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+        await asyncio.sleep(latency)
+        if request.headers.get("If-None-Match") == etag:
+            counters["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        counters["full"] += 1
+        return web.Response(
+            text=body,
+            content_type="text/html",
+            headers={"ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/page/{n}", page)
+    return app
+
+
+async def legacy_fetch(url: str, timeout: int = 10):
+    """The pre-pooling implementation: requests.get in the default executor"""
+    response = await asyncio.get_event_loop().run_in_executor(
+        None, lambda: requests.get(url, timeout=timeout)
+    )
+    if response.status_code != 200:
+        return None
+    soup = BeautifulSoup(response.text, "html.parser")
+    for script in soup(["script", "style", "header", "footer", "nav"]):
+        script.extract()
+    text = " ".join(soup.get_text(separator="\n", strip=True).split())
+    return text[:10000] if text else None
+
+
+async def run_rounds(fetch, urls: list, rounds: int) -> list:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch(url) for url in urls))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main(pages: int, rounds: int, latency: float, port: int):
+    counters = {"full": 0, "not_modified": 0}
+    runner = web.AppRunner(make_stub_app(latency, counters), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    urls = [f"http://127.0.0.1:{port}/page/{i}" for i in range(pages)]
+
+    scenarios = [
+        ("legacy", legacy_fetch, None),
+        ("pooled (ttl 600)", None, WebContentFetcher(ttl=600, max_per_host=pages)),
+        ("revalidate (ttl 0)", None, WebContentFetcher(ttl=0, max_per_host=pages)),
+    ]
+    print(f"pages={pages}, rounds={rounds}, latency={latency * 1000:.0f} ms")
+    print(f"{'scenario':<20} {'first (s)':>10} {'repeat (s)':>11} {'200s':>6} {'304s':>6}")
+    try:
+        for name, fetch, fetcher in scenarios:
+            counters.update(full=0, not_modified=0)
+            timings = await run_rounds(fetch or fetcher.fetch_content, urls, rounds)
+            repeat = sum(timings[1:]) / max(1, len(timings) - 1)
+            print(
+                f"{name:<20} {timings[0]:>10.3f} {repeat:>11.3f} "
+                f"{counters['full']:>6} {counters['not_modified']:>6}"
+            )
+            if fetcher is not None:
+                await fetcher.close()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency per response (s)")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.rounds, args.latency, args.port))
@@ -40,6 +40,9 @@ class BaseAgent(BaseModel, ABC):
     # Execution control
     max_steps: int = Field(default=10, description="Maximum steps before termination")
     current_step: int = Field(default=0, description="Current step in execution")
+    failed: bool = Field(
+        default=False, description="Whether the last run ended with an exception"
+    )
 
     duplicate_threshold: int = 2
 
@@ -78,6 +81,8 @@ class BaseAgent(BaseModel, ABC):
             yield
         except Exception as e:
             self.state = AgentState.ERROR  # Transition to ERROR on failure
+            # The state is reverted below, so record the failure for callers
+            self.failed = True
             raise e
         finally:
             self.state = previous_state  # Revert to previous state
@@ -132,6 +137,7 @@ class BaseAgent(BaseModel, ABC):
         if request:
             self.update_memory("user", request)
 
+        self.failed = False
         results: List[str] = []
         async with self.state_context(AgentState.RUNNING):
             while (
@@ -154,6 +160,18 @@ class BaseAgent(BaseModel, ABC):
         await SANDBOX_CLIENT.cleanup()
         return "\n".join(results) if results else "No steps executed"
 
+    def reset(self) -> None:
+        """Return the agent to a fresh IDLE state so it can serve a new request.
+
+        Clears memory and the step counter and restores the class-level
+        next_step_prompt, which `handle_stuck_state` may have modified.
+        """
+        self.memory = Memory(max_messages=self.memory.max_messages)
+        self.current_step = 0
+        self.state = AgentState.IDLE
+        self.failed = False
+        self.next_step_prompt = type(self).model_fields["next_step_prompt"].default
+
     @abstractmethod
     async def step(self) -> str:
         """Execute a single step in the agent's workflow.
@@ -30,6 +30,9 @@ class Manus(ToolCallAgent):
     max_observe: int = 10000
     max_steps: int = 20
 
+    # Independent downloads / PDF analyses / searches in one step run concurrently
+    parallel_tool_calls: bool = True
+
     # Add general-purpose tools to the tool collection
     available_tools: ToolCollection = Field(
         default_factory=lambda: ToolCollection(
@@ -109,10 +112,12 @@ class Manus(ToolCallAgent):
         await self.report_progress(tool_name, f"Completed execution of {tool_name}")
         return result
     
-    async def summarize_tool_results(self, tool_name: str, result: str) -> str:
+    async def summarize_tool_results(
+        self, tool_name: str, result: str, add_to_memory: bool = True
+    ) -> str:
         """Override to add progress reporting for summarization"""
         await self.report_progress(tool_name, "Generating summary of tool results")
-        summary = await super().summarize_tool_results(tool_name, result) 
+        summary = await super().summarize_tool_results(tool_name, result, add_to_memory)
         await self.report_progress(tool_name, "Summary generation complete")
         return summary
     
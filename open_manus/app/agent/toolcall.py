@@ -1,8 +1,8 @@
 import asyncio
 import json
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from open_manus.app.agent.react import ReActAgent
 from open_manus.app.exceptions import TokenLimitExceeded
@@ -15,6 +15,7 @@ from open_manus.app.schema import (
     TOOL_CHOICE_TYPE,
     AgentState,
     Message,
+    SummaryPolicy,
     ToolCall,
     ToolChoice,
     Role,           # ★ 新增
@@ -48,6 +49,25 @@ class ToolCallAgent(ReActAgent):
     max_steps: int = 30
     max_observe: Optional[Union[int, bool]] = None
 
+    # 为 False 时 run() 结束后不释放工具资源（由调用方负责，例如 agent 池）
+    cleanup_on_finish: bool = True
+
+    # 并发 act 模式：相邻的 parallel_safe 工具调用并发执行
+    parallel_tool_calls: bool = False
+    max_parallel_tools: int = 4
+
+    _tool_semaphores: Dict[str, asyncio.Semaphore] = PrivateAttr(default_factory=dict)
+    _parallel_semaphore: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+    _tool_images: Dict[str, str] = PrivateAttr(default_factory=dict)
+
+    # 工具结果摘要策略（见 SummaryPolicy）及最终报告开关
+    summary_policy: SummaryPolicy = SummaryPolicy.PER_TOOL
+    summary_threshold: int = 2000  # THRESHOLD 策略下触发摘要的输出字符数
+    final_summary_enabled: bool = True
+
+    # 摘要花费统计：{"tool" | "final": {"llm_calls", "input_tokens", "completion_tokens"}}
+    _summary_usage: Dict[str, Dict[str, int]] = PrivateAttr(default_factory=dict)
+
     # 进度回调（供外部 UI 实时展示）
     _progress_callback: Optional[Callable[[str], None]] = None
 
@@ -78,6 +98,12 @@ class ToolCallAgent(ReActAgent):
         if self.next_step_prompt:
             self.messages += [Message.user_message(self.next_step_prompt)]
 
+        # Lazy: only counted when a sink accepts debug messages
+        logger.opt(lazy=True).debug(
+            "📏 Memory size: {} tokens",
+            lambda: self.memory.count_tokens(self.llm.token_counter),
+        )
+
         # （2）请求 LLM，携带可用工具、tool_choice
         try:
             response = await self.llm.ask_tool(
@@ -138,23 +164,83 @@ class ToolCallAgent(ReActAgent):
     # -------------------------------------------------------------------------
     # 摘要单个工具运行结果
     # -------------------------------------------------------------------------
-    async def summarize_tool_results(self, tool_name: str, result: str) -> str:
+    async def summarize_tool_results(
+        self, tool_name: str, result: str, add_to_memory: bool = True
+    ) -> str:
         summary_prompt = (
             f"You executed the tool '{tool_name}' and got the result below:\n\n"
             f"{result}\n\n"
             "Give a concise, user‑friendly summary of what this result means."
         )
 
-        response = await self.llm.ask(
+        response = await self._ask_summary(
+            "tool",
             messages=[Message.user_message(summary_prompt)],
             system_msgs=[Message.system_message(
                 "Summarize the tool execution result concisely."
             )],
-            stream=False,
         )
-        self.memory.add_message(Message.assistant_message(response))
+        if add_to_memory:
+            self.memory.add_message(Message.assistant_message(response))
+        return response
+
+    # -------------------------------------------------------------------------
+    # 一次摘要覆盖本步所有工具结果（BATCHED 策略）
+    # -------------------------------------------------------------------------
+    async def summarize_step_results(self, items: List[Tuple[str, str]]) -> str:
+        sections = "\n\n".join(
+            f"### Tool '{tool_name}'\n{result}" for tool_name, result in items
+        )
+        summary_prompt = (
+            f"You executed {len(items)} tool call(s) in this step and got the results below:\n\n"
+            f"{sections}\n\n"
+            "Give one concise, user‑friendly summary of what these results mean."
+        )
+        return await self._ask_summary(
+            "tool",
+            messages=[Message.user_message(summary_prompt)],
+            system_msgs=[Message.system_message(
+                "Summarize the tool execution results concisely."
+            )],
+        )
+
+    # -------------------------------------------------------------------------
+    # 摘要 LLM 调用 + 花费统计
+    # -------------------------------------------------------------------------
+    async def _ask_summary(
+        self, kind: str, messages: List[Message], system_msgs: List[Message]
+    ) -> str:
+        response = await self.llm.ask(
+            messages=messages, system_msgs=system_msgs, stream=False
+        )
+
+        # 用 TokenCounter 估算，避免共享 LLM 实例的累计值被并发调用污染
+        counter = self.llm.token_counter
+        usage = self._summary_usage.setdefault(
+            kind, {"llm_calls": 0, "input_tokens": 0, "completion_tokens": 0}
+        )
+        usage["llm_calls"] += 1
+        usage["input_tokens"] += counter.count_message_tokens(
+            [msg.to_dict() for msg in system_msgs + messages]
+        )
+        usage["completion_tokens"] += counter.count_text(response)
         return response
 
+    @property
+    def summary_usage(self) -> Dict[str, Dict[str, int]]:
+        """摘要消耗的 LLM 调用次数与 token（按 tool / final 分类）"""
+        return {kind: dict(usage) for kind, usage in self._summary_usage.items()}
+
+    def _should_summarize(self, tool_name: str, result: str) -> bool:
+        if self._is_special_tool(tool_name):
+            return False
+        if self.summary_policy == SummaryPolicy.PER_TOOL:
+            return True
+        if self.summary_policy == SummaryPolicy.THRESHOLD:
+            return len(result) > self.summary_threshold
+        # BATCHED 在整步结束后统一处理；NONE 不摘要
+        return False
+
     # -------------------------------------------------------------------------
     # ACT 阶段：真正调用工具 & 处理结果
     # -------------------------------------------------------------------------
@@ -167,41 +253,55 @@ class ToolCallAgent(ReActAgent):
 
         results: List[str] = []
         summaries: List[str] = []
-
-        # ---------- 1. 逐个执行工具 ----------
-        for command in self.tool_calls:
-            self._current_base64_image = None
-            await self.report_progress(command.function.name, "Starting tool execution")
-
-            result = await self.execute_tool(command)
-            if self.max_observe:
-                result = result[: self.max_observe]
-
-            logger.info(
-                f"🎯 Tool '{command.function.name}' completed. Result: {result}"
-            )
-
-            # 把 tool 消息写进 memory
-            self.memory.add_message(
-                Message.tool_message(
-                    content=result,
-                    tool_call_id=command.id,
-                    name=command.function.name,
-                    base64_image=self._current_base64_image,
+        step_items: List[Tuple[str, str]] = []
+
+        # ---------- 1. 按批执行工具（批内并发，批间顺序） ----------
+        for batch in self._plan_tool_batches(self.tool_calls):
+            if len(batch) == 1:
+                outcomes = [await self._run_tool_call(batch[0])]
+            else:
+                logger.info(
+                    f"⚡ Running {len(batch)} tool calls concurrently: "
+                    f"{[call.function.name for call in batch]}"
                 )
-            )
-            results.append(result)
-
-            await self.report_progress(
-                command.function.name, "Tool execution completed"
-            )
-
-            # 如非特殊工具，生成一段摘要
-            if not self._is_special_tool(command.function.name):
-                await self.report_progress(command.function.name, "Generating summary")
-                summaries.append(
-                    await self.summarize_tool_results(command.function.name, result)
+                async with asyncio.TaskGroup() as group:
+                    tasks = [
+                        group.create_task(self._run_tool_call(command))
+                        for command in batch
+                    ]
+                outcomes = [task.result() for task in tasks]
+
+            # 并发批次的摘要也并发生成，写入 memory 时保持原始顺序
+            batch_summaries = await self._summarize_batch(batch, outcomes)
+
+            # 按原始顺序把 tool 消息（及摘要）写进 memory
+            for command, (result, base64_image), summary in zip(
+                batch, outcomes, batch_summaries
+            ):
+                self.memory.add_message(
+                    Message.tool_message(
+                        content=result,
+                        tool_call_id=command.id,
+                        name=command.function.name,
+                        base64_image=base64_image,
+                    )
                 )
+                results.append(result)
+                if summary is not None:
+                    self.memory.add_message(Message.assistant_message(summary))
+                    summaries.append(summary)
+                if (
+                    self.summary_policy == SummaryPolicy.BATCHED
+                    and not self._is_special_tool(command.function.name)
+                ):
+                    step_items.append((command.function.name, result))
+
+        # BATCHED：整步只做一次摘要
+        if step_items:
+            await self.report_progress("Summary", "Generating step summary")
+            summary = await self.summarize_step_results(step_items)
+            self.memory.add_message(Message.assistant_message(summary))
+            summaries.append(summary)
 
         # ---------- 2. ★ 关键修复：移除上一条带 tool_calls 的 assistant 标记 ----------
         # for msg in reversed(self.memory.messages):
@@ -212,6 +312,74 @@ class ToolCallAgent(ReActAgent):
         # ---------- 3. 返回 ----------
         return "\n\n".join(summaries) if summaries else "\n\n".join(results)
 
+    def _plan_tool_batches(self, tool_calls: List[ToolCall]) -> List[List[ToolCall]]:
+        """把工具调用切分为批次：相邻的 parallel_safe 调用合为一批，其余单独成批"""
+        if not self.parallel_tool_calls:
+            return [[command] for command in tool_calls]
+
+        batches: List[List[ToolCall]] = []
+        for command in tool_calls:
+            if self._is_parallel_safe(command) and batches and self._is_parallel_safe(
+                batches[-1][0]
+            ):
+                batches[-1].append(command)
+            else:
+                batches.append([command])
+        return batches
+
+    def _is_parallel_safe(self, command: ToolCall) -> bool:
+        name = command.function.name if command and command.function else None
+        if not name or self._is_special_tool(name):
+            return False
+        tool = self.available_tools.tool_map.get(name)
+        return bool(tool and getattr(tool, "parallel_safe", False))
+
+    def _tool_semaphore(self, name: str) -> asyncio.Semaphore:
+        """单个工具的并发上限（BaseTool.max_concurrency）"""
+        if name not in self._tool_semaphores:
+            tool = self.available_tools.tool_map.get(name)
+            limit = max(1, getattr(tool, "max_concurrency", 1))
+            self._tool_semaphores[name] = asyncio.Semaphore(limit)
+        return self._tool_semaphores[name]
+
+    async def _run_tool_call(self, command: ToolCall) -> Tuple[str, Optional[str]]:
+        """执行单个工具调用，返回 (observation, base64_image)"""
+        name = command.function.name
+        if self._parallel_semaphore is None:
+            self._parallel_semaphore = asyncio.Semaphore(max(1, self.max_parallel_tools))
+
+        async with self._parallel_semaphore, self._tool_semaphore(name):
+            self._current_base64_image = None
+            await self.report_progress(name, "Starting tool execution")
+
+            result = await self.execute_tool(command)
+            if self.max_observe:
+                result = result[: self.max_observe]
+
+            logger.info(f"🎯 Tool '{name}' completed. Result: {result}")
+            await self.report_progress(name, "Tool execution completed")
+
+        return result, self._tool_images.pop(command.id, None)
+
+    async def _summarize_batch(
+        self, batch: List[ToolCall], outcomes: List[Tuple[str, Optional[str]]]
+    ) -> List[Optional[str]]:
+        """按 summary_policy 为单个结果生成摘要（不写 memory），不需要时返回 None"""
+
+        async def summarize(command: ToolCall, result: str) -> Optional[str]:
+            name = command.function.name
+            if not self._should_summarize(name, result):
+                return None
+            await self.report_progress(name, "Generating summary")
+            return await self.summarize_tool_results(name, result, add_to_memory=False)
+
+        return await asyncio.gather(
+            *(
+                summarize(command, result)
+                for command, (result, _image) in zip(batch, outcomes)
+            )
+        )
+
     # -------------------------------------------------------------------------
     # 单个工具执行
     # -------------------------------------------------------------------------
@@ -242,9 +410,10 @@ class ToolCallAgent(ReActAgent):
             # 处理特殊工具
             await self._handle_special_tool(name=name, result=result)
 
-            # 如返回对象带 base64_image，则保存
+            # 如返回对象带 base64_image，则保存（按 tool_call id 记录，便于并发执行）
             if getattr(result, "base64_image", None):
                 self._current_base64_image = result.base64_image
+                self._tool_images[command.id] = result.base64_image
 
             observation = (
                 f"Observed output of cmd `{name}` executed:\n{result}"
@@ -271,12 +440,12 @@ class ToolCallAgent(ReActAgent):
             "4. Conclusions / recommendations"
         )
         self.memory.add_message(Message.user_message(prompt))
-        summary = await self.llm.ask(
+        summary = await self._ask_summary(
+            "final",
             messages=self.memory.messages,
             system_msgs=[Message.system_message(
                 "Create a professional final report."
             )],
-            stream=False,
         )
         self.memory.add_message(Message.assistant_message(summary))
         return summary
@@ -298,6 +467,14 @@ class ToolCallAgent(ReActAgent):
     def _is_special_tool(self, name: str) -> bool:
         return name.lower() in (n.lower() for n in self.special_tool_names)
 
+    def reset(self) -> None:
+        """Reset memory, step counter and pending tool calls for reuse."""
+        super().reset()
+        self.tool_calls = []
+        self._current_base64_image = None
+        self._progress_callback = None
+        self._summary_usage = {}
+
     async def cleanup(self):
         logger.info(f"🧹 Cleaning up resources for agent '{self.name}'...")
         for tool_name, tool in self.available_tools.tool_map.items():
@@ -314,7 +491,7 @@ class ToolCallAgent(ReActAgent):
     async def run(self, request: Optional[str] = None) -> str:
         try:
             result = await super().run(request)
-            if self.state == AgentState.FINISHED:
+            if self.state == AgentState.FINISHED and self.final_summary_enabled:
                 try:
                     return await self.generate_final_summary()
                 except Exception as e:
@@ -322,4 +499,7 @@ class ToolCallAgent(ReActAgent):
                     return result + "\n\n[Final summary generation failed]"
             return result
         finally:
-            await self.cleanup()
+            if self._summary_usage:
+                logger.info(f"📊 Summary LLM usage for '{self.name}': {self.summary_usage}")
+            if self.cleanup_on_finish:
+                await self.cleanup()
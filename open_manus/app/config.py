@@ -41,6 +41,24 @@ class LLMSettings(BaseModel):
     api_version: str = Field(..., description="Azure Openai version if AzureOpenai")
 
 
+class LLMCacheSettings(BaseModel):
+    """Configuration for the LLM completion cache"""
+
+    enabled: bool = Field(True, description="Whether completions may be cached")
+    memory_entries: int = Field(
+        256, description="Maximum number of entries kept in the in-memory LRU tier"
+    )
+    disk_enabled: bool = Field(True, description="Whether to use the SQLite tier")
+    disk_path: Optional[str] = Field(
+        None,
+        description="SQLite database path (defaults to workspace/.cache/llm_cache.sqlite)",
+    )
+    ttl: int = Field(7 * 24 * 3600, description="Seconds a cached completion stays valid")
+    max_disk_mb: int = Field(
+        100, description="Maximum size of cached completions on disk (MB)"
+    )
+
+
 class ProxySettings(BaseModel):
     server: str = Field(None, description="Proxy server address")
     username: Optional[str] = Field(None, description="Proxy username")
@@ -69,6 +87,49 @@ class SearchSettings(BaseModel):
         default="us",
         description="Country code for search results (e.g., us, cn, uk)",
     )
+    breaker_failure_threshold: int = Field(
+        default=3,
+        description="Consecutive failures after which an engine is skipped (circuit breaker opens)",
+    )
+    breaker_cooldown: int = Field(
+        default=60,
+        description="Seconds a failing engine is skipped before a single probe request is allowed",
+    )
+    hedge_mode: str = Field(
+        default="sequential",
+        description="How engines are tried: 'sequential' (one after another), 'hedged' (start the next engine after hedge_delay) or 'all' (all engines at once)",
+    )
+    hedge_delay: float = Field(
+        default=2.0,
+        description="Seconds to wait for an engine before also starting the next one in hedged mode",
+    )
+    merge_results: bool = Field(
+        default=False,
+        description="Query all engines and merge their results, de-duplicated by URL",
+    )
+    search_cache_ttl: int = Field(
+        default=3600, description="Seconds search results are reused for the same query"
+    )
+    search_cache_size: int = Field(
+        default=512, description="Maximum number of queries in the search result cache"
+    )
+    search_cache_path: Optional[str] = Field(
+        default=None,
+        description="JSON file the search result cache is persisted to (memory only if not set)",
+    )
+    fetch_cache_ttl: int = Field(
+        default=600,
+        description="Seconds fetched page content is reused before revalidation",
+    )
+    fetch_cache_size: int = Field(
+        default=256, description="Maximum number of URLs in the page content cache"
+    )
+    fetch_max_connections: int = Field(
+        default=32, description="Total connection limit for page fetching"
+    )
+    fetch_max_per_host: int = Field(
+        default=4, description="Connection limit per host for page fetching"
+    )
 
 
 class BrowserSettings(BaseModel):
@@ -94,6 +155,15 @@ class BrowserSettings(BaseModel):
     max_content_length: int = Field(
         2000, description="Maximum length for content retrieval operations"
     )
+    max_shared_browsers: int = Field(
+        1, description="Maximum number of long-lived browser processes shared by agents"
+    )
+    max_contexts: int = Field(
+        8, description="Maximum number of concurrently open browser contexts"
+    )
+    browser_idle_timeout: int = Field(
+        300, description="Seconds an unused shared browser is kept alive"
+    )
 
 
 class SandboxSettings(BaseModel):
@@ -108,6 +178,12 @@ class SandboxSettings(BaseModel):
     network_enabled: bool = Field(
         False, description="Whether network access is allowed"
     )
+    pool_min_size: int = Field(
+        0, description="Warm sandboxes kept ready for reuse (0 disables the pool)"
+    )
+    pool_max_size: int = Field(
+        0, description="Maximum warm sandboxes kept after release"
+    )
 
 
 class MCPSettings(BaseModel):
@@ -130,6 +206,9 @@ class AppConfig(BaseModel):
         None, description="Search configuration"
     )
     mcp_config: Optional[MCPSettings] = Field(None, description="MCP configuration")
+    llm_cache: Optional[LLMCacheSettings] = Field(
+        None, description="LLM completion cache configuration"
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -239,6 +318,9 @@ class Config:
         else:
             mcp_settings = MCPSettings()
 
+        llm_cache_config = raw_config.get("llm_cache", {})
+        llm_cache_settings = LLMCacheSettings(**llm_cache_config)
+
         config_dict = {
             "llm": {
                 "default": default_settings,
@@ -251,6 +333,7 @@ class Config:
             "browser_config": browser_settings,
             "search_config": search_settings,
             "mcp_config": mcp_settings,
+            "llm_cache": llm_cache_settings,
         }
 
         self._config = AppConfig(**config_dict)
@@ -276,6 +359,11 @@ class Config:
         """Get the MCP configuration"""
         return self._config.mcp_config
 
+    @property
+    def llm_cache(self) -> LLMCacheSettings:
+        """Get the LLM completion cache configuration"""
+        return self._config.llm_cache
+
     @property
     def workspace_root(self) -> Path:
         """Get the workspace root directory"""
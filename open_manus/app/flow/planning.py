@@ -1,14 +1,17 @@
+import asyncio
 import json
+import re
 import time
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from open_manus.app.agent.base import BaseAgent
 from open_manus.app.flow.base import BaseFlow
 from open_manus.app.llm import LLM
 from open_manus.app.logger import logger
+from open_manus.app.sandbox.client import SANDBOX_CLIENT
 from open_manus.app.schema import AgentState, Message, ToolChoice
 from open_manus.app.tool import PlanningTool
 
@@ -49,7 +52,15 @@ class PlanningFlow(BaseFlow):
     planning_tool: PlanningTool = Field(default_factory=PlanningTool)
     executor_keys: List[str] = Field(default_factory=list)
     active_plan_id: str = Field(default_factory=lambda: f"plan_{int(time.time())}")
-    current_step_index: Optional[int] = None
+
+    # Steps whose dependencies are completed run concurrently, each on its own
+    # executor agent. executor_factory creates extra executors when more steps
+    # are ready than idle executors are available.
+    max_parallel_steps: int = 4
+    executor_factory: Optional[Callable[[], BaseAgent]] = None
+
+    _busy_executors: set = PrivateAttr(default_factory=set)
+    _step_info_cache: Dict[int, Tuple[str, dict]] = PrivateAttr(default_factory=dict)
 
     def __init__(
         self, agents: Union[BaseAgent, List[BaseAgent], Dict[str, BaseAgent]], **data
@@ -74,25 +85,16 @@ class PlanningFlow(BaseFlow):
         if not self.executor_keys:
             self.executor_keys = list(self.agents.keys())
 
-    def get_executor(self, step_type: Optional[str] = None) -> BaseAgent:
-        """
-        Get an appropriate executor agent for the current step.
-        Can be extended to select agents based on step type/requirements.
-        """
-        # If step type is provided and matches an agent key, use that agent
-        if step_type and step_type in self.agents:
-            return self.agents[step_type]
-
-        # Otherwise use the first available executor or fall back to primary agent
-        for key in self.executor_keys:
-            if key in self.agents:
-                return self.agents[key]
+    async def execute(self, input_text: str) -> str:
+        """Execute the planning flow with agents.
 
-        # Fallback to primary agent
-        return self.primary_agent
+        Steps share the sandbox and run concurrently, so it is kept alive until
+        the whole flow completes instead of being cleaned up after each step.
+        """
+        async with SANDBOX_CLIENT.keep_alive():
+            return await self._execute(input_text)
 
-    async def execute(self, input_text: str) -> str:
-        """Execute the planning flow with agents."""
+    async def _execute(self, input_text: str) -> str:
         try:
             if not self.primary_agent:
                 raise ValueError("No primary agent available")
@@ -108,31 +110,133 @@ class PlanningFlow(BaseFlow):
                     )
                     return f"Failed to create plan for: {input_text}"
 
-            result = ""
-            while True:
-                # Get current step to execute
-                self.current_step_index, step_info = await self._get_current_step_info()
-
-                # Exit if no more steps or plan completed
-                if self.current_step_index is None:
-                    result += await self._finalize_plan()
-                    break
-
-                # Execute current step with appropriate agent
-                step_type = step_info.get("type") if step_info else None
-                executor = self.get_executor(step_type)
-                step_result = await self._execute_step(executor, step_info)
-                result += step_result + "\n"
-
-                # Check if agent wants to terminate
-                if hasattr(executor, "state") and executor.state == AgentState.FINISHED:
-                    break
+            step_results = await self._execute_ready_steps()
+            result = "".join(
+                step_results[index] + "\n" for index in sorted(step_results)
+            )
+            result += await self._finalize_plan()
 
             return result
         except Exception as e:
             logger.error(f"Error in PlanningFlow: {str(e)}")
             return f"Execution failed: {str(e)}"
 
+    def _acquire_executor(self, step_type: Optional[str] = None) -> Optional[BaseAgent]:
+        """
+        Get an idle executor agent for a step, or None if all suitable executors are busy.
+        Creates a new executor with executor_factory when the pool is exhausted.
+        """
+        # A step type matching an agent key is bound to that agent
+        if step_type and step_type in self.agents:
+            agent = self.agents[step_type]
+            return None if id(agent) in self._busy_executors else agent
+
+        candidates = [self.agents[key] for key in self.executor_keys if key in self.agents]
+        if not candidates and self.primary_agent:
+            candidates = [self.primary_agent]
+
+        for agent in candidates:
+            if id(agent) not in self._busy_executors:
+                return agent
+
+        if self.executor_factory and len(self._busy_executors) < self.max_parallel_steps:
+            key = f"executor_{len(self.agents)}"
+            agent = self.executor_factory()
+            self.add_agent(key, agent)
+            self.executor_keys.append(key)
+            logger.info(f"Created additional executor '{key}' for parallel steps")
+            return agent
+
+        return None
+
+    def _get_ready_steps(self, running: set) -> List[int]:
+        """Return indices of steps that are not started and whose dependencies are completed."""
+        plan_data = self.planning_tool.plans.get(self.active_plan_id, {})
+        steps = plan_data.get("steps", [])
+        step_statuses = plan_data.get("step_statuses", [])
+        dependencies = plan_data.get("step_dependencies") or [
+            [i - 1] if i > 0 else [] for i in range(len(steps))
+        ]
+
+        def status_of(index: int) -> str:
+            if index < len(step_statuses):
+                return step_statuses[index]
+            return PlanStepStatus.NOT_STARTED.value
+
+        return [
+            i
+            for i in range(len(steps))
+            if i not in running
+            and status_of(i) in PlanStepStatus.get_active_statuses()
+            and all(
+                status_of(dep) == PlanStepStatus.COMPLETED.value
+                for dep in (dependencies[i] if i < len(dependencies) else [])
+            )
+        ]
+
+    async def _execute_ready_steps(self) -> Dict[int, str]:
+        """
+        Execute plan steps as a DAG: every step whose dependencies are completed is
+        started on an idle executor, up to max_parallel_steps at a time.
+        Returns the result of each executed step by step index.
+        """
+        results: Dict[int, str] = {}
+        running: Dict[asyncio.Task, Tuple[int, BaseAgent]] = {}
+        stop_scheduling = False
+
+        try:
+            while True:
+                if not stop_scheduling:
+                    for index in self._get_ready_steps({i for i, _ in running.values()}):
+                        if len(running) >= max(1, self.max_parallel_steps):
+                            break
+                        step_info = self._get_step_info(index)
+                        executor = self._acquire_executor(step_info.get("type"))
+                        if executor is None:
+                            continue
+
+                        await self._mark_step(index, PlanStepStatus.IN_PROGRESS)
+                        self._busy_executors.add(id(executor))
+                        task = asyncio.create_task(
+                            self._execute_step(executor, step_info, index)
+                        )
+                        running[task] = (index, executor)
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, executor = running.pop(task)
+                    self._busy_executors.discard(id(executor))
+                    results[index] = task.result()
+
+                    # Check if agent wants to terminate
+                    if hasattr(executor, "state") and executor.state == AgentState.FINISHED:
+                        stop_scheduling = True
+        finally:
+            for task in running:
+                task.cancel()
+            self._busy_executors.clear()
+
+        return results
+
+    def _get_step_info(self, index: int) -> dict:
+        """Parse step text and type once per distinct step text."""
+        step = self.planning_tool.plans[self.active_plan_id]["steps"][index]
+        cached = self._step_info_cache.get(index)
+        if cached is None or cached[0] != step:
+            step_info = {"text": step}
+
+            # Try to extract step type from the text (e.g., [SEARCH] or [CODE])
+            type_match = re.search(r"\[([A-Z_]+)\]", step)
+            if type_match:
+                step_info["type"] = type_match.group(1).lower()
+
+            cached = (step, step_info)
+            self._step_info_cache[index] = cached
+        return dict(cached[1])
+
     async def _create_initial_plan(self, request: str) -> None:
         """Create an initial plan based on the request using the flow's LLM and PlanningTool."""
         logger.info(f"Creating initial plan with ID: {self.active_plan_id}")
@@ -141,7 +245,9 @@ class PlanningFlow(BaseFlow):
         system_message = Message.system_message(
             "You are a planning assistant. Create a concise, actionable plan with clear steps. "
             "Focus on key milestones rather than detailed sub-steps. "
-            "Optimize for clarity and efficiency."
+            "Optimize for clarity and efficiency. "
+            "Use step_dependencies to list the earlier steps each step needs, "
+            "so that independent steps (e.g. separate searches or downloads) can run in parallel."
         )
 
         # Create a user message with the request
@@ -192,75 +298,13 @@ class PlanningFlow(BaseFlow):
             }
         )
 
-    async def _get_current_step_info(self) -> tuple[Optional[int], Optional[dict]]:
-        """
-        Parse the current plan to identify the first non-completed step's index and info.
-        Returns (None, None) if no active step is found.
-        """
-        if (
-            not self.active_plan_id
-            or self.active_plan_id not in self.planning_tool.plans
-        ):
-            logger.error(f"Plan with ID {self.active_plan_id} not found")
-            return None, None
-
-        try:
-            # Direct access to plan data from planning tool storage
-            plan_data = self.planning_tool.plans[self.active_plan_id]
-            steps = plan_data.get("steps", [])
-            step_statuses = plan_data.get("step_statuses", [])
-
-            # Find first non-completed step
-            for i, step in enumerate(steps):
-                if i >= len(step_statuses):
-                    status = PlanStepStatus.NOT_STARTED.value
-                else:
-                    status = step_statuses[i]
-
-                if status in PlanStepStatus.get_active_statuses():
-                    # Extract step type/category if available
-                    step_info = {"text": step}
-
-                    # Try to extract step type from the text (e.g., [SEARCH] or [CODE])
-                    import re
-
-                    type_match = re.search(r"\[([A-Z_]+)\]", step)
-                    if type_match:
-                        step_info["type"] = type_match.group(1).lower()
-
-                    # Mark current step as in_progress
-                    try:
-                        await self.planning_tool.execute(
-                            command="mark_step",
-                            plan_id=self.active_plan_id,
-                            step_index=i,
-                            step_status=PlanStepStatus.IN_PROGRESS.value,
-                        )
-                    except Exception as e:
-                        logger.warning(f"Error marking step as in_progress: {e}")
-                        # Update step status directly if needed
-                        if i < len(step_statuses):
-                            step_statuses[i] = PlanStepStatus.IN_PROGRESS.value
-                        else:
-                            while len(step_statuses) < i:
-                                step_statuses.append(PlanStepStatus.NOT_STARTED.value)
-                            step_statuses.append(PlanStepStatus.IN_PROGRESS.value)
-
-                        plan_data["step_statuses"] = step_statuses
-
-                    return i, step_info
-
-            return None, None  # No active step found
-
-        except Exception as e:
-            logger.warning(f"Error finding current step index: {e}")
-            return None, None
-
-    async def _execute_step(self, executor: BaseAgent, step_info: dict) -> str:
-        """Execute the current step with the specified agent using agent.run()."""
+    async def _execute_step(
+        self, executor: BaseAgent, step_info: dict, step_index: int
+    ) -> str:
+        """Execute a step with the specified agent using agent.run()."""
         # Prepare context for the agent with current plan status
         plan_status = await self._get_plan_text()
-        step_text = step_info.get("text", f"Step {self.current_step_index}")
+        step_text = step_info.get("text", f"Step {step_index}")
 
         # Create a prompt for the agent to execute the current step
         step_prompt = f"""
@@ -268,7 +312,7 @@ class PlanningFlow(BaseFlow):
         {plan_status}
 
         YOUR CURRENT TASK:
-        You are now working on step {self.current_step_index}: "{step_text}"
+        You are now working on step {step_index}: "{step_text}"
 
         Please execute this step using the appropriate tools. When you're done, provide a summary of what you accomplished.
         """
@@ -278,28 +322,30 @@ class PlanningFlow(BaseFlow):
             step_result = await executor.run(step_prompt)
 
             # Mark the step as completed after successful execution
-            await self._mark_step_completed()
+            await self._mark_step_completed(step_index)
 
             return step_result
         except Exception as e:
-            logger.error(f"Error executing step {self.current_step_index}: {e}")
-            return f"Error executing step {self.current_step_index}: {str(e)}"
-
-    async def _mark_step_completed(self) -> None:
-        """Mark the current step as completed."""
-        if self.current_step_index is None:
-            return
+            logger.error(f"Error executing step {step_index}: {e}")
+            # Block the step so it is not retried forever and its dependents never start
+            await self._mark_step(step_index, PlanStepStatus.BLOCKED)
+            return f"Error executing step {step_index}: {str(e)}"
+
+    async def _mark_step_completed(self, step_index: int) -> None:
+        """Mark a step as completed."""
+        await self._mark_step(step_index, PlanStepStatus.COMPLETED)
+        logger.info(
+            f"Marked step {step_index} as completed in plan {self.active_plan_id}"
+        )
 
+    async def _mark_step(self, step_index: int, status: PlanStepStatus) -> None:
+        """Set a step status through the planning tool, falling back to direct storage access."""
         try:
-            # Mark the step as completed
             await self.planning_tool.execute(
                 command="mark_step",
                 plan_id=self.active_plan_id,
-                step_index=self.current_step_index,
-                step_status=PlanStepStatus.COMPLETED.value,
-            )
-            logger.info(
-                f"Marked step {self.current_step_index} as completed in plan {self.active_plan_id}"
+                step_index=step_index,
+                step_status=status.value,
             )
         except Exception as e:
             logger.warning(f"Failed to update plan status: {e}")
@@ -309,11 +355,11 @@ class PlanningFlow(BaseFlow):
                 step_statuses = plan_data.get("step_statuses", [])
 
                 # Ensure the step_statuses list is long enough
-                while len(step_statuses) <= self.current_step_index:
+                while len(step_statuses) <= step_index:
                     step_statuses.append(PlanStepStatus.NOT_STARTED.value)
 
                 # Update the status
-                step_statuses[self.current_step_index] = PlanStepStatus.COMPLETED.value
+                step_statuses[step_index] = status.value
                 plan_data["step_statuses"] = step_statuses
 
     async def _get_plan_text(self) -> str:
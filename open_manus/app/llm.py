@@ -1,4 +1,6 @@
+import json
 import math
+from collections import OrderedDict
 from typing import Dict, List, Optional, Union
 
 import tiktoken
@@ -11,6 +13,7 @@ from openai import (
     RateLimitError,
 )
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
+from pydantic import BaseModel
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -21,6 +24,7 @@ from tenacity import (
 from open_manus.app.bedrock import BedrockClient
 from open_manus.app.config import LLMSettings, config
 from open_manus.app.exceptions import TokenLimitExceeded
+from open_manus.app.llm_cache import get_completion_cache, make_cache_key
 from open_manus.app.logger import logger  # Assuming a logger is set up in your app
 from open_manus.app.schema import (
     ROLE_VALUES,
@@ -54,8 +58,16 @@ class TokenCounter:
     HIGH_DETAIL_TARGET_SHORT_SIDE = 768
     TILE_SIZE = 512
 
-    def __init__(self, tokenizer):
+    # Memoization
+    DEFAULT_CACHE_SIZE = 4096
+
+    def __init__(self, tokenizer, cache_size: int = DEFAULT_CACHE_SIZE):
         self.tokenizer = tokenizer
+        self.cache_size = cache_size
+        # message fields -> token count, LRU ordered
+        self._message_cache: "OrderedDict[tuple, int]" = OrderedDict()
+        # id(tool dict) -> (tool dict, token count); the dict is kept to pin its id
+        self._tool_cache: Dict[int, tuple] = {}
 
     def count_text(self, text: str) -> int:
         """Calculate tokens for a text string"""
@@ -151,32 +163,94 @@ class TokenCounter:
                 token_count += self.count_text(function.get("arguments", ""))
         return token_count
 
-    def count_message_tokens(self, messages: List[dict]) -> int:
-        """Calculate the total number of tokens in a message list"""
-        total_tokens = self.FORMAT_TOKENS  # Base format tokens
+    def _count_message_uncached(self, message: dict) -> int:
+        """Calculate tokens for a single message without the cache"""
+        tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
 
-        for message in messages:
-            tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
+        # Add role tokens
+        tokens += self.count_text(message.get("role", ""))
+
+        # Add content tokens
+        if "content" in message:
+            tokens += self.count_content(message["content"])
+
+        # Add tool calls tokens
+        if "tool_calls" in message:
+            tokens += self.count_tool_calls(message["tool_calls"])
+
+        # Add name and tool_call_id tokens
+        tokens += self.count_text(message.get("name", ""))
+        tokens += self.count_text(message.get("tool_call_id", ""))
+
+        return tokens
 
-            # Add role tokens
-            tokens += self.count_text(message.get("role", ""))
+    @staticmethod
+    def _message_key(message: dict) -> tuple:
+        """Build a hashable key from the fields that affect the token count.
 
-            # Add content tokens
-            if "content" in message:
-                tokens += self.count_content(message["content"])
+        String contents are used as-is: Python caches str hashes, so messages
+        that are re-sent every step are looked up without rehashing their text.
+        """
+        content = message.get("content")
+        if content is not None and not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        tool_calls = message.get("tool_calls")
+        if tool_calls is not None:
+            tool_calls = json.dumps(tool_calls, sort_keys=True, default=str)
+        return (
+            message.get("role", ""),
+            content,
+            tool_calls,
+            message.get("name", ""),
+            message.get("tool_call_id", ""),
+        )
 
-            # Add tool calls tokens
-            if "tool_calls" in message:
-                tokens += self.count_tool_calls(message["tool_calls"])
+    def count_message(self, message: dict) -> int:
+        """Calculate tokens for a single message, memoized by its content"""
+        if self.cache_size <= 0:
+            return self._count_message_uncached(message)
 
-            # Add name and tool_call_id tokens
-            tokens += self.count_text(message.get("name", ""))
-            tokens += self.count_text(message.get("tool_call_id", ""))
+        key = self._message_key(message)
+        tokens = self._message_cache.get(key)
+        if tokens is not None:
+            self._message_cache.move_to_end(key)
+            return tokens
 
-            total_tokens += tokens
+        tokens = self._count_message_uncached(message)
+        self._message_cache[key] = tokens
+        if len(self._message_cache) > self.cache_size:
+            self._message_cache.popitem(last=False)
+        return tokens
+
+    def count_message_tokens(self, messages: List[dict]) -> int:
+        """Calculate the total number of tokens in a message list"""
+        total_tokens = self.FORMAT_TOKENS  # Base format tokens
+
+        for message in messages:
+            total_tokens += self.count_message(message)
 
         return total_tokens
 
+    def count_tools(self, tools: List[dict]) -> int:
+        """Calculate tokens for tool schemas.
+
+        Counts are cached per tool dict object; ToolCollection returns the same
+        dicts on every call, so schemas are tokenized once per collection.
+        """
+        token_count = 0
+        for tool in tools:
+            cached = self._tool_cache.get(id(tool))
+            if cached is not None and cached[0] is tool:
+                token_count += cached[1]
+                continue
+            tokens = self.count_text(str(tool))
+            if self.cache_size > 0:
+                if len(self._tool_cache) >= self.cache_size:
+                    self._tool_cache.clear()
+                self._tool_cache[id(tool)] = (tool, tokens)
+            token_count += tokens
+        return token_count
+
 
 class LLM:
     _instances: Dict[str, "LLM"] = {}
@@ -232,6 +306,8 @@ class LLM:
                 self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
 
             self.token_counter = TokenCounter(self.tokenizer)
+            # Completion cache shared by all LLM instances (keys include the model)
+            self.cache = get_completion_cache()
 
     def count_tokens(self, text: str) -> int:
         """Calculate the number of tokens in a text"""
@@ -371,6 +447,7 @@ class LLM:
         system_msgs: Optional[List[Union[dict, Message]]] = None,
         stream: bool = True,
         temperature: Optional[float] = None,
+        cache: Optional[bool] = None,
     ) -> str:
         """
         Send a prompt to the LLM and get the response.
@@ -380,6 +457,8 @@ class LLM:
             system_msgs: Optional system messages to prepend
             stream (bool): Whether to stream the response
             temperature (float): Sampling temperature for the response
+            cache (bool, optional): Force (True) or bypass (False) the completion
+                cache; by default only temperature 0 requests are cached
 
         Returns:
             str: The generated response
@@ -491,6 +570,21 @@ class LLM:
                     temperature if temperature is not None else self.temperature
                 )
 
+            # Serve repeated deterministic requests from the completion cache
+            cache_key = None
+            effective_temperature = (
+                temperature if temperature is not None else self.temperature
+            )
+            if self.cache.should_use(effective_temperature, cache):
+                cache_key = make_cache_key(
+                    "ask", self.model, messages, effective_temperature,
+                    max_tokens=self.max_tokens,
+                )
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Completion served from cache")
+                    return cached
+
             if not stream:
                 # Non-streaming request
                 response = await self.client.chat.completions.create(
@@ -505,6 +599,8 @@ class LLM:
                     response.usage.prompt_tokens, response.usage.completion_tokens
                 )
 
+                if cache_key:
+                    await self.cache.set(cache_key, response.choices[0].message.content)
                 return response.choices[0].message.content
 
             # Streaming request, For streaming, update estimated token count before making the request
@@ -532,6 +628,8 @@ class LLM:
             )
             self.total_completion_tokens += completion_tokens
 
+            if cache_key:
+                await self.cache.set(cache_key, full_response)
             return full_response
 
         except TokenLimitExceeded:
@@ -553,6 +651,25 @@ class LLM:
             logger.exception(f"Unexpected error in ask")
             raise
 
+    @staticmethod
+    def _message_to_cache(message) -> dict:
+        """Convert an OpenAI or Bedrock response message into a cacheable dict"""
+
+        def plain(value):
+            if isinstance(value, list):
+                return [plain(item) for item in value]
+            if isinstance(value, BaseModel):
+                return value.model_dump()
+            if hasattr(value, "__dict__"):  # Bedrock OpenAIResponse objects
+                return {k: plain(v) for k, v in vars(value).items()}
+            return value
+
+        return {
+            "role": "assistant",
+            "content": getattr(message, "content", None),
+            "tool_calls": plain(getattr(message, "tool_calls", None)),
+        }
+
     @retry(
         wait=wait_random_exponential(min=1, max=60),
         stop=stop_after_attempt(6),
@@ -724,6 +841,7 @@ class LLM:
         tools: Optional[List[dict]] = None,
         tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO,  # type: ignore
         temperature: Optional[float] = None,
+        cache: Optional[bool] = None,
         **kwargs,
     ) -> ChatCompletionMessage | None:
         """
@@ -736,6 +854,8 @@ class LLM:
             tools: List of tools to use
             tool_choice: Tool choice strategy
             temperature: Sampling temperature for the response
+            cache: Force (True) or bypass (False) the completion cache; by
+                default only temperature 0 requests are cached
             **kwargs: Additional completion arguments
 
         Returns:
@@ -766,10 +886,7 @@ class LLM:
             input_tokens = self.count_message_tokens(messages)
 
             # If there are tools, calculate token count for tool descriptions
-            tools_tokens = 0
-            if tools:
-                for tool in tools:
-                    tools_tokens += self.count_tokens(str(tool))
+            tools_tokens = self.token_counter.count_tools(tools) if tools else 0
 
             input_tokens += tools_tokens
 
@@ -803,6 +920,22 @@ class LLM:
                     temperature if temperature is not None else self.temperature
                 )
 
+            # Serve repeated deterministic requests from the completion cache
+            cache_key = None
+            effective_temperature = (
+                temperature if temperature is not None else self.temperature
+            )
+            if self.cache.should_use(effective_temperature, cache):
+                cache_key = make_cache_key(
+                    "ask_tool", self.model, messages, effective_temperature,
+                    tools=tools, tool_choice=str(tool_choice),
+                    max_tokens=self.max_tokens, kwargs=kwargs,
+                )
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Tool completion served from cache")
+                    return ChatCompletionMessage.model_validate(cached)
+
             params["stream"] = False  # Always use non-streaming for tool requests
             response: ChatCompletion = await self.client.chat.completions.create(
                 **params
@@ -819,6 +952,10 @@ class LLM:
                 response.usage.prompt_tokens, response.usage.completion_tokens
             )
 
+            if cache_key:
+                await self.cache.set(
+                    cache_key, self._message_to_cache(response.choices[0].message)
+                )
             return response.choices[0].message
 
         except TokenLimitExceeded:
@@ -0,0 +1,346 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from open_manus.app.config import LLMCacheSettings, config
+from open_manus.app.logger import logger
+
+
+def make_cache_key(
+    kind: str,
+    model: str,
+    messages: List[dict],
+    temperature: Optional[float],
+    tools: Optional[List[dict]] = None,
+    **extra: Any,
+) -> str:
+    """Builds a deterministic key for a completion request.
+
+    Args:
+        kind: Request kind ("ask", "ask_tool", ...), so different response
+            shapes never share an entry.
+        model: Model name.
+        messages: Formatted messages as sent to the API.
+        temperature: Effective sampling temperature.
+        tools: Tool schemas.
+        **extra: Other parameters that change the response (tool_choice, ...).
+
+    Returns:
+        str: Hex digest of the canonical JSON encoding of the request.
+    """
+    payload = {
+        "kind": kind,
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "tools": tools or [],
+        **extra,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheStore:
+    """On-disk cache tier with TTL and size-based eviction.
+
+    Entries are evicted least recently used first once the stored values
+    exceed max_bytes. Access is serialized with a lock so the store can be
+    used from worker threads.
+    """
+
+    def __init__(self, path: Path, ttl: int, max_bytes: int):
+        """Initializes the store.
+
+        Args:
+            path: Database file path, created on first write.
+            ttl: Seconds an entry stays valid.
+            max_bytes: Maximum total size of stored values.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_completions_accessed "
+                "ON completions (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Returns the stored value and its expiry time, or None if missing or expired."""
+        if self._conn is None and not self.path.exists():
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute(
+                "UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            conn.commit()
+            return value, expires_at
+
+    def delete(self, key: str) -> None:
+        """Removes an entry if present."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            conn.commit()
+
+    def set(self, key: str, value: str) -> int:
+        """Stores a value and evicts old entries if needed.
+
+        Returns:
+            int: Number of evicted entries.
+        """
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now + self.ttl, now),
+            )
+            evicted = self._evict(conn, now)
+            conn.commit()
+            return evicted
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        evicted = conn.execute(
+            "DELETE FROM completions WHERE expires_at <= ?", (now,)
+        ).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            return evicted
+
+        # Drop least recently used entries until the store fits again
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM completions ORDER BY accessed_at"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM completions WHERE key = ?", victims)
+        return evicted + len(victims)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            if self._conn is not None or self.path.exists():
+                conn = self._connect()
+                conn.execute("DELETE FROM completions")
+                conn.commit()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CompletionCache:
+    """Two-tier cache for LLM completions.
+
+    Values are JSON-serializable objects (completion text, or a message dict
+    for tool calls). Lookups go to the in-memory LRU tier first and then to
+    the optional SQLite tier; disk hits are promoted to memory.
+
+    Only deterministic requests are cached: a request with temperature > 0
+    bypasses the cache unless the caller forces it.
+    """
+
+    def __init__(
+        self,
+        memory_entries: int = 256,
+        store: Optional[SQLiteCacheStore] = None,
+        enabled: bool = True,
+        ttl: Optional[int] = None,
+    ):
+        """Initializes the cache.
+
+        Args:
+            memory_entries: Maximum number of entries in the memory tier.
+            store: Optional on-disk tier.
+            enabled: Whether caching is enabled at all.
+            ttl: Seconds a memory entry stays valid (defaults to the store's
+                TTL, or no expiry without a store).
+        """
+        self.enabled = enabled
+        self.memory_entries = max(0, memory_entries)
+        self.store = store
+        self.ttl = ttl if ttl is not None else (store.ttl if store is not None else None)
+        # key -> (value, expiry time or None)
+        self._memory: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def should_use(self, temperature: Optional[float], force: Optional[bool]) -> bool:
+        """Decides whether a request may use the cache.
+
+        Args:
+            temperature: Effective sampling temperature of the request.
+            force: True to cache regardless of temperature, False to bypass,
+                None to cache only deterministic (temperature 0) requests.
+        """
+        if not self.enabled or force is False:
+            use = False
+        elif force:
+            use = True
+        else:
+            use = not temperature
+        if not use:
+            self.stats["bypassed"] += 1
+        return use
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for key, or None on a miss."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return value
+            del self._memory[key]
+
+        if self.store is not None:
+            try:
+                row = await asyncio.to_thread(self.store.get, key)
+            except Exception as e:
+                logger.warning(f"LLM cache disk read failed: {e}")
+                row = None
+            if row is not None:
+                raw, expires_at = row
+                try:
+                    value = json.loads(raw)
+                except ValueError as e:
+                    logger.warning(f"Dropping corrupt LLM cache entry: {e}")
+                    await self._forget(key)
+                else:
+                    self._remember(key, value, expires_at)
+                    self.stats["disk_hits"] += 1
+                    return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Stores a value in both tiers."""
+        self._remember(key, value)
+        self.stats["stores"] += 1
+        if self.store is not None:
+            try:
+                self.stats["evictions"] += await asyncio.to_thread(
+                    self.store.set, key, json.dumps(value, ensure_ascii=False)
+                )
+            except Exception as e:
+                logger.warning(f"LLM cache disk write failed: {e}")
+
+    async def _forget(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(self.store.delete, key)
+        except Exception as e:
+            logger.warning(f"LLM cache disk delete failed: {e}")
+
+    def _remember(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        if self.memory_entries == 0:
+            return
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Removes all entries from both tiers."""
+        self._memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gets cache statistics.
+
+        Returns:
+            Dict: Hit/miss counters and tier sizes.
+        """
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_size": len(self._memory),
+            "disk_enabled": self.store is not None,
+        }
+
+
+_completion_cache: Optional[CompletionCache] = None
+
+
+def build_completion_cache(settings: Optional[LLMCacheSettings] = None) -> CompletionCache:
+    """Creates a completion cache from settings."""
+    settings = settings or LLMCacheSettings()
+    store = None
+    if settings.enabled and settings.disk_enabled:
+        path = Path(settings.disk_path) if settings.disk_path else (
+            config.workspace_root / ".cache" / "llm_cache.sqlite"
+        )
+        if not path.is_absolute():
+            path = config.root_path / path
+        store = SQLiteCacheStore(
+            path, ttl=settings.ttl, max_bytes=settings.max_disk_mb * 1024 * 1024
+        )
+    return CompletionCache(
+        memory_entries=settings.memory_entries,
+        store=store,
+        enabled=settings.enabled,
+        ttl=settings.ttl,
+    )
+
+
+def get_completion_cache() -> CompletionCache:
+    """Returns the process-wide completion cache shared by all LLM instances."""
+    global _completion_cache
+    if _completion_cache is None:
+        _completion_cache = build_completion_cache(config.llm_cache)
+    return _completion_cache
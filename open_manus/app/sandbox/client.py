@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Protocol
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Protocol
 
 from open_manus.app.config import SandboxSettings
+from open_manus.app.sandbox.core.manager import SandboxManager
 from open_manus.app.sandbox.core.sandbox import DockerSandbox
 
 
@@ -26,6 +28,22 @@ class SandboxFileOperations(Protocol):
         """
         ...
 
+    async def copy_from_many(self, files: Dict[str, str]) -> None:
+        """Copies several files from container to local in one archive.
+
+        Args:
+            files: Mapping of container path to local destination path.
+        """
+        ...
+
+    async def copy_to_many(self, files: Dict[str, str]) -> None:
+        """Copies several local files to container in one archive.
+
+        Args:
+            files: Mapping of local source path to container path.
+        """
+        ...
+
     async def read_file(self, path: str) -> str:
         """Reads file content from container.
 
@@ -46,6 +64,25 @@ class SandboxFileOperations(Protocol):
         """
         ...
 
+    async def read_files(self, paths: List[str]) -> Dict[str, bytes]:
+        """Reads several files from container in one round-trip.
+
+        Args:
+            paths: File paths in container.
+
+        Returns:
+            Dict[str, bytes]: Content of each file by path.
+        """
+        ...
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files to container in one round-trip.
+
+        Args:
+            files: Mapping of file path in container to content.
+        """
+        ...
+
 
 class BaseSandboxClient(ABC):
     """Base sandbox client interface."""
@@ -84,11 +121,26 @@ class BaseSandboxClient(ABC):
 
 
 class LocalSandboxClient(BaseSandboxClient):
-    """Local sandbox client implementation."""
+    """Local sandbox client implementation.
 
-    def __init__(self):
-        """Initializes local sandbox client."""
+    When the sandbox configuration enables a pool (pool_min_size > 0), the
+    sandbox is acquired from a SandboxManager warm pool and released back to
+    it on cleanup instead of being created and destroyed for every run.
+    Released sandboxes are reset (see DockerSandbox.reset); call `shutdown`
+    when the process is done with sandboxes to destroy the warm pool.
+    """
+
+    def __init__(self, manager: Optional[SandboxManager] = None):
+        """Initializes local sandbox client.
+
+        Args:
+            manager: Sandbox manager providing pooled sandboxes (created on
+                first use when the configuration enables a pool).
+        """
         self.sandbox: Optional[DockerSandbox] = None
+        self.manager = manager
+        self._sandbox_id: Optional[str] = None
+        self._keep_alive = 0
 
     async def create(
         self,
@@ -104,6 +156,18 @@ class LocalSandboxClient(BaseSandboxClient):
         Raises:
             RuntimeError: If sandbox creation fails.
         """
+        config = config or SandboxSettings()
+        if (self.manager or config.pool_min_size > 0) and not volume_bindings:
+            if self.manager is None:
+                self.manager = SandboxManager(
+                    pool_min_size=config.pool_min_size,
+                    pool_max_size=config.pool_max_size,
+                    pool_config=config,
+                )
+            self._sandbox_id = await self.manager.acquire(config)
+            self.sandbox = await self.manager.get_sandbox(self._sandbox_id)
+            return
+
         self.sandbox = DockerSandbox(config, volume_bindings)
         await self.sandbox.create()
 
@@ -152,6 +216,32 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         await self.sandbox.copy_to(local_path, container_path)
 
+    async def copy_from_many(self, files: Dict[str, str]) -> None:
+        """Copies several files from container to local in one archive.
+
+        Args:
+            files: Mapping of container path to local destination path.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        await self.sandbox.copy_from_many(files)
+
+    async def copy_to_many(self, files: Dict[str, str]) -> None:
+        """Copies several local files to container in one archive.
+
+        Args:
+            files: Mapping of local source path to container path.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        await self.sandbox.copy_to_many(files)
+
     async def read_file(self, path: str) -> str:
         """Reads file from container.
 
@@ -182,11 +272,67 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         await self.sandbox.write_file(path, content)
 
+    async def read_files(self, paths: List[str]) -> Dict[str, bytes]:
+        """Reads several files from container in one round-trip.
+
+        Args:
+            paths: File paths in container.
+
+        Returns:
+            Content of each file by path.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        return await self.sandbox.read_files(paths)
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files to container in one round-trip.
+
+        Args:
+            files: Mapping of file path in container to content.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        await self.sandbox.write_files(files)
+
+    @asynccontextmanager
+    async def keep_alive(self):
+        """Defers `cleanup` until the outermost keep_alive block exits.
+
+        Used by flows whose concurrently running agents share the sandbox, so
+        an agent finishing early does not tear it down under the others.
+        """
+        self._keep_alive += 1
+        try:
+            yield self
+        finally:
+            self._keep_alive -= 1
+            if not self._keep_alive:
+                await self.cleanup()
+
     async def cleanup(self) -> None:
-        """Cleans up resources."""
-        if self.sandbox:
+        """Cleans up resources (deferred while inside `keep_alive`)."""
+        if self._keep_alive:
+            return
+        if self._sandbox_id:
+            await self.manager.release(self._sandbox_id)
+            self._sandbox_id = None
+        elif self.sandbox:
             await self.sandbox.cleanup()
-            self.sandbox = None
+        self.sandbox = None
+
+    async def shutdown(self) -> None:
+        """Cleans up and destroys every sandbox of the manager, including the warm pool."""
+        await self.cleanup()
+        if self.manager:
+            await self.manager.cleanup()
+            self.manager = None
 
 
 def create_sandbox_client() -> LocalSandboxClient:
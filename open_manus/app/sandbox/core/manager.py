@@ -1,7 +1,10 @@
 import asyncio
+import atexit
+import time
 import uuid
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import Dict, Optional, Set
+from typing import Callable, Deque, Dict, Optional, Set
 
 import docker
 from docker.errors import APIError, ImageNotFound
@@ -18,12 +21,28 @@ class SandboxManager:
     monitoring, and cleanup. Provides concurrent access control and automatic
     cleanup mechanisms for sandbox resources.
 
+    Optionally keeps a warm pool of started sandboxes for the default pool
+    configuration. `acquire` hands out a pooled sandbox when one is ready
+    (falling back to a cold start), `release` resets it and returns it to the
+    pool, or recycles it if the reset fails or the pool is full. The pool is
+    refilled to `pool_min_size` in the background and idle pooled sandboxes
+    are health-checked by the cleanup loop. Acquired sandboxes are never
+    evicted as idle; they live until released.
+
+    Containers still running when the interpreter exits without `cleanup`
+    are force-removed by an atexit hook.
+
     Attributes:
-        max_sandboxes: Maximum allowed number of sandboxes.
+        max_sandboxes: Maximum allowed number of sandboxes, pooled ones included.
         idle_timeout: Sandbox idle timeout in seconds.
         cleanup_interval: Cleanup check interval in seconds.
+        pool_min_size: Number of warm sandboxes kept ready.
+        pool_max_size: Maximum number of warm sandboxes kept.
+        pool_config: Configuration of pooled sandboxes.
         _sandboxes: Active sandbox instance mapping.
         _last_used: Last used time record for sandboxes.
+        _acquired: Sandboxes handed out by `acquire` and not yet released.
+        _pool: Warm sandboxes ready to be acquired.
     """
 
     def __init__(
@@ -31,6 +50,11 @@ class SandboxManager:
         max_sandboxes: int = 100,
         idle_timeout: int = 3600,
         cleanup_interval: int = 300,
+        pool_min_size: int = 0,
+        pool_max_size: Optional[int] = None,
+        pool_config: Optional[SandboxSettings] = None,
+        client: Optional[docker.DockerClient] = None,
+        sandbox_factory: Optional[Callable[..., DockerSandbox]] = None,
     ):
         """Initializes sandbox manager.
 
@@ -38,22 +62,52 @@ class SandboxManager:
             max_sandboxes: Maximum sandbox count limit.
             idle_timeout: Idle timeout in seconds.
             cleanup_interval: Cleanup check interval in seconds.
+            pool_min_size: Warm sandboxes to keep ready (0 disables prewarming).
+            pool_max_size: Maximum warm sandboxes kept after release
+                (defaults to pool_min_size).
+            pool_config: Configuration of pooled sandboxes.
+            client: Docker client (created from the environment if None).
+            sandbox_factory: Callable creating sandboxes from
+                (config, volume_bindings); defaults to DockerSandbox.
         """
         self.max_sandboxes = max_sandboxes
         self.idle_timeout = idle_timeout
         self.cleanup_interval = cleanup_interval
+        self.pool_min_size = max(0, pool_min_size)
+        self.pool_max_size = max(
+            self.pool_min_size, pool_min_size if pool_max_size is None else pool_max_size
+        )
+        self.pool_config = pool_config or SandboxSettings()
 
         # Docker client
-        self._client = docker.from_env()
+        self._client = client or docker.from_env()
+        self._sandbox_factory = sandbox_factory or DockerSandbox
 
         # Resource mappings
         self._sandboxes: Dict[str, DockerSandbox] = {}
         self._last_used: Dict[str, float] = {}
+        self._acquired: Set[str] = set()
 
         # Concurrency control
         self._locks: Dict[str, asyncio.Lock] = {}
         self._global_lock = asyncio.Lock()
         self._active_operations: Set[str] = set()
+        self._pending_creations = 0
+
+        # Warm pool
+        self._pool: Deque[DockerSandbox] = deque()
+        self._poolable: Set[str] = set()
+        self._pool_creating = 0
+        # Sandboxes taken out of the pool or _sandboxes for a health check or reset
+        self._pool_checkouts = 0
+        self._refill_task: Optional[asyncio.Task] = None
+        self._pool_stats: Dict[str, int] = {
+            "pool_hits": 0,
+            "cold_starts": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+        }
+        self._acquire_latencies: Deque[float] = deque(maxlen=1000)
 
         # Cleanup task
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -61,6 +115,8 @@ class SandboxManager:
 
         # Start automatic cleanup
         self.start_cleanup_task()
+        self._schedule_refill()
+        atexit.register(self._remove_containers_at_exit)
 
     async def ensure_image(self, image: str) -> bool:
         """Ensures Docker image is available.
@@ -118,6 +174,10 @@ class SandboxManager:
     ) -> str:
         """Creates a new sandbox instance.
 
+        The global lock is only held to reserve a slot, so several sandboxes
+        can start concurrently. Warm pooled sandboxes take slots too; when
+        the limit is reached, the oldest one is discarded to make room.
+
         Args:
             config: Sandbox configuration.
             volume_bindings: Volume mapping configuration.
@@ -128,33 +188,263 @@ class SandboxManager:
         Raises:
             RuntimeError: If max sandbox count reached or creation fails.
         """
+        victim = None
         async with self._global_lock:
-            if len(self._sandboxes) >= self.max_sandboxes:
-                raise RuntimeError(
-                    f"Maximum number of sandboxes ({self.max_sandboxes}) reached"
-                )
+            if self._slots_in_use() >= self.max_sandboxes:
+                if not self._pool:
+                    raise RuntimeError(
+                        f"Maximum number of sandboxes ({self.max_sandboxes}) reached"
+                    )
+                # An idle warm sandbox gives way to a sandbox that is needed now
+                victim = self._pool.popleft()
+            self._pending_creations += 1
+
+        try:
+            if victim is not None:
+                await self._discard(victim)
+            sandbox = await self._start_sandbox(config, volume_bindings)
+            async with self._global_lock:
+                return self._register(sandbox)
+        finally:
+            self._pending_creations -= 1
+
+    async def _start_sandbox(
+        self,
+        config: Optional[SandboxSettings] = None,
+        volume_bindings: Optional[Dict[str, str]] = None,
+    ) -> DockerSandbox:
+        """Creates and starts a sandbox without registering it.
+
+        Raises:
+            RuntimeError: If the image is unavailable or creation fails.
+        """
+        config = config or SandboxSettings()
+        if not await self.ensure_image(config.image):
+            raise RuntimeError(f"Failed to ensure Docker image: {config.image}")
+
+        try:
+            sandbox = self._sandbox_factory(config, volume_bindings)
+            await sandbox.create()
+            return sandbox
+        except Exception as e:
+            logger.error(f"Failed to create sandbox: {e}")
+            raise RuntimeError(f"Failed to create sandbox: {e}")
+
+    def _slots_in_use(self) -> int:
+        """Counts sandboxes that take a slot of max_sandboxes, pooled ones included."""
+        return (
+            len(self._sandboxes)
+            + self._pending_creations
+            + len(self._pool)
+            + self._pool_creating
+            + self._pool_checkouts
+        )
+
+    def _register(self, sandbox: DockerSandbox) -> str:
+        """Registers a started sandbox as active. Caller holds the global lock."""
+        sandbox_id = str(uuid.uuid4())
+        self._sandboxes[sandbox_id] = sandbox
+        self._last_used[sandbox_id] = asyncio.get_event_loop().time()
+        self._locks[sandbox_id] = asyncio.Lock()
+        logger.info(f"Created sandbox {sandbox_id}")
+        return sandbox_id
+
+    def _is_pool_config(
+        self, config: Optional[SandboxSettings], volume_bindings: Optional[Dict[str, str]]
+    ) -> bool:
+        return not volume_bindings and (config is None or config == self.pool_config)
+
+    async def acquire(
+        self,
+        config: Optional[SandboxSettings] = None,
+        volume_bindings: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Gets a ready sandbox, from the warm pool when possible.
+
+        Requests matching the pool configuration (and without volume bindings)
+        take a healthy pooled sandbox; otherwise, or when the pool is empty, a
+        sandbox is started on demand (a cold start).
+
+        Args:
+            config: Sandbox configuration (None for the pool configuration).
+            volume_bindings: Volume mapping configuration.
+
+        Returns:
+            str: Sandbox ID. Hand it back with `release`.
 
-            config = config or SandboxSettings()
-            if not await self.ensure_image(config.image):
-                raise RuntimeError(f"Failed to ensure Docker image: {config.image}")
+        Raises:
+            RuntimeError: If max sandbox count reached or creation fails.
+        """
+        started = time.perf_counter()
+        poolable = self._is_pool_config(config, volume_bindings)
+        sandbox_id = None
 
-            sandbox_id = str(uuid.uuid4())
+        while poolable and sandbox_id is None:
+            if not self._pool:
+                if (
+                    self._slots_in_use() < self.max_sandboxes
+                    or self._refill_task is None
+                    or self._refill_task.done()
+                ):
+                    break
+                # The last free slots are being warmed; wait for them instead of failing
+                await asyncio.shield(self._refill_task)
+                continue
+
+            # Most recently released first, so its caches are still warm
+            sandbox = self._pool.pop()
+            self._pool_checkouts += 1
             try:
-                sandbox = DockerSandbox(config, volume_bindings)
-                await sandbox.create()
+                healthy = await self._is_healthy(sandbox)
+                if healthy:
+                    # The sandbox already holds a slot, so no limit check is needed
+                    async with self._global_lock:
+                        sandbox_id = self._register(sandbox)
+                else:
+                    self._pool_stats["unhealthy"] += 1
+                    await self._discard(sandbox)
+            finally:
+                self._pool_checkouts -= 1
+            if healthy:
+                self._pool_stats["pool_hits"] += 1
 
-                self._sandboxes[sandbox_id] = sandbox
-                self._last_used[sandbox_id] = asyncio.get_event_loop().time()
-                self._locks[sandbox_id] = asyncio.Lock()
+        if sandbox_id is None:
+            sandbox_id = await self.create_sandbox(
+                self.pool_config if poolable else config, volume_bindings
+            )
+            self._pool_stats["cold_starts"] += 1
 
-                logger.info(f"Created sandbox {sandbox_id}")
-                return sandbox_id
+        self._acquired.add(sandbox_id)
+        if poolable:
+            self._poolable.add(sandbox_id)
+        self._acquire_latencies.append(time.perf_counter() - started)
+        self._schedule_refill()
+        return sandbox_id
 
-            except Exception as e:
-                logger.error(f"Failed to create sandbox: {e}")
-                if sandbox_id in self._sandboxes:
-                    await self.delete_sandbox(sandbox_id)
-                raise RuntimeError(f"Failed to create sandbox: {e}")
+    async def release(self, sandbox_id: str) -> None:
+        """Returns an acquired sandbox.
+
+        Pool-compatible sandboxes are reset and put back in the pool while it
+        has room; all others are deleted.
+
+        Args:
+            sandbox_id: Sandbox ID returned by `acquire`.
+        """
+        poolable = sandbox_id in self._poolable
+        self._poolable.discard(sandbox_id)
+        self._acquired.discard(sandbox_id)
+        if (
+            not poolable
+            or self._is_shutting_down
+            or len(self._pool) >= self.pool_max_size
+            or sandbox_id in self._active_operations
+        ):
+            await self.delete_sandbox(sandbox_id)
+            return
+
+        async with self._global_lock:
+            sandbox = self._sandboxes.pop(sandbox_id, None)
+            self._last_used.pop(sandbox_id, None)
+            self._locks.pop(sandbox_id, None)
+            if sandbox is None:
+                return
+            self._pool_checkouts += 1
+
+        try:
+            reset = await self._reset(sandbox)
+            if reset:
+                self._pool.append(sandbox)
+            else:
+                self._pool_stats["recycled"] += 1
+                await self._discard(sandbox)
+        finally:
+            self._pool_checkouts -= 1
+        if not reset:
+            self._schedule_refill()
+
+    async def _reset(self, sandbox: DockerSandbox) -> bool:
+        """Resets a released sandbox for the next user (see DockerSandbox.reset)."""
+        try:
+            await asyncio.wait_for(sandbox.reset(), 60)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset sandbox, recycling it: {e}")
+            return False
+
+    async def _is_healthy(self, sandbox: DockerSandbox) -> bool:
+        """Checks that a sandbox still answers commands."""
+        try:
+            return (await sandbox.run_command("echo ok", timeout=5)).strip() == "ok"
+        except Exception:
+            return False
+
+    async def _discard(self, sandbox: DockerSandbox) -> None:
+        try:
+            await sandbox.cleanup()
+        except Exception as e:
+            logger.error(f"Error cleaning up pooled sandbox: {e}")
+
+    def _schedule_refill(self) -> None:
+        """Starts a background refill if the pool is below its minimum size."""
+        if (
+            self._is_shutting_down
+            or len(self._pool) + self._pool_creating >= self.pool_min_size
+            or self._slots_in_use() >= self.max_sandboxes
+            or (self._refill_task is not None and not self._refill_task.done())
+        ):
+            return
+        self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        """Starts sandboxes concurrently until the pool reaches its minimum size.
+
+        Pooled sandboxes count against max_sandboxes, so the refill stops
+        short of the minimum size when the limit leaves no room.
+        """
+        while not self._is_shutting_down:
+            async with self._global_lock:
+                missing = min(
+                    self.pool_min_size - len(self._pool) - self._pool_creating,
+                    self.max_sandboxes - self._slots_in_use(),
+                )
+                if missing <= 0:
+                    return
+                self._pool_creating += missing
+            try:
+                results = await asyncio.gather(
+                    *(self._start_sandbox(self.pool_config) for _ in range(missing)),
+                    return_exceptions=True,
+                )
+            finally:
+                self._pool_creating -= missing
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to warm sandbox: {result}")
+                elif self._is_shutting_down:
+                    await self._discard(result)
+                else:
+                    self._pool.append(result)
+            if all(isinstance(result, BaseException) for result in results):
+                # Docker is failing; retry on the next acquire or cleanup tick
+                return
+
+    async def warm_pool(self) -> None:
+        """Fills the pool to its minimum size and waits until it is ready."""
+        self._schedule_refill()
+        if self._refill_task is not None:
+            await self._refill_task
+
+    async def _check_pool_health(self) -> None:
+        """Removes pooled sandboxes that stopped answering and refills the pool."""
+        for sandbox in list(self._pool):
+            if not await self._is_healthy(sandbox):
+                try:
+                    self._pool.remove(sandbox)
+                except ValueError:
+                    continue  # acquired meanwhile
+                self._pool_stats["unhealthy"] += 1
+                await self._discard(sandbox)
+        self._schedule_refill()
 
     async def get_sandbox(self, sandbox_id: str) -> DockerSandbox:
         """Gets a sandbox instance.
@@ -178,6 +468,7 @@ class SandboxManager:
             while not self._is_shutting_down:
                 try:
                     await self._cleanup_idle_sandboxes()
+                    await self._check_pool_health()
                 except Exception as e:
                     logger.error(f"Error in cleanup loop: {e}")
                 await asyncio.sleep(self.cleanup_interval)
@@ -193,6 +484,7 @@ class SandboxManager:
             for sandbox_id, last_used in self._last_used.items():
                 if (
                     sandbox_id not in self._active_operations
+                    and sandbox_id not in self._acquired
                     and current_time - last_used > self.idle_timeout
                 ):
                     to_cleanup.append(sandbox_id)
@@ -207,6 +499,7 @@ class SandboxManager:
         """Cleans up all resources."""
         logger.info("Starting manager cleanup...")
         self._is_shutting_down = True
+        atexit.unregister(self._remove_containers_at_exit)
 
         # Cancel cleanup task
         if self._cleanup_task:
@@ -216,15 +509,25 @@ class SandboxManager:
             except (asyncio.CancelledError, asyncio.TimeoutError):
                 pass
 
+        if self._refill_task:
+            # Let sandboxes being started finish so they are destroyed rather
+            # than leaked; the refill discards them while shutting down
+            try:
+                await asyncio.wait_for(self._refill_task, timeout=60.0)
+            except (asyncio.CancelledError, Exception):
+                pass
+
         # Get all sandbox IDs to clean up
         async with self._global_lock:
             sandbox_ids = list(self._sandboxes.keys())
 
-        # Concurrently clean up all sandboxes
+        # Concurrently clean up all sandboxes, including the warm pool
         cleanup_tasks = []
         for sandbox_id in sandbox_ids:
             task = asyncio.create_task(self._safe_delete_sandbox(sandbox_id))
             cleanup_tasks.append(task)
+        while self._pool:
+            cleanup_tasks.append(asyncio.create_task(self._discard(self._pool.popleft())))
 
         if cleanup_tasks:
             # Wait for all cleanup tasks to complete, with timeout to avoid infinite waiting
@@ -238,9 +541,22 @@ class SandboxManager:
         self._last_used.clear()
         self._locks.clear()
         self._active_operations.clear()
+        self._poolable.clear()
+        self._acquired.clear()
 
         logger.info("Manager cleanup completed")
 
+    def _remove_containers_at_exit(self) -> None:
+        """Force-removes remaining containers when the process exits without cleanup."""
+        for sandbox in [*self._sandboxes.values(), *self._pool]:
+            container = getattr(sandbox, "container", None)
+            if container is None:
+                continue
+            try:
+                container.remove(force=True)
+            except Exception as e:
+                logger.error(f"Failed to remove container {container.id} at exit: {e}")
+
     async def _safe_delete_sandbox(self, sandbox_id: str) -> None:
         """Safely deletes a single sandbox.
 
@@ -271,6 +587,7 @@ class SandboxManager:
                     self._sandboxes.pop(sandbox_id, None)
                     self._last_used.pop(sandbox_id, None)
                     self._locks.pop(sandbox_id, None)
+                    self._acquired.discard(sandbox_id)
                     logger.info(f"Deleted sandbox {sandbox_id}")
         except Exception as e:
             logger.error(f"Error during cleanup of sandbox {sandbox_id}: {e}")
@@ -306,8 +623,23 @@ class SandboxManager:
         return {
             "total_sandboxes": len(self._sandboxes),
             "active_operations": len(self._active_operations),
+            "acquired": len(self._acquired),
             "max_sandboxes": self.max_sandboxes,
             "idle_timeout": self.idle_timeout,
             "cleanup_interval": self.cleanup_interval,
             "is_shutting_down": self._is_shutting_down,
+            "pool_size": len(self._pool),
+            "pool_min_size": self.pool_min_size,
+            "pool_max_size": self.pool_max_size,
+            **self._pool_stats,
+            "acquire_p50_ms": self._latency_percentile(50),
+            "acquire_p99_ms": self._latency_percentile(99),
         }
+
+    def _latency_percentile(self, percentile: float) -> Optional[float]:
+        """Acquire latency percentile in milliseconds (nearest rank)."""
+        if not self._acquire_latencies:
+            return None
+        latencies = sorted(self._acquire_latencies)
+        rank = max(0, -(-len(latencies) * percentile // 100) - 1)
+        return round(latencies[int(rank)] * 1000, 3)
@@ -1,10 +1,14 @@
 import asyncio
 import io
 import os
+import shlex
+import shutil
+import stat
 import tarfile
 import tempfile
+import time
 import uuid
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import docker
 from docker.errors import NotFound
@@ -15,6 +19,169 @@ from open_manus.app.sandbox.core.exceptions import SandboxTimeoutError
 from open_manus.app.sandbox.core.terminal import AsyncDockerizedTerminal
 
 
+# Size of the chunks archives are streamed in; bounds memory per transfer
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks.
+
+    Lets tarfile consume an archive as it arrives from the Docker API.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _iter_tar(entries: Iterable[Tuple[Union[str, bytes], str]]) -> Iterator[bytes]:
+    """Generates a tar archive of (source, arcname) entries chunk by chunk.
+
+    A source is either a host path or the content of a regular file. Headers
+    are built with TarInfo and host files are read in ARCHIVE_CHUNK_SIZE
+    blocks, so nothing is spooled to disk or held in memory beyond one chunk.
+
+    Raises:
+        RuntimeError: If a file changes size while being archived.
+    """
+    for host_path, arcname in entries:
+        if isinstance(host_path, bytes):
+            info = tarfile.TarInfo(arcname.lstrip("/"))
+            info.size = len(host_path)
+            info.mode = 0o644
+            info.mtime = int(time.time())
+            yield info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+            yield host_path
+            yield tarfile.NUL * (-info.size % tarfile.BLOCKSIZE)
+            continue
+
+        st = os.lstat(host_path)
+        info = tarfile.TarInfo(arcname.lstrip("/"))
+        info.mode = stat.S_IMODE(st.st_mode)
+        info.mtime = int(st.st_mtime)
+        if stat.S_ISDIR(st.st_mode):
+            info.type = tarfile.DIRTYPE
+        elif stat.S_ISLNK(st.st_mode):
+            info.type = tarfile.SYMTYPE
+            info.linkname = os.readlink(host_path)
+        elif stat.S_ISREG(st.st_mode):
+            info.size = st.st_size
+        else:
+            continue  # sockets, fifos and devices are not copied
+        yield info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+
+        if info.isreg():
+            remaining = info.size
+            with open(host_path, "rb") as f:
+                while remaining:
+                    chunk = f.read(min(ARCHIVE_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise RuntimeError(f"File changed while copying: {host_path}")
+                    remaining -= len(chunk)
+                    yield chunk
+            padding = -info.size % tarfile.BLOCKSIZE
+            if padding:
+                yield tarfile.NUL * padding
+    # End-of-archive marker
+    yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+
+def _archive_entries(src_path: str, arcname: str) -> List[Tuple[str, str]]:
+    """Lists (host_path, arcname) entries for a file or a directory tree."""
+    if not os.path.isdir(src_path) or os.path.islink(src_path):
+        return [(src_path, arcname)]
+    entries = []
+    for root, dirs, files in os.walk(src_path):
+        rel_root = os.path.relpath(root, src_path)
+        base = arcname if rel_root == "." else os.path.join(arcname, rel_root)
+        entries.append((root, base))
+        for name in sorted(dirs):
+            if os.path.islink(os.path.join(root, name)):
+                entries.append((os.path.join(root, name), os.path.join(base, name)))
+        for name in sorted(files):
+            entries.append((os.path.join(root, name), os.path.join(base, name)))
+    return entries
+
+
+def _extract_member(
+    tar: tarfile.TarFile,
+    member: tarfile.TarInfo,
+    target: str,
+    root: str,
+    extracted: Dict[str, str],
+) -> None:
+    """Extracts the current member of a streamed archive to target.
+
+    Symlinks are recreated as they are, whatever they point to, but no member
+    is written through a symlink that leads out of root. Hard links are
+    extracted as copies of the file they link to, which tar always emits
+    earlier in the archive; `extracted` maps the names of regular files
+    extracted so far to their host paths and is updated here.
+
+    Raises:
+        ValueError: If a member would be written outside root, a hard link
+            points outside the archive or the member type is not supported.
+    """
+    parent = os.path.dirname(target)
+    if not _is_within(parent or ".", root):
+        raise ValueError(f"Unsafe path in archive: {member.name}")
+    if member.isdir():
+        os.makedirs(target, exist_ok=True)
+        return
+    if not (member.issym() or member.islnk() or member.isreg()):
+        raise ValueError(f"Unsupported file type in archive: {member.name}")
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    # Replace rather than write through an existing link
+    if os.path.islink(target):
+        os.remove(target)
+    if member.issym():
+        if os.path.lexists(target):
+            os.remove(target)
+        os.symlink(member.linkname, target)
+    elif member.islnk():
+        source = extracted.get(_member_path(member.linkname))
+        if source is None:
+            raise ValueError(f"Hard link to a file outside the archive: {member.name}")
+        shutil.copyfile(source, target)
+        os.chmod(target, member.mode & 0o777)
+        extracted[_member_path(member.name)] = target
+    else:
+        source = tar.extractfile(member)
+        with open(target, "wb") as dst:
+            shutil.copyfileobj(source, dst, ARCHIVE_CHUNK_SIZE)
+        os.chmod(target, member.mode & 0o777)
+        extracted[_member_path(member.name)] = target
+
+
+def _is_within(path: str, root: str) -> bool:
+    """Checks whether path, with symlinks resolved, is root or below it."""
+    real_root = os.path.realpath(root)
+    return os.path.commonpath([real_root, os.path.realpath(path)]) == real_root
+
+
+def _member_path(name: str) -> str:
+    """Normalizes an archive member name, rejecting path traversal."""
+    name = name.lstrip("/").rstrip("/")
+    if ".." in name.split("/"):
+        raise ValueError(f"Unsafe path in archive: {name}")
+    return name
+
+
 class DockerSandbox:
     """Docker sandbox environment.
 
@@ -33,16 +200,18 @@ class DockerSandbox:
         self,
         config: Optional[SandboxSettings] = None,
         volume_bindings: Optional[Dict[str, str]] = None,
+        client: Optional[docker.DockerClient] = None,
     ):
         """Initializes a sandbox instance.
 
         Args:
             config: Sandbox configuration. Default configuration used if None.
             volume_bindings: Volume mappings in {host_path: container_path} format.
+            client: Docker client (created from the environment if None).
         """
         self.config = config or SandboxSettings()
         self.volume_bindings = volume_bindings or {}
-        self.client = docker.from_env()
+        self.client = client or docker.from_env()
         self.container: Optional[Container] = None
         self.terminal: Optional[AsyncDockerizedTerminal] = None
 
@@ -87,14 +256,7 @@ class DockerSandbox:
             # Start container
             await asyncio.to_thread(self.container.start)
 
-            # Initialize terminal
-            self.terminal = AsyncDockerizedTerminal(
-                container["Id"],
-                self.config.work_dir,
-                env_vars={"PYTHONUNBUFFERED": "1"}
-                # Ensure Python output is not buffered
-            )
-            await self.terminal.init()
+            await self._start_terminal()
 
             return self
 
@@ -102,6 +264,49 @@ class DockerSandbox:
             await self.cleanup()  # Ensure resources are cleaned up
             raise RuntimeError(f"Failed to create sandbox: {e}") from e
 
+    async def _start_terminal(self) -> None:
+        """Starts a fresh terminal session in the working directory."""
+        self.terminal = AsyncDockerizedTerminal(
+            self.container.id,
+            self.config.work_dir,
+            env_vars={"PYTHONUNBUFFERED": "1"}
+            # Ensure Python output is not buffered
+        )
+        await self.terminal.init()
+
+    async def reset(self) -> None:
+        """Returns the sandbox to a clean state so it can be reused.
+
+        Kills every process except the container's init (including background
+        jobs and the terminal shell), empties the working directory, /tmp and
+        /var/tmp, and starts a new terminal session, which drops exported
+        variables and other shell state. Packages installed and files written
+        elsewhere in the container are kept.
+
+        Raises:
+            RuntimeError: If the sandbox is not running or the reset fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        if self.terminal:
+            await self.terminal.close()
+            self.terminal = None
+
+        script = (
+            'for p in /proc/[0-9]*; do pid="${p#/proc/}"; '
+            '[ "$pid" = 1 ] || [ "$pid" = "$$" ] || kill -9 "$pid" 2>/dev/null; done; '
+            f"for d in {shlex.quote(self.config.work_dir)} /tmp /var/tmp; do "
+            '[ ! -d "$d" ] || find "$d" -mindepth 1 -delete || exit 1; done'
+        )
+        result = await asyncio.to_thread(self.container.exec_run, ["sh", "-c", script])
+        if result.exit_code != 0:
+            raise RuntimeError(
+                f"Failed to reset sandbox: {result.output.decode('utf-8', errors='replace')}"
+            )
+
+        await self._start_terminal()
+
     def _prepare_volume_bindings(self) -> Dict[str, Dict[str, str]]:
         """Prepares volume binding configuration.
 
@@ -205,29 +410,8 @@ class DockerSandbox:
         Raises:
             RuntimeError: If write operation fails.
         """
-        if not self.container:
-            raise RuntimeError("Sandbox not initialized")
-
-        try:
-            resolved_path = self._safe_resolve_path(path)
-            parent_dir = os.path.dirname(resolved_path)
-
-            # Create parent directory
-            if parent_dir:
-                await self.run_command(f"mkdir -p {parent_dir}")
-
-            # Prepare file data
-            tar_stream = await self._create_tar_stream(
-                os.path.basename(path), content.encode("utf-8")
-            )
-
-            # Write file
-            await asyncio.to_thread(
-                self.container.put_archive, parent_dir or "/", tar_stream
-            )
-
-        except Exception as e:
-            raise RuntimeError(f"Failed to write file: {e}")
+        # A single put_archive; Docker creates missing parent directories
+        await self.write_files({path: content})
 
     def _safe_resolve_path(self, path: str) -> str:
         """Safely resolves container path, preventing path traversal.
@@ -255,6 +439,9 @@ class DockerSandbox:
     async def copy_from(self, src_path: str, dst_path: str) -> None:
         """Copies a file from the container.
 
+        The archive is extracted while it streams from the Docker API, so
+        memory use is bounded and no temporary archive is written.
+
         Args:
             src_path: Source file path (container).
             dst_path: Destination path (host).
@@ -269,136 +456,295 @@ class DockerSandbox:
             if parent_dir:
                 os.makedirs(parent_dir, exist_ok=True)
 
-            # Get file stream
             resolved_src = self._safe_resolve_path(src_path)
-            stream, stat = await asyncio.to_thread(
-                self.container.get_archive, resolved_src
-            )
-
-            # Create temporary directory to extract file
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                # Write stream to temporary file
-                tar_path = os.path.join(tmp_dir, "temp.tar")
-                with open(tar_path, "wb") as f:
-                    for chunk in stream:
-                        f.write(chunk)
-
-                # Extract file
-                with tarfile.open(tar_path) as tar:
-                    members = tar.getmembers()
-                    if not members:
-                        raise FileNotFoundError(f"Source file is empty: {src_path}")
-
-                    # If destination is a directory, we should preserve relative path structure
-                    if os.path.isdir(dst_path):
-                        tar.extractall(dst_path)
-                    else:
-                        # If destination is a file, we only extract the source file's content
-                        if len(members) > 1:
-                            raise RuntimeError(
-                                f"Source path is a directory but destination is a file: {src_path}"
-                            )
-
-                        with open(dst_path, "wb") as dst:
-                            src_file = tar.extractfile(members[0])
-                            if src_file is None:
-                                raise RuntimeError(
-                                    f"Failed to extract file: {src_path}"
-                                )
-                            dst.write(src_file.read())
+            await asyncio.to_thread(self._stream_from, resolved_src, src_path, dst_path)
 
         except docker.errors.NotFound:
             raise FileNotFoundError(f"Source file not found: {src_path}")
+        except FileNotFoundError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Failed to copy file: {e}")
 
-    async def copy_to(self, src_path: str, dst_path: str) -> None:
-        """Copies a file to the container.
+    def _stream_from(self, resolved_src: str, src_path: str, dst_path: str) -> None:
+        """Downloads and extracts an archive of resolved_src (runs in a thread)."""
+        stream, _ = self.container.get_archive(
+            resolved_src, chunk_size=ARCHIVE_CHUNK_SIZE
+        )
+        # If destination is a directory, we preserve the relative path structure
+        into_dir = os.path.isdir(dst_path)
+        extracted: Dict[str, str] = {}
+        members = 0
+        with tarfile.open(fileobj=_ChunkReader(stream), mode="r|") as tar:
+            for member in tar:
+                name = _member_path(member.name)
+                if into_dir:
+                    _extract_member(
+                        tar, member, os.path.join(dst_path, name), dst_path, extracted
+                    )
+                elif member.isdir() or members:
+                    # If destination is a file, we only extract the source file's content
+                    raise RuntimeError(
+                        f"Source path is a directory but destination is a file: {src_path}"
+                    )
+                else:
+                    _extract_member(
+                        tar, member, dst_path, os.path.dirname(dst_path) or ".", extracted
+                    )
+                members += 1
+        if not members:
+            raise FileNotFoundError(f"Source file is empty: {src_path}")
+
+    async def copy_from_many(self, files: Dict[str, str]) -> None:
+        """Copies several files or directories from the container at once.
+
+        All sources are packed by a single `tar` process in the container and
+        streamed back in one archive, which is extracted on the fly.
 
         Args:
-            src_path: Source file path (host).
-            dst_path: Destination path (container).
+            files: Mapping of container source path to host destination path.
+                Directories are copied recursively to the destination path.
 
         Raises:
-            FileNotFoundError: If source file does not exist.
+            FileNotFoundError: If a source path does not exist.
             RuntimeError: If copy operation fails.
         """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+        if not files:
+            return
+
         try:
-            if not os.path.exists(src_path):
-                raise FileNotFoundError(f"Source file not found: {src_path}")
-
-            # Create destination directory in container
-            resolved_dst = self._safe_resolve_path(dst_path)
-            container_dir = os.path.dirname(resolved_dst)
-            if container_dir:
-                await self.run_command(f"mkdir -p {container_dir}")
-
-            # Create tar file to upload
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                tar_path = os.path.join(tmp_dir, "temp.tar")
-                with tarfile.open(tar_path, "w") as tar:
-                    # Handle directory source path
-                    if os.path.isdir(src_path):
-                        os.path.basename(src_path.rstrip("/"))
-                        for root, _, files in os.walk(src_path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                arcname = os.path.join(
-                                    os.path.basename(dst_path),
-                                    os.path.relpath(file_path, src_path),
-                                )
-                                tar.add(file_path, arcname=arcname)
+            targets = {
+                _member_path(self._safe_resolve_path(src)): dst
+                for src, dst in files.items()
+            }
+            await asyncio.to_thread(self._stream_many_from, targets)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to copy files: {e}")
+
+    def _stream_many_from(self, targets: Dict[str, str]) -> None:
+        """Streams one tar archive of all targets out of the container (runs in a thread)."""
+
+        extracted: Dict[str, str] = {}
+
+        def extract(src: str, suffix: str, tar: tarfile.TarFile, member: tarfile.TarInfo):
+            if suffix:
+                target, root = os.path.join(targets[src], suffix), targets[src]
+            else:
+                target = targets[src]
+                root = os.path.dirname(target) or "."
+            _extract_member(tar, member, target, root, extracted)
+
+        self._stream_archive(list(targets), extract)
+
+    def _stream_archive(
+        self,
+        sources: List[str],
+        handle: Callable[[str, str, tarfile.TarFile, tarfile.TarInfo], None],
+        dereference: bool = False,
+    ) -> None:
+        """Packs sources with one `tar` exec and passes each member to handle.
+
+        Args:
+            sources: Absolute container paths without the leading "/".
+            handle: Called with (source, path below the source, tar, member)
+                while the archive streams in.
+            dereference: Archive the files symlinks point to instead of the
+                links (`tar -h`).
+
+        Raises:
+            FileNotFoundError: If a source path does not exist.
+            RuntimeError: If tar fails in the container.
+        """
+        api = self.client.api
+        exec_id = api.exec_create(
+            self.container.id,
+            ["tar", "-cf", "-", "-C", "/", *(["-h"] if dereference else []), "--"]
+            + sources,
+            stdout=True,
+            stderr=True,
+        )["Id"]
+        output = api.exec_start(exec_id, stream=True, demux=True)
+        errors: List[bytes] = []
+
+        def stdout_chunks() -> Iterator[bytes]:
+            for stdout, stderr in output:
+                if stderr:
+                    errors.append(stderr)
+                if stdout:
+                    yield stdout
+
+        # Longest sources first, so nested sources map to their own destination
+        ordered = sorted(set(sources), key=len, reverse=True)
+        seen = set()
+        with tarfile.open(fileobj=_ChunkReader(stdout_chunks()), mode="r|") as tar:
+            for member in tar:
+                name = _member_path(member.name)
+                for src in ordered:
+                    if name == src:
+                        suffix = ""
+                    elif name.startswith(src + "/"):
+                        suffix = name[len(src) + 1 :]
                     else:
-                        # Add single file to tar
-                        tar.add(src_path, arcname=os.path.basename(dst_path))
-
-                # Read tar file content
-                with open(tar_path, "rb") as f:
-                    data = f.read()
-
-                # Upload to container
-                await asyncio.to_thread(
-                    self.container.put_archive,
-                    os.path.dirname(resolved_dst) or "/",
-                    data,
-                )
+                        continue
+                    seen.add(src)
+                    handle(src, suffix, tar, member)
+                    break
+        # Drain anything left after the end-of-archive marker
+        for _ in stdout_chunks():
+            pass
+
+        missing = [f"/{src}" for src in sources if src not in seen]
+        if missing:
+            raise FileNotFoundError(f"Source files not found: {', '.join(missing)}")
+        exit_code = api.exec_inspect(exec_id).get("ExitCode")
+        if exit_code:
+            raise RuntimeError(b"".join(errors).decode(errors="replace").strip())
+
+    async def read_files(self, paths: List[str]) -> Dict[str, bytes]:
+        """Reads several files from the container in one archive round-trip.
+
+        Symlinks are followed, like `cat` in `read_file`.
 
-                # Verify file was created successfully
-                try:
-                    await self.run_command(f"test -e {resolved_dst}")
-                except Exception:
-                    raise RuntimeError(f"Failed to verify file creation: {dst_path}")
+        Args:
+            paths: File paths (relative paths are resolved against work_dir).
 
-        except FileNotFoundError:
+        Returns:
+            Mapping of each requested path to its content.
+
+        Raises:
+            FileNotFoundError: If a file does not exist.
+            IsADirectoryError: If a path is a directory.
+            RuntimeError: If read operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+        if not paths:
+            return {}
+
+        sources = {path: _member_path(self._safe_resolve_path(path)) for path in paths}
+        contents: Dict[str, bytes] = {}
+
+        def read(src: str, suffix: str, tar: tarfile.TarFile, member: tarfile.TarInfo):
+            if suffix or member.isdir():
+                raise IsADirectoryError(f"Is a directory: /{src}")
+            if member.islnk():
+                # A path that is the same file as one read before (e.g. a
+                # symlink and its target) is archived as a hard link to it
+                target = _member_path(member.linkname)
+                if target not in contents:
+                    raise RuntimeError(f"Not a regular file: /{src}")
+                contents[src] = contents[target]
+            elif member.isreg():
+                contents[src] = tar.extractfile(member).read()
+            else:
+                raise RuntimeError(f"Not a regular file: /{src}")
+
+        try:
+            await asyncio.to_thread(
+                self._stream_archive, list(sources.values()), read, dereference=True
+            )
+        except (FileNotFoundError, IsADirectoryError):
             raise
         except Exception as e:
-            raise RuntimeError(f"Failed to copy file: {e}")
+            raise RuntimeError(f"Failed to read files: {e}")
+        return {path: contents[src] for path, src in sources.items()}
 
-    @staticmethod
-    async def _create_tar_stream(name: str, content: bytes) -> io.BytesIO:
-        """Creates a tar file stream.
+    async def write_files(self, files: Dict[str, Union[str, bytes]]) -> None:
+        """Writes several files to the container in one archive round-trip.
+
+        Missing parent directories are created by Docker while extracting.
 
         Args:
-            name: Filename.
-            content: File content.
+            files: Mapping of path (relative to work_dir unless absolute) to
+                content; str content is encoded as UTF-8.
 
-        Returns:
-            Tar file stream.
+        Raises:
+            RuntimeError: If write operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+        if not files:
+            return
+
+        try:
+            entries = [
+                (
+                    content.encode("utf-8") if isinstance(content, str) else content,
+                    self._safe_resolve_path(path),
+                )
+                for path, content in files.items()
+            ]
+            uploaded = await asyncio.to_thread(
+                self.container.put_archive, "/", _iter_tar(entries)
+            )
+            if not uploaded:
+                raise RuntimeError("Docker rejected the archive")
+        except Exception as e:
+            raise RuntimeError(f"Failed to write files: {e}")
+
+    async def copy_to(self, src_path: str, dst_path: str) -> None:
+        """Copies a file to the container.
+
+        Args:
+            src_path: Source file path (host).
+            dst_path: Destination path (container).
+
+        Raises:
+            FileNotFoundError: If source file does not exist.
+            RuntimeError: If copy operation fails.
         """
-        tar_stream = io.BytesIO()
-        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-            tarinfo = tarfile.TarInfo(name=name)
-            tarinfo.size = len(content)
-            tar.addfile(tarinfo, io.BytesIO(content))
-        tar_stream.seek(0)
-        return tar_stream
+        await self.copy_to_many({src_path: dst_path})
+
+    async def copy_to_many(self, files: Dict[str, str]) -> None:
+        """Copies several files or directories to the container at once.
+
+        All sources are streamed into a single archive that is generated while
+        it is uploaded, in one `put_archive` call. Docker creates missing
+        parent directories while extracting, so no other round-trip is needed.
+
+        Args:
+            files: Mapping of host source path to container destination path.
+                Directories are copied recursively to the destination path.
+
+        Raises:
+            FileNotFoundError: If a source file does not exist.
+            RuntimeError: If copy operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        try:
+            entries = []
+            for src_path, dst_path in files.items():
+                if not os.path.lexists(src_path):
+                    raise FileNotFoundError(f"Source file not found: {src_path}")
+                resolved_dst = self._safe_resolve_path(dst_path)
+                entries.extend(_archive_entries(src_path, resolved_dst))
+            if not entries:
+                return
+
+            # Paths in the archive are absolute (without the leading "/")
+            uploaded = await asyncio.to_thread(
+                self.container.put_archive, "/", _iter_tar(entries)
+            )
+            if not uploaded:
+                raise RuntimeError("Docker rejected the archive")
+
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to copy file: {e}")
 
     @staticmethod
     async def _read_from_tar(tar_stream) -> bytes:
         """Reads file content from a tar stream.
 
         Args:
-            tar_stream: Tar file stream.
+            tar_stream: Tar file stream (an iterator of chunks).
 
         Returns:
             File content.
@@ -406,12 +752,9 @@ class DockerSandbox:
         Raises:
             RuntimeError: If read operation fails.
         """
-        with tempfile.NamedTemporaryFile() as tmp:
-            for chunk in tar_stream:
-                tmp.write(chunk)
-            tmp.seek(0)
 
-            with tarfile.open(fileobj=tmp) as tar:
+        def read() -> bytes:
+            with tarfile.open(fileobj=_ChunkReader(tar_stream), mode="r|") as tar:
                 member = tar.next()
                 if not member:
                     raise RuntimeError("Empty tar archive")
@@ -422,6 +765,8 @@ class DockerSandbox:
 
                 return file_content.read()
 
+        return await asyncio.to_thread(read)
+
     async def cleanup(self) -> None:
         """Cleans up sandbox resources."""
         errors = []
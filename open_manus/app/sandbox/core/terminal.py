@@ -8,6 +8,7 @@ allowing interactive command execution with timeout control.
 import asyncio
 import re
 import socket
+import uuid
 from typing import Dict, Optional, Tuple, Union
 
 import docker
@@ -17,16 +18,33 @@ from docker.models.containers import Container
 
 
 class DockerSession:
-    def __init__(self, container_id: str) -> None:
+    """Interactive bash session over a Docker exec socket.
+
+    Output is read with the event loop's socket support (no polling) and
+    every command is framed by begin/done markers carrying a per-command
+    token, so completion and the exit code are detected without relying on
+    the shell prompt. Markers are printed through printf format strings, so
+    an echoed command line never matches them.
+    """
+
+    READ_SIZE = 65536
+    # Bytes re-scanned after each read, so a marker split across reads is found
+    MARKER_OVERLAP = 128
+
+    def __init__(self, container_id: str, api: Optional[APIClient] = None) -> None:
         """Initializes a Docker session.
 
         Args:
             container_id: ID of the Docker container.
+            api: Docker API client (created from the environment if None).
         """
-        self.api = APIClient()
+        self.api = api or APIClient()
         self.container_id = container_id
         self.exec_id = None
         self.socket = None
+        self.last_exit_code: Optional[int] = None
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
 
     async def create(self, working_dir: str, env_vars: Dict[str, str]) -> None:
         """Creates an interactive session with the container.
@@ -42,9 +60,10 @@ class DockerSession:
             "bash",
             "-c",
             f"cd {working_dir} && "
+            "stty -echo 2>/dev/null; "
             "PROMPT_COMMAND='' "
-            "PS1='$ ' "
-            "exec bash --norc --noprofile",
+            "PS1='' "
+            "exec bash --norc --noprofile --noediting",
         ]
 
         exec_data = self.api.exec_create(
@@ -56,7 +75,7 @@ class DockerSession:
             stderr=True,
             privileged=True,
             user="root",
-            environment={**env_vars, "TERM": "dumb", "PS1": "$ ", "PROMPT_COMMAND": ""},
+            environment={**env_vars, "TERM": "dumb", "PS1": "", "PROMPT_COMMAND": ""},
         )
         self.exec_id = exec_data["Id"]
 
@@ -70,7 +89,8 @@ class DockerSession:
         else:
             raise RuntimeError("Failed to get socket connection")
 
-        await self._read_until_prompt()
+        # Wait until the shell is ready and discard its startup output
+        await asyncio.wait_for(self._run("true"), 30)
 
     async def close(self) -> None:
         """Cleans up session resources.
@@ -114,37 +134,64 @@ class DockerSession:
             # Log error but don't raise, ensure cleanup continues
             print(f"Warning: Error during session cleanup: {e}")
 
-    async def _read_until_prompt(self) -> str:
-        """Reads output until prompt is found.
+    async def _read_until(self, pattern: re.Pattern) -> re.Match:
+        """Reads from the socket until the buffer matches pattern.
 
-        Returns:
-            String containing output up to the prompt.
+        Each read only re-scans the tail of the buffer, so the cost is linear
+        in the output size.
 
         Raises:
-            socket.error: If socket communication fails.
+            ConnectionError: If the session is closed by the container.
         """
-        buffer = b""
-        while b"$ " not in buffer:
-            try:
-                chunk = self.socket.recv(4096)
-                if chunk:
-                    buffer += chunk
-            except socket.error as e:
-                if e.errno == socket.EWOULDBLOCK:
-                    await asyncio.sleep(0.1)
-                    continue
-                raise
-        return buffer.decode("utf-8")
+        loop = asyncio.get_running_loop()
+        scan_from = 0
+        while True:
+            match = pattern.search(self._buffer, scan_from)
+            if match:
+                return match
+            scan_from = max(0, len(self._buffer) - self.MARKER_OVERLAP)
+            chunk = await loop.sock_recv(self.socket, self.READ_SIZE)
+            if not chunk:
+                raise ConnectionError("Session closed by the container")
+            self._buffer += chunk
+
+    async def _run(self, command: str) -> Tuple[int, str]:
+        """Runs a framed command and waits for its completion.
+
+        Returns:
+            Tuple of (exit_code, output).
+        """
+        token = uuid.uuid4().hex
+        framed = (
+            f"printf '__BEGIN_%s__\\n' {token}\n"
+            f"{command}\n"
+            f"printf '\\n__DONE_%s_%s__\\n' {token} \"$?\"\n"
+        )
+        await asyncio.get_running_loop().sock_sendall(self.socket, framed.encode())
+
+        # Anything before the begin marker is stale output (e.g. the rest of
+        # a command that timed out)
+        begin = await self._read_until(re.compile(rb"__BEGIN_%s__\r?\n" % token.encode()))
+        del self._buffer[: begin.end()]
+        done = await self._read_until(
+            re.compile(rb"\r?\n__DONE_%s_(\d+)__\r?\n" % token.encode())
+        )
+        output = bytes(self._buffer[: done.start()])
+        exit_code = int(done.group(1))
+        del self._buffer[: done.end()]
+        return exit_code, output.decode("utf-8", errors="replace").replace("\r\n", "\n")
 
     async def execute(self, command: str, timeout: Optional[int] = None) -> str:
         """Executes a command and returns cleaned output.
 
+        The exit code of the command is kept in `last_exit_code`.
+
         Args:
             command: Shell command to execute.
             timeout: Maximum execution time in seconds.
 
         Returns:
-            Command output as string with prompt markers removed.
+            Command output as string.
 
         Raises:
             RuntimeError: If session not initialized or execution fails.
@@ -153,67 +200,31 @@ class DockerSession:
         if not self.socket:
             raise RuntimeError("Session not initialized")
 
-        try:
-            # Sanitize command to prevent shell injection
-            sanitized_command = self._sanitize_command(command)
-            full_command = f"{sanitized_command}\necho $?\n"
-            self.socket.sendall(full_command.encode())
-
-            async def read_output() -> str:
-                buffer = b""
-                result_lines = []
-                command_sent = False
-
-                while True:
-                    try:
-                        chunk = self.socket.recv(4096)
-                        if not chunk:
-                            break
-
-                        buffer += chunk
-                        lines = buffer.split(b"\n")
-
-                        buffer = lines[-1]
-                        lines = lines[:-1]
-
-                        for line in lines:
-                            line = line.rstrip(b"\r")
-
-                            if not command_sent:
-                                command_sent = True
-                                continue
-
-                            if line.strip() == b"echo $?" or line.strip().isdigit():
-                                continue
-
-                            if line.strip():
-                                result_lines.append(line)
-
-                        if buffer.endswith(b"$ "):
-                            break
-
-                    except socket.error as e:
-                        if e.errno == socket.EWOULDBLOCK:
-                            await asyncio.sleep(0.1)
-                            continue
-                        raise
-
-                output = b"\n".join(result_lines).decode("utf-8")
-                output = re.sub(r"\n\$ echo \$\$?.*$", "", output)
-
-                return output
-
-            if timeout:
-                result = await asyncio.wait_for(read_output(), timeout)
-            else:
-                result = await read_output()
-
-            return result.strip()
-
-        except asyncio.TimeoutError:
-            raise TimeoutError(f"Command execution timed out after {timeout} seconds")
-        except Exception as e:
-            raise RuntimeError(f"Failed to execute command: {e}")
+        async with self._lock:
+            try:
+                # Sanitize command to prevent shell injection
+                sanitized_command = self._sanitize_command(command)
+                if timeout:
+                    exit_code, output = await asyncio.wait_for(
+                        self._run(sanitized_command), timeout
+                    )
+                else:
+                    exit_code, output = await self._run(sanitized_command)
+                self.last_exit_code = exit_code
+                return output.strip()
+
+            except asyncio.TimeoutError:
+                # Interrupt the command; its remaining output is skipped by the
+                # next command's begin marker
+                try:
+                    self.socket.send(b"\x03\n")
+                except OSError:
+                    pass
+                raise TimeoutError(
+                    f"Command execution timed out after {timeout} seconds"
+                )
+            except Exception as e:
+                raise RuntimeError(f"Failed to execute command: {e}")
 
     def _sanitize_command(self, command: str) -> str:
         """Sanitizes the command string to prevent shell injection.
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Any, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Role(str, Enum):
@@ -29,6 +29,15 @@ TOOL_CHOICE_VALUES = tuple(choice.value for choice in ToolChoice)
 TOOL_CHOICE_TYPE = Literal[TOOL_CHOICE_VALUES]  # type: ignore
 
 
+class SummaryPolicy(str, Enum):
+    """Tool result summarization policies"""
+
+    PER_TOOL = "per_tool"  # one summary per tool call
+    BATCHED = "batched"  # one summary per step covering all tool results
+    THRESHOLD = "threshold"  # summarize only outputs longer than a threshold
+    NONE = "none"  # no summaries
+
+
 class AgentState(str, Enum):
     """Agent execution states"""
 
@@ -160,6 +169,10 @@ class Memory(BaseModel):
     messages: List[Message] = Field(default_factory=list)
     max_messages: int = Field(default=100)
 
+    # Running token total; see count_tokens
+    _token_total: int = PrivateAttr(default=0)
+    _token_messages: List[Message] = PrivateAttr(default_factory=list)
+
     def add_message(self, message: Message) -> None:
         """Add a message to memory"""
         self.messages.append(message)
@@ -177,11 +190,39 @@ class Memory(BaseModel):
     def clear(self) -> None:
         """Clear all messages"""
         self.messages.clear()
+        self._reset_token_count()
 
     def get_recent_messages(self, n: int) -> List[Message]:
         """Get n most recent messages"""
         return self.messages[-n:]
 
+    def _reset_token_count(self) -> None:
+        self._token_total = 0
+        self._token_messages = []
+
+    def count_tokens(self, token_counter: Any) -> int:
+        """Token count of the stored messages, updated incrementally.
+
+        Only messages appended since the last call are counted. The counted
+        messages are compared by identity with the current ones, so any other
+        change (clear and refill, trimming, replacing or removing messages,
+        even in place) rebuilds the total. token_counter is a TokenCounter,
+        whose per-message cache makes a rebuild cheap.
+        """
+        counted = self._token_messages
+        if len(counted) > len(self.messages) or any(
+            a is not b for a, b in zip(counted, self.messages)
+        ):
+            self._reset_token_count()
+            counted = self._token_messages
+        if not counted:
+            self._token_total = token_counter.FORMAT_TOKENS
+
+        for message in self.messages[len(counted) :]:
+            self._token_total += token_counter.count_message(message.to_dict())
+            counted.append(message)
+        return self._token_total
+
     def to_dict_list(self) -> List[dict]:
         """Convert messages to list of dicts"""
         return [msg.to_dict() for msg in self.messages]
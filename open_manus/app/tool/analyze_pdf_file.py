@@ -1,11 +1,189 @@
-import fitz  # PyMuPDF
+import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterable, AsyncIterator, Callable, List, Tuple
 
 from pydantic import Field
 from langdetect import detect
 from open_manus.app.llm import LLM
+from open_manus.app.logger import logger
 from open_manus.app.tool.base import BaseTool, ToolResult
+from open_manus.app.tool.pdf_extract import PDFTextExtractor, get_pdf_extractor
+
+
+# 文本少于该字符数时认为不是有效文档
+MIN_TEXT_LENGTH = 200
+# 语言检测使用的文本长度
+LANGUAGE_SAMPLE_CHARS = 5000
+
+
+REPORT_SECTIONS = {
+    "zh": (
+        "报告应包括（根据内容选择合适部分）：\n"
+        "- 文档标题或主题（如能识别）\n"
+        "- 内容摘要\n"
+        "- 主要章节或结构（如适用）\n"
+        "- 关键信息、数据或观点\n"
+        "- 结论或重点提示\n\n"
+        "请确保输出为 Markdown 格式，结构清晰、条理明确，便于阅读和进一步处理。\n\n"
+    ),
+    "en": (
+        "The report should include (as applicable):\n"
+        "- Document title or topic (if identifiable)\n"
+        "- Content summary\n"
+        "- Main sections or structure (if present)\n"
+        "- Key information, data points, or arguments\n"
+        "- Conclusion or key takeaways\n\n"
+        "Ensure the output is clean, structured, and formatted in Markdown for easy readability and further use.\n\n"
+    ),
+}
+
+# 文档只有一个分块时直接生成报告
+DIRECT_PROMPTS = {
+    "zh": (
+        "你是一名专业的文档分析助理。请阅读以下从 PDF 文件中提取的内容，提炼出关键要点，并整理成结构化的 Markdown 报告。\n\n"
+        + REPORT_SECTIONS["zh"]
+        + "以下是提取自 PDF 的内容：\n{text}"
+    ),
+    "en": (
+        "You are a professional document analysis assistant. Please review the following extracted content from a PDF file, "
+        "and generate a structured summary in Markdown format.\n\n"
+        + REPORT_SECTIONS["en"]
+        + "Here is the content extracted from the PDF:\n{text}"
+    ),
+}
+
+# map 阶段：逐块提取要点
+CHUNK_PROMPTS = {
+    "zh": (
+        "你是一名专业的文档分析助理。以下是一份 PDF 文件第 {first_page}-{last_page} 页的内容。"
+        "请提炼这部分的关键信息、数据和观点，输出简洁的 Markdown 要点，保留重要数字及其所在页码。\n\n"
+        "以下是提取自 PDF 的内容：\n{text}"
+    ),
+    "en": (
+        "You are a professional document analysis assistant. Below is the content of pages "
+        "{first_page}-{last_page} of a PDF file. Extract the key information, data points and "
+        "arguments of this part as concise Markdown bullet points, keeping important figures "
+        "and the pages they appear on.\n\n"
+        "Here is the content extracted from the PDF:\n{text}"
+    ),
+}
+
+# reduce 阶段：合并多个分块的要点
+MERGE_PROMPTS = {
+    "zh": (
+        "你是一名专业的文档分析助理。以下是同一份 PDF 文件按页码顺序排列的分段要点。"
+        "请将它们合并为一份去重后的 Markdown 要点，保留重要数字及页码。\n\n{text}"
+    ),
+    "en": (
+        "You are a professional document analysis assistant. Below are section notes of the "
+        "same PDF file in page order. Merge them into one de-duplicated set of Markdown notes, "
+        "keeping important figures and page references.\n\n{text}"
+    ),
+}
+
+FINAL_PROMPTS = {
+    "zh": (
+        "你是一名专业的文档分析助理。请阅读以下按页码顺序整理的 PDF 文件分段要点，"
+        "并整理成结构化的 Markdown 报告。\n\n"
+        + REPORT_SECTIONS["zh"]
+        + "以下是 PDF 的分段要点：\n{text}"
+    ),
+    "en": (
+        "You are a professional document analysis assistant. Please review the following section "
+        "notes of a PDF file, in page order, and generate a structured summary in Markdown format.\n\n"
+        + REPORT_SECTIONS["en"]
+        + "Here are the section notes of the PDF:\n{text}"
+    ),
+}
+
+
+class TextChunk:
+    """A run of consecutive PDF pages small enough for one LLM call"""
+
+    def __init__(self, first_page: int, last_page: int, text: str):
+        self.first_page = first_page
+        self.last_page = last_page
+        self.text = text
+
+
+def split_text(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Split text that exceeds max_tokens into pieces on line boundaries"""
+    pieces, current, current_tokens = [], [], 0
+    for line in text.splitlines(keepends=True):
+        line_tokens = count_tokens(line)
+        if line_tokens > max_tokens:
+            # 超长的单行按字符硬切分
+            step = max(1, len(line) * max_tokens // line_tokens)
+            sublines = [line[i : i + step] for i in range(0, len(line), step)]
+        else:
+            sublines = [line]
+        for subline in sublines:
+            subline_tokens = count_tokens(subline)
+            if current and current_tokens + subline_tokens > max_tokens:
+                pieces.append("".join(current))
+                current, current_tokens = [], 0
+            current.append(subline)
+            current_tokens += subline_tokens
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+class PageChunker:
+    """
+    Groups consecutive pages into chunks of at most max_tokens tokens.
+
+    Pages are fed one at a time, so only the chunk being built is held in
+    memory. A page larger than max_tokens is split into several chunks of its own.
+    """
+
+    def __init__(self, max_tokens: int, count_tokens: Callable[[str], int]):
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens
+        self._parts: List[str] = []
+        self._tokens = 0
+        self._first_page = self._last_page = 0
+
+    def add(self, page_number: int, text: str) -> List[TextChunk]:
+        """Add a page, returning the chunks it completed"""
+        if not text.strip():
+            return []
+        done = []
+        page_tokens = self.count_tokens(text)
+        if self._parts and self._tokens + page_tokens > self.max_tokens:
+            done.extend(self.flush())
+        if page_tokens > self.max_tokens:
+            for piece in split_text(text, self.max_tokens, self.count_tokens):
+                done.append(TextChunk(page_number, page_number, piece))
+            return done
+        if not self._parts:
+            self._first_page = page_number
+        self._parts.append(text)
+        self._tokens += page_tokens
+        self._last_page = page_number
+        return done
+
+    def flush(self) -> List[TextChunk]:
+        """Return the chunk being built, if any"""
+        if not self._parts:
+            return []
+        chunk = TextChunk(self._first_page, self._last_page, "".join(self._parts))
+        self._parts, self._tokens = [], 0
+        return [chunk]
+
+
+async def achunk_pages(
+    pages: AsyncIterable[Tuple[int, str]],
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+) -> AsyncIterator[TextChunk]:
+    """Lazily group (page_number, text) pairs into token-bounded chunks"""
+    chunker = PageChunker(max_tokens, count_tokens)
+    async for page_number, text in pages:
+        for chunk in chunker.add(page_number, text):
+            yield chunk
+    for chunk in chunker.flush():
+        yield chunk
 
 
 class Analyze_PDF_File(BaseTool):
@@ -24,15 +202,17 @@ class Analyze_PDF_File(BaseTool):
         },
         "required": ["filepath"]
     }
+    parallel_safe: bool = True
+    max_concurrency: int = 2
 
     llm: LLM = Field(default_factory=LLM)
 
-    def extract_text_from_pdf(self, filepath: Path) -> str:
-        doc = fitz.open(filepath)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
+    # 分块 map-reduce 参数
+    chunk_tokens: int = Field(default=6000, description="Maximum tokens of PDF text per LLM call")
+    reduce_tokens: int = Field(default=12000, description="Maximum tokens of notes merged per LLM call")
+    max_parallel_chunks: int = Field(default=4, description="Maximum concurrent chunk LLM calls")
+    # 在进程池中解析 PDF，并按文件哈希和页码缓存结果
+    extractor: PDFTextExtractor = Field(default_factory=get_pdf_extractor)
 
     def detect_language(self, text: str) -> str:
         try:
@@ -47,6 +227,67 @@ class Analyze_PDF_File(BaseTool):
         workspace_dir.mkdir(parents=True, exist_ok=True)
         return workspace_dir / filename
 
+    async def _ask(self, prompt: str) -> str:
+        return await self.llm.ask([{"role": "user", "content": prompt}], stream=False)
+
+    async def summarize_chunks(self, chunks: AsyncIterable[TextChunk], lang: str) -> List[str]:
+        """
+        Map step: summarize chunks concurrently, at most max_parallel_chunks at a time.
+
+        A chunk is only pulled from the iterator once a slot is free, so memory
+        stays bounded by the number of in-flight chunks. Notes keep page order.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_chunks)
+        tasks: List[asyncio.Task] = []
+
+        async def summarize(chunk: TextChunk) -> str:
+            try:
+                notes = await self._ask(
+                    CHUNK_PROMPTS[lang].format(
+                        first_page=chunk.first_page, last_page=chunk.last_page, text=chunk.text
+                    )
+                )
+            finally:
+                semaphore.release()
+            return f"### Pages {chunk.first_page}-{chunk.last_page}\n{notes}"
+
+        try:
+            async for chunk in chunks:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(summarize(chunk)))
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def reduce_notes(self, notes: List[str], lang: str) -> str:
+        """Reduce step: merge notes level by level until they fit in one final call"""
+        count_tokens = self.llm.count_tokens
+        while len(notes) > 1 and count_tokens("\n\n".join(notes)) > self.reduce_tokens:
+            groups, group, group_tokens = [], [], 0
+            for note in notes:
+                note_tokens = count_tokens(note)
+                if group and group_tokens + note_tokens > self.reduce_tokens:
+                    groups.append(group)
+                    group, group_tokens = [], 0
+                group.append(note)
+                group_tokens += note_tokens
+            groups.append(group)
+            if len(groups) == len(notes):
+                # 每条要点都已超过上限，无法继续合并
+                break
+            semaphore = asyncio.Semaphore(self.max_parallel_chunks)
+
+            async def merge(group: List[str]) -> str:
+                async with semaphore:
+                    return await self._ask(
+                        MERGE_PROMPTS[lang].format(text="\n\n".join(group))
+                    )
+
+            notes = list(await asyncio.gather(*(merge(group) for group in groups)))
+        return await self._ask(FINAL_PROMPTS[lang].format(text="\n\n".join(notes)))
+
     async def execute(self, **kwargs) -> ToolResult:
         filepath_str = kwargs.get("filepath")
         if not filepath_str:
@@ -56,44 +297,50 @@ class Analyze_PDF_File(BaseTool):
         if not file_path.exists():
             return ToolResult(error=f"File does not exist: {file_path}")
 
+        records = self.extractor.iter_pages(file_path)
         try:
-            text = self.extract_text_from_pdf(file_path)
-            if len(text.strip()) < 200:
+            # 预读开头若干页，用于检查内容长度和检测语言
+            head: List[Tuple[int, str]] = []
+            sample = ""
+            async for page_number, text, _ in records:
+                head.append((page_number, text))
+                sample += text
+                if len(sample) >= LANGUAGE_SAMPLE_CHARS:
+                    break
+            if len(sample.strip()) < MIN_TEXT_LENGTH:
                 return ToolResult(output="📄 文件内容太少，可能不是有效的财报。")
 
-            lang = self.detect_language(text)
-
             # 根据语言选择 Prompt
-            if lang.startswith("zh"):
-                 prompt = (
-                    "你是一名专业的文档分析助理。请阅读以下从 PDF 文件中提取的内容，提炼出关键要点，并整理成结构化的 Markdown 报告。\n\n"
-                    "报告应包括（根据内容选择合适部分）：\n"
-                    "- 文档标题或主题（如能识别）\n"
-                    "- 内容摘要\n"
-                    "- 主要章节或结构（如适用）\n"
-                    "- 关键信息、数据或观点\n"
-                    "- 结论或重点提示\n\n"
-                    "请确保输出为 Markdown 格式，结构清晰、条理明确，便于阅读和进一步处理。\n\n"
-                    f"以下是提取自 PDF 的内容：\n{text[:8000]}..."
+            lang = "zh" if self.detect_language(sample).startswith("zh") else "en"
+
+            async def all_pages() -> AsyncIterator[Tuple[int, str]]:
+                for page in head:
+                    yield page
+                async for page_number, text, _ in records:
+                    yield page_number, text
+
+            chunks = achunk_pages(all_pages(), self.chunk_tokens, self.llm.count_tokens)
+            first_chunks = []
+            async for chunk in chunks:
+                first_chunks.append(chunk)
+                if len(first_chunks) == 2:
+                    break
+            if len(first_chunks) == 1:
+                # 整个文档放得进一次调用，无需 map-reduce
+                markdown_output = await self._ask(
+                    DIRECT_PROMPTS[lang].format(text=first_chunks[0].text)
                 )
             else:
-                prompt = (
-                    "You are a professional document analysis assistant. Please review the following extracted content from a PDF file, "
-                    "and generate a structured summary in Markdown format.\n\n"
-                    "The report should include (as applicable):\n"
-                    "- Document title or topic (if identifiable)\n"
-                    "- Content summary\n"
-                    "- Main sections or structure (if present)\n"
-                    "- Key information, data points, or arguments\n"
-                    "- Conclusion or key takeaways\n\n"
-                    "Ensure the output is clean, structured, and formatted in Markdown for easy readability and further use.\n\n"
-                    f"Here is the content extracted from the PDF:\n{text[:8000]}..."
-                )
-
 
-            # markdown_output = await self.llm.ask(prompt) 这里注意要符合写法规范
-            markdown_output = await self.llm.ask([{"role": "user", "content": prompt}])
+                async def all_chunks() -> AsyncIterator[TextChunk]:
+                    for chunk in first_chunks:
+                        yield chunk
+                    async for chunk in chunks:
+                        yield chunk
 
+                notes = await self.summarize_chunks(all_chunks(), lang)
+                logger.info(f"Summarized {file_path.name} in {len(notes)} chunks")
+                markdown_output = await self.reduce_notes(notes, lang)
 
             output_filename = file_path.stem + ".analysis.md"
             output_path = self.get_workspace_path(output_filename)
@@ -105,3 +352,5 @@ class Analyze_PDF_File(BaseTool):
 
         except Exception as e:
             return ToolResult(error=f"Error analyzing report with LLM: {str(e)}")
+        finally:
+            await records.aclose()
@@ -9,6 +9,12 @@ class BaseTool(ABC, BaseModel):
     description: str
     parameters: Optional[dict] = None
 
+    # Concurrency hints for agents that run independent tool calls concurrently.
+    # A tool is parallel-safe when concurrent calls share no mutable state
+    # (browser session, shell, files being edited, agent control flow).
+    parallel_safe: bool = False
+    max_concurrency: int = 1
+
     class Config:
         arbitrary_types_allowed = True
 
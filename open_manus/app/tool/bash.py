@@ -1,8 +1,16 @@
 import asyncio
+import codecs
+import inspect
 import os
-from typing import Optional
+import re
+import signal
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from pydantic import Field
 
 from open_manus.app.exceptions import ToolError
+from open_manus.app.logger import logger
 from open_manus.app.tool.base import BaseTool, CLIResult
 
 
@@ -12,21 +20,140 @@ _BASH_DESCRIPTION = """Execute a bash command in the terminal.
 * Timeout: If a command execution result says "Command timed out. Sending SIGINT to the process", the assistant should retry running the command in the background.
 """
 
+_READ_SIZE = 64 * 1024
+# Bytes held back after each read in case a sentinel is split across reads
+_SENTINEL_LOOKBEHIND = 64
+
+
+# Called with (stream_name, text) as output arrives; may be a coroutine function
+OutputCallback = Callable[[str, str], Union[None, Awaitable[None]]]
+
+
+class _OutputBuffer:
+    """Keeps the head and tail of a command's output, dropping the middle."""
+
+    def __init__(self, limit: int):
+        self.head_limit = limit // 2
+        self.tail_limit = limit - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.dropped = 0
+
+    def append(self, data: bytes) -> None:
+        if len(self.head) < self.head_limit:
+            room = self.head_limit - len(self.head)
+            self.head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self.tail += data
+        excess = len(self.tail) - self.tail_limit
+        if excess > 0:
+            # bytearray deletes from the front in amortized O(1)
+            del self.tail[:excess]
+            self.dropped += excess
+
+    def text(self) -> str:
+        head = self.head.decode(errors="replace")
+        tail = self.tail.decode(errors="replace")
+        if self.dropped:
+            return f"{head}\n\n[... {self.dropped} bytes truncated ...]\n\n{tail}"
+        return head + tail
+
+
+class _StreamReader:
+    """Consumes one pipe of the shell and splits it into per-command outputs.
+
+    Data is scanned for the command's sentinel as it arrives. Only the last
+    few bytes of each chunk are held back, in case a sentinel is split
+    across chunks, so the cost is linear in the output size.
+    """
+
+    def __init__(self, name: str, stream: asyncio.StreamReader, limit: int):
+        self.name = name
+        self.stream = stream
+        self.limit = limit
+        self.buffer = _OutputBuffer(limit)
+        self.on_output: Optional[OutputCallback] = None
+        self.match: Optional[re.Match] = None
+        self.done = asyncio.Event()
+        self._pattern: Optional[re.Pattern] = None
+        self._carry = b""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def expect(self, pattern: re.Pattern, on_output: Optional[OutputCallback]) -> None:
+        """Starts collecting the output of a new command ending with pattern."""
+        self.buffer = _OutputBuffer(self.limit)
+        self.on_output = on_output
+        self.match = None
+        self.done.clear()
+        self._pattern = pattern
+
+    async def run(self) -> None:
+        """Reads the pipe until EOF."""
+        while chunk := await self.stream.read(_READ_SIZE):
+            await self._feed(chunk)
+        if self._carry:
+            await self._emit(self._carry)
+            self._carry = b""
+        self.done.set()
+
+    async def _feed(self, chunk: bytes) -> None:
+        data = self._carry + chunk
+        if self._pattern is None or self.done.is_set():
+            # Output between commands (e.g. background jobs) goes to the next one
+            self._carry = data[-self.limit :]
+            return
+        match = self._pattern.search(data)
+        if match:
+            self._carry = data[match.end() :]
+            await self._emit(data[: match.start()])
+            self.match = match
+            self.done.set()
+            return
+        keep = _SENTINEL_LOOKBEHIND
+        self._carry = data[-keep:]
+        await self._emit(data[:-keep])
+
+    async def _emit(self, data: bytes) -> None:
+        if not data:
+            return
+        self.buffer.append(data)
+        if self.on_output is not None:
+            text = self._decoder.decode(data)
+            if text:
+                try:
+                    result = self.on_output(self.name, text)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    # A failing callback must not stop the reader
+                    logger.warning(f"Bash output callback failed: {e}")
+
 
 class _BashSession:
-    """A session of a bash shell."""
+    """A session of a bash shell.
+
+    Reader tasks consume stdout and stderr as the shell writes them. Every
+    command is followed by a per-command sentinel on both streams (the stdout
+    one carries the exit status), so a command is complete once both
+    sentinels arrived.
+    """
 
     _started: bool
     _process: asyncio.subprocess.Process
 
     command: str = "/bin/bash"
-    _output_delay: float = 0.2  # seconds
     _timeout: float = 120.0  # seconds
     _sentinel: str = "<<exit>>"
+    _max_output: int = 256 * 1024  # bytes kept per stream; the middle is dropped
 
     def __init__(self):
         self._started = False
         self._timed_out = False
+        self.last_exit_code: Optional[int] = None
+        self._readers: Dict[str, _StreamReader] = {}
+        self._reader_tasks: List[asyncio.Task] = []
 
     async def start(self):
         if self._started:
@@ -41,6 +168,13 @@ class _BashSession:
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
+        for name, stream in (
+            ("stdout", self._process.stdout),
+            ("stderr", self._process.stderr),
+        ):
+            reader = _StreamReader(name, stream, self._max_output)
+            self._readers[name] = reader
+            self._reader_tasks.append(asyncio.create_task(reader.run()))
 
         self._started = True
 
@@ -48,12 +182,23 @@ class _BashSession:
         """Terminate the bash shell."""
         if not self._started:
             raise ToolError("Session has not started.")
+        for task in self._reader_tasks:
+            task.cancel()
         if self._process.returncode is not None:
             return
-        self._process.terminate()
+        # bash runs in its own session; stop the commands it started as well
+        try:
+            os.killpg(self._process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
 
-    async def run(self, command: str):
-        """Execute a command in the bash shell."""
+    async def run(self, command: str, on_output: Optional[OutputCallback] = None):
+        """Execute a command in the bash shell.
+
+        Args:
+            command: Command to run
+            on_output: Called with (stream_name, text) as output arrives
+        """
         if not self._started:
             raise ToolError("Session has not started.")
         if self._process.returncode is not None:
@@ -68,48 +213,54 @@ class _BashSession:
 
         # we know these are not None because we created the process with PIPEs
         assert self._process.stdin
-        assert self._process.stdout
-        assert self._process.stderr
 
-        # send command to the process
+        token = uuid.uuid4().hex[:12]
+        sentinel = self._sentinel.replace(">>", f":{token}")
+        stdout, stderr = self._readers["stdout"], self._readers["stderr"]
+        stdout.expect(
+            re.compile(re.escape(sentinel.encode()) + rb":(\d+)>>\n"), on_output
+        )
+        stderr.expect(re.compile(re.escape(sentinel.encode()) + rb">>\n"), on_output)
+
+        # send command to the process; the sentinels are printed through a
+        # format string so that an echo of this line can never match them
         self._process.stdin.write(
-            command.encode() + f"; echo '{self._sentinel}'\n".encode()
+            command.encode()
+            + (
+                f"\n__status=$?; "
+                f"printf '%s:%s>>\\n' '{sentinel}' \"$__status\"; "
+                f"printf '%s>>\\n' '{sentinel}' >&2\n"
+            ).encode()
         )
         await self._process.stdin.drain()
 
-        # read output from the process, until the sentinel is found
+        # wait for both sentinels
         try:
             async with asyncio.timeout(self._timeout):
-                while True:
-                    await asyncio.sleep(self._output_delay)
-                    # if we read directly from stdout/stderr, it will wait forever for
-                    # EOF. use the StreamReader buffer directly instead.
-                    output = (
-                        self._process.stdout._buffer.decode()
-                    )  # pyright: ignore[reportAttributeAccessIssue]
-                    if self._sentinel in output:
-                        # strip the sentinel and break
-                        output = output[: output.index(self._sentinel)]
-                        break
+                await asyncio.gather(stdout.done.wait(), stderr.done.wait())
         except asyncio.TimeoutError:
             self._timed_out = True
             raise ToolError(
                 f"timed out: bash has not returned in {self._timeout} seconds and must be restarted",
             ) from None
 
+        if stdout.match is None:
+            await self._process.wait()
+            return CLIResult(
+                output=stdout.buffer.text(),
+                system="tool must be restarted",
+                error=f"bash has exited with returncode {self._process.returncode}",
+            )
+        self.last_exit_code = int(stdout.match.group(1))
+
+        output = stdout.buffer.text()
         if output.endswith("\n"):
             output = output[:-1]
 
-        error = (
-            self._process.stderr._buffer.decode()
-        )  # pyright: ignore[reportAttributeAccessIssue]
+        error = stderr.buffer.text()
         if error.endswith("\n"):
             error = error[:-1]
 
-        # clear the buffers so that the next output can be read correctly
-        self._process.stdout._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-        self._process.stderr._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-
         return CLIResult(output=output, error=error)
 
 
@@ -129,6 +280,12 @@ class Bash(BaseTool):
         "required": ["command"],
     }
 
+    output_callback: Optional[OutputCallback] = Field(
+        default=None,
+        exclude=True,
+        description="Called with (stream_name, text) while a command runs",
+    )
+
     _session: Optional[_BashSession] = None
 
     async def execute(
@@ -147,7 +304,7 @@ class Bash(BaseTool):
             await self._session.start()
 
         if command is not None:
-            return await self._session.run(command)
+            return await self._session.run(command, on_output=self.output_callback)
 
         raise ToolError("no command provided.")
 
@@ -0,0 +1,271 @@
+import asyncio
+import weakref
+from typing import Dict, List, Optional, Set
+
+from browser_use import Browser as BrowserUseBrowser
+from browser_use import BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+from open_manus.app.config import config
+from open_manus.app.logger import logger
+
+
+class BrowserManager:
+    """Shared browser manager.
+
+    Keeps a small number of long-lived browser processes and hands out an
+    isolated BrowserContext per agent run, so launching Chromium is paid once
+    instead of on every tool turn.
+
+    Attributes:
+        max_browsers: Maximum number of browser processes.
+        max_contexts: Maximum number of open contexts across all browsers.
+        idle_timeout: Seconds a browser without contexts is kept alive.
+        reap_interval: Seconds between idle browser checks.
+    """
+
+    def __init__(
+        self,
+        max_browsers: int = 1,
+        max_contexts: int = 8,
+        idle_timeout: int = 300,
+        reap_interval: int = 60,
+    ):
+        """Initializes browser manager.
+
+        Args:
+            max_browsers: Maximum number of browser processes.
+            max_contexts: Maximum number of concurrently open contexts.
+            idle_timeout: Idle timeout for browsers without contexts, in seconds.
+            reap_interval: Idle check interval in seconds.
+        """
+        self.max_browsers = max(1, max_browsers)
+        self.max_contexts = max(1, max_contexts)
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+
+        self._browsers: List[BrowserUseBrowser] = []
+        self._contexts: Dict[int, BrowserUseBrowser] = {}
+        self._last_used: Dict[int, float] = {}
+
+        self._lock = asyncio.Lock()
+        self._context_slots = asyncio.Semaphore(self.max_contexts)
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_releases: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def build_browser_config() -> BrowserConfig:
+        """Builds the browser configuration from the application config."""
+        browser_config_kwargs = {"headless": False, "disable_security": True}
+
+        if config.browser_config:
+            from browser_use.browser.browser import ProxySettings
+
+            # handle proxy settings.
+            if config.browser_config.proxy and config.browser_config.proxy.server:
+                browser_config_kwargs["proxy"] = ProxySettings(
+                    server=config.browser_config.proxy.server,
+                    username=config.browser_config.proxy.username,
+                    password=config.browser_config.proxy.password,
+                )
+
+            browser_attrs = [
+                "headless",
+                "disable_security",
+                "extra_chromium_args",
+                "chrome_instance_path",
+                "wss_url",
+                "cdp_url",
+            ]
+
+            for attr in browser_attrs:
+                value = getattr(config.browser_config, attr, None)
+                if value is not None:
+                    if not isinstance(value, list) or value:
+                        browser_config_kwargs[attr] = value
+
+        return BrowserConfig(**browser_config_kwargs)
+
+    def _context_count(self, browser: BrowserUseBrowser) -> int:
+        return sum(1 for owner in self._contexts.values() if owner is browser)
+
+    def _select_browser(self) -> BrowserUseBrowser:
+        """Returns the least loaded browser, launching a new one if all are busy."""
+        if self._browsers:
+            browser = min(self._browsers, key=self._context_count)
+            if (
+                self._context_count(browser) == 0
+                or len(self._browsers) >= self.max_browsers
+            ):
+                return browser
+
+        browser = BrowserUseBrowser(self.build_browser_config())
+        self._browsers.append(browser)
+        self._last_used[id(browser)] = asyncio.get_running_loop().time()
+        logger.info(f"Launched shared browser ({len(self._browsers)}/{self.max_browsers})")
+        return browser
+
+    async def new_context(
+        self, context_config: Optional[BrowserContextConfig] = None
+    ) -> BrowserContext:
+        """Opens an isolated context on a shared browser.
+
+        Waits for a free slot when max_contexts contexts are already open.
+
+        Args:
+            context_config: Context configuration.
+
+        Returns:
+            BrowserContext: New browser context.
+        """
+        self._loop = asyncio.get_running_loop()
+        await self._context_slots.acquire()
+        try:
+            async with self._lock:
+                browser = self._select_browser()
+            context = await browser.new_context(context_config or BrowserContextConfig())
+        except Exception:
+            self._context_slots.release()
+            raise
+
+        async with self._lock:
+            self._contexts[id(context)] = browser
+        self._start_reaper()
+        return context
+
+    async def release_context(self, context: BrowserContext) -> None:
+        """Closes a context obtained from new_context and frees its slot.
+
+        Args:
+            context: Context to release.
+        """
+        async with self._lock:
+            browser = self._contexts.pop(id(context), None)
+            if browser is not None:
+                self._last_used[id(browser)] = asyncio.get_running_loop().time()
+
+        try:
+            await context.close()
+        except Exception as e:
+            logger.error(f"Error closing browser context: {e}")
+        finally:
+            if browser is not None:
+                self._context_slots.release()
+
+    def release_context_threadsafe(self, context: BrowserContext) -> None:
+        """Schedules release_context on the loop that owns this manager.
+
+        Safe to call from finalizers and other threads. The context is left
+        open, with a warning, when that loop is already closed.
+
+        Args:
+            context: Context to release.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.warning("Browser context was not released: its event loop is closed")
+            return
+
+        def schedule() -> None:
+            task = loop.create_task(self.release_context(context))
+            self._pending_releases.add(task)
+            task.add_done_callback(self._pending_releases.discard)
+
+        try:
+            loop.call_soon_threadsafe(schedule)
+        except RuntimeError:
+            logger.warning("Browser context was not released: its event loop is closed")
+
+    def _start_reaper(self) -> None:
+        """Starts the idle browser reaper if it is not running."""
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+
+    async def _reap_loop(self) -> None:
+        while self._browsers:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self._reap_idle_browsers()
+            except Exception as e:
+                logger.error(f"Error in browser reaper: {e}")
+
+    async def _reap_idle_browsers(self) -> None:
+        """Closes browsers that have had no contexts for longer than idle_timeout."""
+        now = asyncio.get_running_loop().time()
+        async with self._lock:
+            idle = [
+                browser
+                for browser in self._browsers
+                if self._context_count(browser) == 0
+                and now - self._last_used.get(id(browser), now) > self.idle_timeout
+            ]
+            for browser in idle:
+                self._browsers.remove(browser)
+                self._last_used.pop(id(browser), None)
+
+        for browser in idle:
+            logger.info("Closing idle shared browser")
+            await self._close_browser(browser)
+
+    @staticmethod
+    async def _close_browser(browser: BrowserUseBrowser) -> None:
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.error(f"Error closing browser: {e}")
+
+    async def cleanup(self) -> None:
+        """Closes all browsers and contexts."""
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+            self._contexts.clear()
+            self._last_used.clear()
+            self._context_slots = asyncio.Semaphore(self.max_contexts)
+
+        for browser in browsers:
+            await self._close_browser(browser)
+
+    def get_stats(self) -> Dict:
+        """Gets manager statistics.
+
+        Returns:
+            Dict: Statistics information.
+        """
+        return {
+            "browsers": len(self._browsers),
+            "open_contexts": len(self._contexts),
+            "max_browsers": self.max_browsers,
+            "max_contexts": self.max_contexts,
+            "idle_timeout": self.idle_timeout,
+        }
+
+
+# Playwright objects are bound to the event loop that created them, so there is
+# one manager per running loop.
+_managers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserManager]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_browser_manager() -> BrowserManager:
+    """Returns the shared browser manager for the running event loop."""
+    loop = asyncio.get_running_loop()
+    manager = _managers.get(loop)
+    if manager is None:
+        settings = config.browser_config
+        manager = BrowserManager(
+            max_browsers=getattr(settings, "max_shared_browsers", 1),
+            max_contexts=getattr(settings, "max_contexts", 8),
+            idle_timeout=getattr(settings, "browser_idle_timeout", 300),
+        )
+        _managers[loop] = manager
+    return manager
@@ -4,7 +4,6 @@ import json
 from typing import Generic, Optional, TypeVar
 
 from browser_use import Browser as BrowserUseBrowser
-from browser_use import BrowserConfig
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
 from browser_use.dom.service import DomService
 from pydantic import Field, field_validator
@@ -13,6 +12,7 @@ from pydantic_core.core_schema import ValidationInfo
 from open_manus.app.config import config
 from open_manus.app.llm import LLM
 from open_manus.app.tool.base import BaseTool, ToolResult
+from open_manus.app.tool.browser_manager import BrowserManager, get_browser_manager
 from open_manus.app.tool.web_search import WebSearch
 
 
@@ -124,6 +124,8 @@ class BrowserUseTool(BaseTool, Generic[Context]):
     lock: asyncio.Lock = Field(default_factory=asyncio.Lock)
     browser: Optional[BrowserUseBrowser] = Field(default=None, exclude=True)
     context: Optional[BrowserContext] = Field(default=None, exclude=True)
+    # Manager the context came from; it is bound to the loop that opened the context
+    manager: Optional[BrowserManager] = Field(default=None, exclude=True)
     dom_service: Optional[DomService] = Field(default=None, exclude=True)
     web_search_tool: WebSearch = Field(default_factory=WebSearch, exclude=True)
 
@@ -139,38 +141,7 @@ class BrowserUseTool(BaseTool, Generic[Context]):
         return v
 
     async def _ensure_browser_initialized(self) -> BrowserContext:
-        """Ensure browser and context are initialized."""
-        if self.browser is None:
-            browser_config_kwargs = {"headless": False, "disable_security": True}
-
-            if config.browser_config:
-                from browser_use.browser.browser import ProxySettings
-
-                # handle proxy settings.
-                if config.browser_config.proxy and config.browser_config.proxy.server:
-                    browser_config_kwargs["proxy"] = ProxySettings(
-                        server=config.browser_config.proxy.server,
-                        username=config.browser_config.proxy.username,
-                        password=config.browser_config.proxy.password,
-                    )
-
-                browser_attrs = [
-                    "headless",
-                    "disable_security",
-                    "extra_chromium_args",
-                    "chrome_instance_path",
-                    "wss_url",
-                    "cdp_url",
-                ]
-
-                for attr in browser_attrs:
-                    value = getattr(config.browser_config, attr, None)
-                    if value is not None:
-                        if not isinstance(value, list) or value:
-                            browser_config_kwargs[attr] = value
-
-            self.browser = BrowserUseBrowser(BrowserConfig(**browser_config_kwargs))
-
+        """Ensure a browser context is open on the shared browser."""
         if self.context is None:
             context_config = BrowserContextConfig()
 
@@ -182,7 +153,10 @@ class BrowserUseTool(BaseTool, Generic[Context]):
             ):
                 context_config = config.browser_config.new_context_config
 
-            self.context = await self.browser.new_context(context_config)
+            # The browser process is shared; each tool instance gets its own context
+            self.manager = get_browser_manager()
+            self.context = await self.manager.new_context(context_config)
+            self.browser = self.context.browser
             self.dom_service = DomService(await self.context.get_current_page())
 
         return self.context
@@ -539,25 +513,20 @@ Page content:
             return ToolResult(error=f"Failed to get browser state: {str(e)}")
 
     async def cleanup(self):
-        """Clean up browser resources."""
+        """Release the browser context; the shared browser stays alive."""
         async with self.lock:
             if self.context is not None:
-                await self.context.close()
+                await self.manager.release_context(self.context)
                 self.context = None
                 self.dom_service = None
-            if self.browser is not None:
-                await self.browser.close()
-                self.browser = None
+            self.browser = None
 
     def __del__(self):
-        """Ensure cleanup when object is destroyed."""
-        if self.browser is not None or self.context is not None:
-            try:
-                asyncio.run(self.cleanup())
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                loop.run_until_complete(self.cleanup())
-                loop.close()
+        """Release a context that was never cleaned up on the loop that owns it."""
+        context = getattr(self, "context", None)
+        manager = getattr(self, "manager", None)
+        if context is not None and manager is not None:
+            manager.release_context_threadsafe(context)
 
     @classmethod
     def create_with_context(cls, context: Context) -> "BrowserUseTool[Context]":
@@ -1,16 +1,17 @@
 import asyncio
+import heapq
 import json
 import re
-import time
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 
 from open_manus.app.exceptions import ToolError
 from open_manus.app.llm import LLM
 from open_manus.app.logger import logger
 from open_manus.app.schema import ToolChoice
 from open_manus.app.tool.base import BaseTool, ToolResult
+from open_manus.app.tool.search.cache import normalize_query
 from open_manus.app.tool.web_search import SearchResult, WebSearch
 
 
@@ -60,6 +61,12 @@ INSIGHT_MARKER_PATTERN = re.compile(r"^\s*(?:\d+\.|-|\*|•)\s*(.*)")
 # Pattern to detect relevance score, capturing the number (case-insensitive)
 RELEVANCE_SCORE_PATTERN = re.compile(r"relevance.*?:.*?(\d\.?\d*)", re.IGNORECASE)
 
+# Constants for frontier scheduling
+# Expected value lost per level of depth
+DEPTH_DISCOUNT = 0.8
+# Number of best insights of a branch used to estimate its follow-ups' value
+VALUE_TOP_INSIGHTS = 3
+
 
 class ResearchInsight(BaseModel):
     """A single insight discovered during research."""
@@ -98,6 +105,155 @@ class ResearchContext(BaseModel):
     max_depth: int = Field(
         default=2, description="Maximum depth of research to reach", ge=1
     )
+    tokens_used: int = Field(default=0, description="LLM tokens spent so far", ge=0)
+    requests_used: int = Field(
+        default=0, description="LLM and search requests made so far", ge=0
+    )
+    expansions: int = Field(default=0, description="Frontier queries explored", ge=0)
+    rounds: int = Field(default=0, description="Scheduling rounds completed", ge=0)
+    elapsed: float = Field(
+        default=0.0, description="Seconds spent exploring the frontier", ge=0.0
+    )
+
+
+class ResearchBudget(BaseModel):
+    """Resource limits of a research run (None means unlimited)."""
+
+    max_tokens: Optional[int] = Field(
+        default=None, description="Maximum LLM tokens (prompt + completion)", ge=1
+    )
+    max_requests: Optional[int] = Field(
+        default=None, description="Maximum number of LLM and search requests", ge=1
+    )
+    time_limit: Optional[float] = Field(
+        default=None, description="Maximum exploration time in seconds", gt=0
+    )
+
+    def can_afford(self, context: ResearchContext, expansions: int = 1) -> bool:
+        """
+        Check whether `expansions` more frontier queries fit in the remaining budget.
+
+        Costs are estimated from the average of the expansions done so far, so
+        the first expansion is allowed whenever any budget remains.
+        """
+        done = context.expansions
+        if self.max_tokens is not None:
+            per_expansion = context.tokens_used / done if done else 0
+            if context.tokens_used + per_expansion * expansions >= self.max_tokens:
+                return False
+        if self.max_requests is not None:
+            per_expansion = context.requests_used / done if done else 0
+            if context.requests_used + per_expansion * expansions >= self.max_requests:
+                return False
+        if self.time_limit is not None:
+            # Expansions of a round run concurrently, so time is estimated per round
+            per_round = context.elapsed / context.rounds if context.rounds else 0
+            if context.elapsed + per_round >= self.time_limit:
+                return False
+        return True
+
+
+class FrontierItem(BaseModel):
+    """A query waiting to be explored."""
+
+    model_config = ConfigDict(frozen=True)
+
+    query: str = Field(description="The query to search for")
+    depth: int = Field(description="Exploration depth of the query", ge=0)
+    score: float = Field(description="Expected value of exploring the query", ge=0.0)
+
+
+class ResearchFrontier:
+    """
+    Priority queue of research queries ordered by expected value.
+
+    A follow-up query is valued by the relevance of the insights its parent
+    branch produced, the share of new URLs the parent search returned, how
+    different it is from queries already queued, and a discount per level of
+    depth. Ties go to the shallower query, then to the query that sorts first,
+    so the exploration order does not depend on the order in which concurrent
+    branches happened to queue their follow-ups.
+    """
+
+    def __init__(self, max_depth: int, depth_discount: float = DEPTH_DISCOUNT):
+        self.max_depth = max_depth
+        self.depth_discount = depth_discount
+        self._heap: List[Tuple[float, int, str, FrontierItem]] = []
+        self._seen: List[Set[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @staticmethod
+    def _terms(query: str) -> Set[str]:
+        return set(re.findall(r"\w+", normalize_query(query)))
+
+    def query_novelty(self, query: str) -> float:
+        """1 minus the highest word overlap (Jaccard) with any queued query."""
+        terms = self._terms(query)
+        if not terms:
+            return 0.0
+        overlap = max(
+            (len(terms & seen) / len(terms | seen) for seen in self._seen), default=0.0
+        )
+        return 1.0 - overlap
+
+    def expected_value(
+        self,
+        query: str,
+        depth: int,
+        parent_insights: Optional[List[ResearchInsight]] = None,
+        result_novelty: float = 1.0,
+    ) -> float:
+        """Estimate the value of exploring a query."""
+        if parent_insights is None:
+            relevance = 1.0
+        else:
+            scores = sorted(
+                (i.relevance_score for i in parent_insights), reverse=True
+            )[:VALUE_TOP_INSIGHTS]
+            relevance = sum(scores) / len(scores) if scores else 0.0
+        # A branch whose results were all visited already is worth half as much
+        novelty = 0.5 + 0.5 * result_novelty
+        return (
+            relevance
+            * novelty
+            * self.query_novelty(query)
+            * self.depth_discount**depth
+        )
+
+    def push(
+        self,
+        query: str,
+        depth: int,
+        parent_insights: Optional[List[ResearchInsight]] = None,
+        result_novelty: float = 1.0,
+    ) -> Optional[FrontierItem]:
+        """Queue a query; returns None if it is too deep, a duplicate or worthless."""
+        if depth >= self.max_depth:
+            return None
+        score = self.expected_value(query, depth, parent_insights, result_novelty)
+        if score <= 0.0:
+            return None
+        item = FrontierItem(query=query, depth=depth, score=score)
+        self._seen.append(self._terms(query))
+        heapq.heappush(self._heap, (-score, depth, normalize_query(query), item))
+        return item
+
+    def pop(self) -> Optional[FrontierItem]:
+        """Remove and return the most valuable query."""
+        return heapq.heappop(self._heap)[-1] if self._heap else None
+
+    def next_batch(
+        self, size: int, budget: ResearchBudget, context: ResearchContext
+    ) -> List[FrontierItem]:
+        """Pop up to `size` of the most valuable queries that fit in the budget."""
+        batch = []
+        while self._heap and len(batch) < size:
+            if not budget.can_afford(context, len(batch) + 1):
+                break
+            batch.append(self.pop())
+        return batch
 
 
 class ResearchSummary(ToolResult):
@@ -184,9 +340,17 @@ class DeepResearch(BaseTool):
             },
             "time_limit_seconds": {
                 "type": "integer",
-                "description": "Maximum execution time in seconds. Default is 120.",
+                "description": "Maximum execution time in seconds (at least 1). Default is 120.",
                 "default": 120,
             },
+            "token_budget": {
+                "type": "integer",
+                "description": "Maximum LLM tokens to spend. Default is unlimited.",
+            },
+            "request_budget": {
+                "type": "integer",
+                "description": "Maximum number of LLM and search requests. Default is unlimited.",
+            },
         },
         "required": ["query"],
     }
@@ -195,6 +359,12 @@ class DeepResearch(BaseTool):
     search_tool: WebSearch = Field(default_factory=WebSearch)
     llm: LLM = Field(default_factory=LLM)
 
+    # Global budget of concurrent LLM calls shared by all research branches
+    max_concurrent_llm_calls: int = Field(default=4, ge=1)
+    # Number of frontier queries explored concurrently per scheduling round
+    max_parallel_branches: int = Field(default=2, ge=1)
+    _llm_semaphore: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+
     async def execute(
         self,
         query: str,
@@ -202,28 +372,48 @@ class DeepResearch(BaseTool):
         results_per_search: int = 5,
         max_insights: int = 20,
         time_limit_seconds: int = 120,
+        token_budget: Optional[int] = None,
+        request_budget: Optional[int] = None,
     ) -> ResearchSummary:
         """Execute deep research on the given query."""
         # Normalize parameters
         max_depth = max(1, min(max_depth, 5))
         results_per_search = max(1, min(results_per_search, 20))
+        time_limit_seconds = max(1, time_limit_seconds)
+        budget = ResearchBudget(
+            max_tokens=token_budget if token_budget and token_budget > 0 else None,
+            max_requests=request_budget if request_budget and request_budget > 0 else None,
+            time_limit=time_limit_seconds,
+        )
 
-        # Initialize research context and set deadline
+        # Initialize research context. The time limit is enforced by cancelling
+        # whatever is still running when it expires; insights are recorded in the
+        # context as soon as each analysis finishes, so they survive cancellation.
         context = ResearchContext(query=query, max_depth=max_depth)
-        deadline = time.time() + time_limit_seconds
 
         try:
-            # Initiate research process with optimized query
-            optimized_query = await self._generate_optimized_query(query)
-            await self._research_graph(
-                context=context,
-                query=optimized_query,
-                results_count=results_per_search,
-                deadline=deadline,
+            async with asyncio.timeout(time_limit_seconds):
+                # Initiate research process with optimized query
+                optimized_query = await self._generate_optimized_query(query, context)
+                await self._research_graph(
+                    context=context,
+                    query=optimized_query,
+                    results_count=results_per_search,
+                    budget=budget,
+                )
+        except TimeoutError:
+            logger.info(
+                f"Research time limit of {time_limit_seconds}s reached, "
+                f"returning {len(context.insights)} insights"
             )
         except ToolError as e:
             logger.error(f"Research error: {str(e)}")
 
+        logger.info(
+            f"Research explored {context.expansions} queries using "
+            f"{context.tokens_used} tokens and {context.requests_used} requests"
+        )
+
         # Prepare final summary
         return ResearchSummary(
             query=query,
@@ -234,12 +424,44 @@ class DeepResearch(BaseTool):
             depth_reached=context.current_depth,
         )
 
-    async def _generate_optimized_query(self, query: str) -> str:
+    async def _ask_tool(
+        self,
+        prompt: str,
+        tools: List[dict],
+        context: Optional[ResearchContext] = None,
+    ):
+        """
+        Ask the LLM for a required tool call, within the concurrency budget.
+        The request and its estimated token usage are charged to the context.
+        """
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(self.max_concurrent_llm_calls)
+        messages = [{"role": "user", "content": prompt}]
+        async with self._llm_semaphore:
+            response = await self.llm.ask_tool(
+                messages,
+                tools=tools,
+                tool_choice=ToolChoice.REQUIRED,
+                stream=False,
+            )
+
+        if context is not None:
+            tokens = self.llm.count_message_tokens(messages)
+            tokens += self.llm.token_counter.count_tools(tools)
+            for tool_call in (response.tool_calls or []) if response else []:
+                tokens += self.llm.count_tokens(tool_call.function.arguments)
+            context.tokens_used += tokens
+            context.requests_used += 1
+        return response
+
+    async def _generate_optimized_query(
+        self, query: str, context: Optional[ResearchContext] = None
+    ) -> str:
         """Generate an optimized search query using LLM."""
         try:
             prompt = OPTIMIZE_QUERY_PROMPT.format(query=query)
-            response = await self.llm.ask_tool(
-                [{"role": "user", "content": prompt}],
+            response = await self._ask_tool(
+                prompt,
                 tools=[
                     {
                         "type": "function",
@@ -259,8 +481,7 @@ class DeepResearch(BaseTool):
                         },
                     }
                 ],
-                tool_choice=ToolChoice.REQUIRED,
-                stream=False,
+                context=context,
             )
 
             # Extract the query from the tool_call response
@@ -288,56 +509,85 @@ class DeepResearch(BaseTool):
         context: ResearchContext,
         query: str,
         results_count: int,
-        deadline: float,
+        budget: Optional[ResearchBudget] = None,
     ) -> None:
-        """Run a complete research cycle (search, analyze, generate follow-ups)."""
-        # Check termination conditions
-        if time.time() >= deadline or context.current_depth >= context.max_depth:
-            return
-
-        # Log current research step
-        logger.info(f"Research cycle at depth {context.current_depth + 1}")
+        """
+        Explore the research frontier until it is empty or the budget runs out.
+
+        Each round takes the most valuable queries from the frontier, explores
+        them concurrently (search, analyze, generate follow-ups) and queues the
+        follow-ups, valued by what their parent branch found.
+        """
+        budget = budget or ResearchBudget()
+        frontier = ResearchFrontier(max_depth=context.max_depth)
+        frontier.push(query, depth=0)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = frontier.next_batch(self.max_parallel_branches, budget, context)
+            if not batch:
+                break
+
+            # Log current research step
+            logger.info(
+                f"Research round {context.rounds + 1}: "
+                + ", ".join(f"'{item.query}' (value {item.score:.2f})" for item in batch)
+            )
+            started = loop.time()
+            outcomes = await asyncio.gather(
+                *(self._explore(context, item, results_count) for item in batch)
+            )
+            context.rounds += 1
+            context.elapsed += loop.time() - started
+
+            # Queue follow-ups in batch order to keep scheduling deterministic
+            for item, (insights, result_novelty, follow_ups) in zip(batch, outcomes):
+                for follow_up in follow_ups:
+                    frontier.push(
+                        follow_up,
+                        depth=item.depth + 1,
+                        parent_insights=insights,
+                        result_novelty=result_novelty,
+                    )
 
-        # 1. Web search
-        search_results = await self._search_web(query, results_count)
+    async def _explore(
+        self, context: ResearchContext, item: FrontierItem, results_count: int
+    ) -> Tuple[List[ResearchInsight], float, List[str]]:
+        """
+        Run one research cycle for a frontier query.
+
+        Returns:
+            The new insights, the share of search results not visited before
+            and the generated follow-up queries.
+        """
+        context.expansions += 1
+
+        # 1. Web search (fewer results deeper in the tree)
+        context.requests_used += 1
+        search_results = await self._search_web(
+            item.query, max(1, results_count - item.depth)
+        )
         if not search_results:
-            return
+            return [], 0.0, []
+        new_urls = sum(1 for r in search_results if r.url not in context.visited_urls)
+        result_novelty = new_urls / len(search_results)
 
         # 2. Extract insights
         new_insights = await self._extract_insights(
-            context, search_results, context.query, deadline
+            context, search_results, context.query
         )
         if not new_insights:
-            return
+            return [], result_novelty, []
+        context.current_depth = max(context.current_depth, item.depth + 1)
 
-        # 3. Generate follow-up queries
+        # 3. Generate follow-up queries, unless they would be too deep to explore
+        if item.depth + 1 >= context.max_depth:
+            return new_insights, result_novelty, []
         follow_up_queries = await self._generate_follow_ups(
-            new_insights, query, context.query
+            new_insights, item.query, context.query, context
         )
         context.follow_up_queries.extend(follow_up_queries)
-
-        # Update depth and proceed to next level
-        context.current_depth += 1
-
-        # 4. Continue research with follow-up queries
-        if follow_up_queries and context.current_depth < context.max_depth:
-            tasks = []  # Create a list to hold the tasks
-            for follow_up in follow_up_queries[:2]:  # Limit branching factor
-                if time.time() >= deadline:
-                    break
-
-                # Create a coroutine for the recursive research call
-                task = self._research_graph(
-                    context=context,
-                    query=follow_up,
-                    results_count=max(1, results_count - 1),  # Reduce result count
-                    deadline=deadline,
-                )
-                tasks.append(task)  # Add the task to the list
-
-            # Run all the created tasks concurrently
-            if tasks:
-                await asyncio.gather(*tasks)
+        return new_insights, result_novelty, follow_up_queries
 
     async def _search_web(self, query: str, results_count: int) -> List[SearchResult]:
         """Perform web search for the given query."""
@@ -351,40 +601,61 @@ class DeepResearch(BaseTool):
         context: ResearchContext,
         results: List[SearchResult],
         original_query: str,
-        deadline: float,
     ) -> List[ResearchInsight]:
-        """Extract insights from search results."""
-        all_insights = []
-
+        """Extract insights from search results, analyzing pages concurrently."""
+        pending = []
         for rst in results:
-            # Skip if URL already visited or time exceeded
-            if rst.url in context.visited_urls or time.time() >= deadline:
+            # Skip if URL already visited
+            if rst.url in context.visited_urls:
                 continue
 
             context.visited_urls.add(rst.url)
 
             # Skip if no content available
-            if not rst.raw_content:
-                continue
+            if rst.raw_content:
+                pending.append(rst)
+
+        if not pending:
+            return []
 
-            # Extract insights using LLM
+        # Analyses run concurrently up to the LLM budget; gather keeps the
+        # search result order and cancels them all if the time limit expires
+        page_insights = await asyncio.gather(
+            *(
+                self._extract_page_insights(context, rst, original_query)
+                for rst in pending
+            )
+        )
+        return [insight for insights in page_insights for insight in insights]
+
+    async def _extract_page_insights(
+        self, context: ResearchContext, rst: SearchResult, original_query: str
+    ) -> List[ResearchInsight]:
+        """Extract insights from a single search result and record them in the context."""
+        try:
             insights = await self._analyze_content(
                 content=rst.raw_content[:10000],  # Limit content size
                 url=rst.url,
                 title=rst.title,
                 query=original_query,
+                context=context,
             )
+        except Exception as e:
+            logger.warning(f"Failed to extract insights from {rst.url}: {e}")
+            return []
 
-            all_insights.extend(insights)
-            context.insights.extend(insights)
-
-            # Log discovered insights
-            logger.info(f"Extracted {len(insights)} insights from {rst.url}")
+        context.insights.extend(insights)
 
-        return all_insights
+        # Log discovered insights
+        logger.info(f"Extracted {len(insights)} insights from {rst.url}")
+        return insights
 
     async def _generate_follow_ups(
-        self, insights: List[ResearchInsight], current_query: str, original_query: str
+        self,
+        insights: List[ResearchInsight],
+        current_query: str,
+        original_query: str,
+        context: Optional[ResearchContext] = None,
     ) -> List[str]:
         """Generate follow-up queries based on insights."""
         if not insights:
@@ -401,8 +672,8 @@ class DeepResearch(BaseTool):
         )
 
         # Get follow-up queries from LLM using structured output
-        response = await self.llm.ask_tool(
-            [{"role": "user", "content": prompt}],
+        response = await self._ask_tool(
+            prompt,
             tools=[
                 {
                     "type": "function",
@@ -424,8 +695,7 @@ class DeepResearch(BaseTool):
                     },
                 }
             ],
-            tool_choice=ToolChoice.REQUIRED,
-            stream=False,
+            context=context,
         )
 
         # Extract queries from the tool response
@@ -439,15 +709,20 @@ class DeepResearch(BaseTool):
         return queries[:3]
 
     async def _analyze_content(
-        self, content: str, url: str, title: str, query: str
+        self,
+        content: str,
+        url: str,
+        title: str,
+        query: str,
+        context: Optional[ResearchContext] = None,
     ) -> List[ResearchInsight]:
         """Extract insights from content based on relevance to query."""
         prompt = EXTRACT_INSIGHTS_PROMPT.format(
             query=query, content=content[:5000]  # Limit content size
         )
 
-        response = await self.llm.ask_tool(
-            [{"role": "user", "content": prompt}],
+        response = await self._ask_tool(
+            prompt,
             tools=[
                 {
                     "type": "function",
@@ -484,8 +759,7 @@ class DeepResearch(BaseTool):
                     },
                 }
             ],
-            tool_choice=ToolChoice.REQUIRED,
-            stream=False,
+            context=context,
         )
 
         insights = []
@@ -1,8 +1,23 @@
 """File operation interfaces and implementations for local and sandbox environments."""
 
 import asyncio
+import shlex
+import stat
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Protocol, Tuple, Union, runtime_checkable
+from typing import (
+    Dict,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+    runtime_checkable,
+)
+
+import aiofiles
+import aiofiles.os
 
 from open_manus.app.config import SandboxSettings
 from open_manus.app.exceptions import ToolError
@@ -12,6 +27,14 @@ from open_manus.app.sandbox.client import SANDBOX_CLIENT
 PathLike = Union[str, Path]
 
 
+@dataclass(frozen=True)
+class FileStat:
+    """Existence and type of a path."""
+
+    exists: bool
+    is_dir: bool = False
+
+
 @runtime_checkable
 class FileOperator(Protocol):
     """Interface for file operations in different environments."""
@@ -32,6 +55,18 @@ class FileOperator(Protocol):
         """Check if path exists."""
         ...
 
+    async def stat_many(self, paths: Sequence[PathLike]) -> Dict[str, FileStat]:
+        """Check existence and type of several paths, keyed by str(path)."""
+        ...
+
+    async def read_many(self, paths: Sequence[PathLike]) -> Dict[str, str]:
+        """Read several files, keyed by str(path)."""
+        ...
+
+    async def write_many(self, files: Mapping[PathLike, str]) -> None:
+        """Write several files given as {path: content}."""
+        ...
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
@@ -47,24 +82,50 @@ class LocalFileOperator(FileOperator):
     async def read_file(self, path: PathLike) -> str:
         """Read content from a local file."""
         try:
-            return Path(path).read_text(encoding=self.encoding)
+            async with aiofiles.open(path, encoding=self.encoding) as f:
+                return await f.read()
         except Exception as e:
             raise ToolError(f"Failed to read {path}: {str(e)}") from None
 
     async def write_file(self, path: PathLike, content: str) -> None:
         """Write content to a local file."""
         try:
-            Path(path).write_text(content, encoding=self.encoding)
+            async with aiofiles.open(path, "w", encoding=self.encoding) as f:
+                await f.write(content)
         except Exception as e:
             raise ToolError(f"Failed to write to {path}: {str(e)}") from None
 
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory."""
-        return Path(path).is_dir()
+        return (await self._stat(path)).is_dir
 
     async def exists(self, path: PathLike) -> bool:
         """Check if path exists."""
-        return Path(path).exists()
+        return (await self._stat(path)).exists
+
+    @staticmethod
+    async def _stat(path: PathLike) -> FileStat:
+        try:
+            st = await aiofiles.os.stat(path)
+        except (OSError, ValueError):
+            return FileStat(exists=False)
+        return FileStat(exists=True, is_dir=stat.S_ISDIR(st.st_mode))
+
+    async def stat_many(self, paths: Sequence[PathLike]) -> Dict[str, FileStat]:
+        """Check several local paths concurrently."""
+        stats = await asyncio.gather(*(self._stat(path) for path in paths))
+        return dict(zip(map(str, paths), stats))
+
+    async def read_many(self, paths: Sequence[PathLike]) -> Dict[str, str]:
+        """Read several local files concurrently."""
+        contents = await asyncio.gather(*(self.read_file(path) for path in paths))
+        return dict(zip(map(str, paths), contents))
+
+    async def write_many(self, files: Mapping[PathLike, str]) -> None:
+        """Write several local files concurrently."""
+        await asyncio.gather(
+            *(self.write_file(path, content) for path, content in files.items())
+        )
 
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
@@ -122,19 +183,53 @@ class SandboxFileOperator(FileOperator):
 
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory in sandbox."""
-        await self._ensure_sandbox_initialized()
-        result = await self.sandbox_client.run_command(
-            f"test -d {path} && echo 'true' || echo 'false'"
-        )
-        return result.strip() == "true"
+        return (await self.stat_many([path]))[str(path)].is_dir
 
     async def exists(self, path: PathLike) -> bool:
         """Check if path exists in sandbox."""
+        return (await self.stat_many([path]))[str(path)].exists
+
+    async def stat_many(self, paths: Sequence[PathLike]) -> Dict[str, FileStat]:
+        """Check several paths in sandbox with a single command."""
+        if not paths:
+            return {}
         await self._ensure_sandbox_initialized()
+        # One line per path: d (directory), f (other existing path) or - (missing)
+        quoted = " ".join(shlex.quote(str(path)) for path in paths)
         result = await self.sandbox_client.run_command(
-            f"test -e {path} && echo 'true' || echo 'false'"
+            f'for p in {quoted}; do if [ -d "$p" ]; then echo d; '
+            f'elif [ -e "$p" ]; then echo f; else echo -; fi; done'
         )
-        return result.strip() == "true"
+        kinds = result.split()
+        if len(kinds) != len(paths):
+            raise ToolError(f"Failed to check paths in sandbox: {result}")
+        return {
+            str(path): FileStat(exists=kind != "-", is_dir=kind == "d")
+            for path, kind in zip(paths, kinds)
+        }
+
+    async def read_many(self, paths: Sequence[PathLike]) -> Dict[str, str]:
+        """Read several files from sandbox in one archive round-trip."""
+        if not paths:
+            return {}
+        await self._ensure_sandbox_initialized()
+        try:
+            contents = await self.sandbox_client.read_files([str(path) for path in paths])
+            return {path: content.decode("utf-8") for path, content in contents.items()}
+        except Exception as e:
+            raise ToolError(f"Failed to read files in sandbox: {str(e)}") from None
+
+    async def write_many(self, files: Mapping[PathLike, str]) -> None:
+        """Write several files to sandbox in one archive round-trip."""
+        if not files:
+            return
+        await self._ensure_sandbox_initialized()
+        try:
+            await self.sandbox_client.write_files(
+                {str(path): content for path, content in files.items()}
+            )
+        except Exception as e:
+            raise ToolError(f"Failed to write files in sandbox: {str(e)}") from None
 
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
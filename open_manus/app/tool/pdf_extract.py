@@ -0,0 +1,316 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from open_manus.app.config import config
+from open_manus.app.logger import logger
+
+
+# (page_number, text, layout); layout is a list of [x0, y0, x1, y1, text] text blocks
+PageRecord = Tuple[int, str, list]
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_page_range(path: str, start: int, stop: int) -> List[PageRecord]:
+    """
+    Extract text and block layout of pages [start, stop) (0-based indices).
+
+    Runs in worker processes, so it only takes picklable arguments and
+    returns plain data. Text is the concatenation of the text blocks, which
+    is what page.get_text() returns, so both come from a single parse.
+    """
+    records = []
+    with fitz.open(path) as doc:
+        for index in range(start, min(stop, doc.page_count)):
+            blocks = doc[index].get_text("blocks")
+            layout = [
+                [round(b[0], 1), round(b[1], 1), round(b[2], 1), round(b[3], 1), b[4]]
+                for b in blocks
+                if b[6] == 0  # text blocks only
+            ]
+            records.append((index + 1, "".join(block[4] for block in layout), layout))
+    return records
+
+
+def count_pages(path: str) -> int:
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+class PDFPageCache:
+    """On-disk cache of extracted pages keyed by file hash and page number.
+
+    A document is only served from the cache once all its pages are stored.
+    Documents are evicted least recently used first once the stored pages
+    exceed max_bytes. Access is serialized with a lock so the cache can be
+    used from worker threads.
+    """
+
+    # Bumped when the schema changes; older databases are dropped and rebuilt
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path: Path, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            path: Database file path, created on first write
+            max_bytes: Maximum total size of cached page text and layout
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS pages")
+                conn.execute("DROP TABLE IF EXISTS documents")
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "file_hash TEXT NOT NULL, page INTEGER NOT NULL, text TEXT NOT NULL, "
+                "layout TEXT NOT NULL, size INTEGER NOT NULL, PRIMARY KEY (file_hash, page))"
+            )
+            # page_count stays NULL until every page of the document is stored
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "file_hash TEXT PRIMARY KEY, page_count INTEGER, accessed_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def page_count(self, file_hash: str) -> Optional[int]:
+        """Page count of a fully cached document, or None if it is not cached."""
+        if self._conn is None and not self.path.exists():
+            return None
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT page_count FROM documents WHERE file_hash = ?", (file_hash,)
+            ).fetchone()
+            if row is None or row[0] is None:
+                return None
+            conn.execute(
+                "UPDATE documents SET accessed_at = ? WHERE file_hash = ?",
+                (time.time(), file_hash),
+            )
+            conn.commit()
+        return row[0]
+
+    def get_pages(self, file_hash: str, first: int, last: int) -> List[PageRecord]:
+        """Cached pages first..last (1-based, inclusive) in page order."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT page, text, layout FROM pages "
+                "WHERE file_hash = ? AND page BETWEEN ? AND ? ORDER BY page",
+                (file_hash, first, last),
+            ).fetchall()
+        return [(page, text, json.loads(layout)) for page, text, layout in rows]
+
+    def put_pages(self, file_hash: str, records: List[PageRecord]) -> None:
+        rows = []
+        for page, text, layout in records:
+            encoded = json.dumps(layout, ensure_ascii=False)
+            rows.append(
+                (file_hash, page, text, encoded, len(text.encode()) + len(encoded.encode()))
+            )
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO documents VALUES (?, NULL, ?) "
+                "ON CONFLICT (file_hash) DO UPDATE SET accessed_at = excluded.accessed_at",
+                (file_hash, time.time()),
+            )
+            conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict(conn, keep=file_hash)
+            conn.commit()
+
+    def mark_complete(self, file_hash: str, page_count: int) -> None:
+        """Record that every page of a document is cached.
+
+        Does nothing if some pages were evicted while the document was
+        being extracted.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE documents SET page_count = ? WHERE file_hash = ? "
+                "AND (SELECT COUNT(*) FROM pages WHERE file_hash = ?) = ?",
+                (page_count, file_hash, file_hash, page_count),
+            )
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, keep: str) -> int:
+        """Drop least recently used documents other than keep until the cache fits."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for file_hash, size in conn.execute(
+            "SELECT d.file_hash, COALESCE(SUM(p.size), 0) FROM documents d "
+            "LEFT JOIN pages p ON p.file_hash = d.file_hash "
+            "WHERE d.file_hash != ? GROUP BY d.file_hash ORDER BY d.accessed_at",
+            (keep,),
+        ):
+            victims.append((file_hash,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM pages WHERE file_hash = ?", victims)
+        conn.executemany("DELETE FROM documents WHERE file_hash = ?", victims)
+        return len(victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._conn is not None or self.path.exists():
+                conn = self._connect()
+                conn.execute("DELETE FROM pages")
+                conn.execute("DELETE FROM documents")
+                conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PDFTextExtractor:
+    """Extracts PDF pages off the event loop, with an optional page cache.
+
+    Page ranges of `pages_per_task` pages are extracted in a process pool and
+    yielded in page order as they finish. Small documents (a single range)
+    are extracted in a thread instead, which avoids the pool round trip.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[PDFPageCache] = None,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 16,
+    ):
+        """
+        Args:
+            cache: Page cache (None to always parse)
+            max_workers: Worker processes (defaults to the CPU count, at most 8)
+            pages_per_task: Pages extracted per worker task
+        """
+        self.cache = cache
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.pages_per_task = max(1, pages_per_task)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.stats: Dict[str, int] = {"cached_documents": 0, "parsed_pages": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def iter_pages(self, path: Path) -> AsyncIterator[PageRecord]:
+        """Yield (page_number, text, layout) for every page in page order."""
+        path = Path(path)
+        file_hash = None
+        if self.cache is not None:
+            file_hash = await asyncio.to_thread(file_sha256, path)
+            page_count = await asyncio.to_thread(self.cache.page_count, file_hash)
+            if page_count is not None:
+                self.stats["cached_documents"] += 1
+                for first in range(1, page_count + 1, self.pages_per_task):
+                    last = min(page_count, first + self.pages_per_task - 1)
+                    for record in await asyncio.to_thread(
+                        self.cache.get_pages, file_hash, first, last
+                    ):
+                        yield record
+                return
+
+        page_count = await asyncio.to_thread(count_pages, str(path))
+        ranges = [
+            (start, min(page_count, start + self.pages_per_task))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+        extracted = self._extract_ranges(str(path), ranges)
+        try:
+            async for records in extracted:
+                self.stats["parsed_pages"] += len(records)
+                if file_hash is not None:
+                    await asyncio.to_thread(self.cache.put_pages, file_hash, records)
+                for record in records:
+                    yield record
+        finally:
+            await extracted.aclose()
+
+        if file_hash is not None:
+            await asyncio.to_thread(self.cache.mark_complete, file_hash, page_count)
+
+    async def _extract_ranges(
+        self, path: str, ranges: List[Tuple[int, int]]
+    ) -> AsyncIterator[List[PageRecord]]:
+        """Extract page ranges concurrently, yielding them in order.
+
+        At most twice the worker count of ranges are in flight, so results
+        waiting for an earlier range stay bounded.
+        """
+        if len(ranges) <= 1:
+            for start, stop in ranges:
+                yield await asyncio.to_thread(extract_page_range, path, start, stop)
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        window = self.max_workers * 2
+        pending: List[asyncio.Future] = []
+        next_range = 0
+        try:
+            while pending or next_range < len(ranges):
+                while next_range < len(ranges) and len(pending) < window:
+                    start, stop = ranges[next_range]
+                    pending.append(
+                        loop.run_in_executor(executor, extract_page_range, path, start, stop)
+                    )
+                    next_range += 1
+                yield await pending.pop(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_extractor: Optional[PDFTextExtractor] = None
+
+
+def get_pdf_extractor() -> PDFTextExtractor:
+    """Returns the process-wide PDF extractor with its page cache."""
+    global _extractor
+    if _extractor is None:
+        cache_path = config.workspace_root / ".cache" / "pdf_pages.sqlite"
+        _extractor = PDFTextExtractor(cache=PDFPageCache(cache_path))
+        logger.info(f"PDF page cache: {cache_path}")
+    return _extractor
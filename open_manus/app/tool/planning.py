@@ -48,6 +48,11 @@ class PlanningTool(BaseTool):
                 "type": "array",
                 "items": {"type": "string"},
             },
+            "step_dependencies": {
+                "description": "Optional for create and update commands. For each step, the indices (0-based) of earlier steps it depends on. Steps whose dependencies are completed can run in parallel. If omitted, each step depends on the previous one.",
+                "type": "array",
+                "items": {"type": "array", "items": {"type": "integer"}},
+            },
             "step_index": {
                 "description": "Index of the step to update (0-based). Required for mark_step command.",
                 "type": "integer",
@@ -78,6 +83,7 @@ class PlanningTool(BaseTool):
         plan_id: Optional[str] = None,
         title: Optional[str] = None,
         steps: Optional[List[str]] = None,
+        step_dependencies: Optional[List[List[int]]] = None,
         step_index: Optional[int] = None,
         step_status: Optional[
             Literal["not_started", "in_progress", "completed", "blocked"]
@@ -93,15 +99,16 @@ class PlanningTool(BaseTool):
         - plan_id: Unique identifier for the plan
         - title: Title for the plan (used with create command)
         - steps: List of steps for the plan (used with create command)
+        - step_dependencies: Indices of earlier steps each step depends on (used with create and update commands)
         - step_index: Index of the step to update (used with mark_step command)
         - step_status: Status to set for a step (used with mark_step command)
         - step_notes: Additional notes for a step (used with mark_step command)
         """
 
         if command == "create":
-            return self._create_plan(plan_id, title, steps)
+            return self._create_plan(plan_id, title, steps, step_dependencies)
         elif command == "update":
-            return self._update_plan(plan_id, title, steps)
+            return self._update_plan(plan_id, title, steps, step_dependencies)
         elif command == "list":
             return self._list_plans()
         elif command == "get":
@@ -117,8 +124,42 @@ class PlanningTool(BaseTool):
                 f"Unrecognized command: {command}. Allowed commands are: create, update, list, get, set_active, mark_step, delete"
             )
 
+    @staticmethod
+    def _validate_dependencies(
+        step_dependencies: Optional[List[List[int]]], step_count: int
+    ) -> List[List[int]]:
+        """Validate step dependencies, defaulting to a sequential chain.
+
+        Steps may only depend on earlier steps, which keeps the plan acyclic.
+        """
+        if step_dependencies is None:
+            return [[i - 1] if i > 0 else [] for i in range(step_count)]
+
+        if not isinstance(step_dependencies, list) or len(step_dependencies) != step_count:
+            raise ToolError(
+                "Parameter `step_dependencies` must contain one list of step indices per step"
+            )
+
+        validated = []
+        for i, deps in enumerate(step_dependencies):
+            if not isinstance(deps, list) or not all(isinstance(d, int) for d in deps):
+                raise ToolError(
+                    f"Dependencies of step {i} must be a list of step indices"
+                )
+            invalid = [d for d in deps if d < 0 or d >= i]
+            if invalid:
+                raise ToolError(
+                    f"Step {i} can only depend on earlier steps, got: {invalid}"
+                )
+            validated.append(sorted(set(deps)))
+        return validated
+
     def _create_plan(
-        self, plan_id: Optional[str], title: Optional[str], steps: Optional[List[str]]
+        self,
+        plan_id: Optional[str],
+        title: Optional[str],
+        steps: Optional[List[str]],
+        step_dependencies: Optional[List[List[int]]] = None,
     ) -> ToolResult:
         """Create a new plan with the given ID, title, and steps."""
         if not plan_id:
@@ -141,6 +182,8 @@ class PlanningTool(BaseTool):
                 "Parameter `steps` must be a non-empty list of strings for command: create"
             )
 
+        dependencies = self._validate_dependencies(step_dependencies, len(steps))
+
         # Create a new plan with initialized step statuses
         plan = {
             "plan_id": plan_id,
@@ -148,6 +191,7 @@ class PlanningTool(BaseTool):
             "steps": steps,
             "step_statuses": ["not_started"] * len(steps),
             "step_notes": [""] * len(steps),
+            "step_dependencies": dependencies,
         }
 
         self.plans[plan_id] = plan
@@ -158,7 +202,11 @@ class PlanningTool(BaseTool):
         )
 
     def _update_plan(
-        self, plan_id: Optional[str], title: Optional[str], steps: Optional[List[str]]
+        self,
+        plan_id: Optional[str],
+        title: Optional[str],
+        steps: Optional[List[str]],
+        step_dependencies: Optional[List[List[int]]] = None,
     ) -> ToolResult:
         """Update an existing plan with new title or steps."""
         if not plan_id:
@@ -201,6 +249,13 @@ class PlanningTool(BaseTool):
             plan["steps"] = steps
             plan["step_statuses"] = new_statuses
             plan["step_notes"] = new_notes
+            plan["step_dependencies"] = self._validate_dependencies(
+                step_dependencies, len(steps)
+            )
+        elif step_dependencies is not None:
+            plan["step_dependencies"] = self._validate_dependencies(
+                step_dependencies, len(plan["steps"])
+            )
 
         return ToolResult(
             output=f"Plan updated successfully: {plan_id}\n\n{self._format_plan(plan)}"
@@ -345,7 +400,8 @@ class PlanningTool(BaseTool):
         output += f"Status: {completed} completed, {in_progress} in progress, {blocked} blocked, {not_started} not started\n\n"
         output += "Steps:\n"
 
-        # Add each step with its status and notes
+        # Add each step with its status, dependencies (if not sequential) and notes
+        dependencies = plan.get("step_dependencies", [])
         for i, (step, status, notes) in enumerate(
             zip(plan["steps"], plan["step_statuses"], plan["step_notes"])
         ):
@@ -357,6 +413,9 @@ class PlanningTool(BaseTool):
             }.get(status, "[ ]")
 
             output += f"{i}. {status_symbol} {step}\n"
+            deps = dependencies[i] if i < len(dependencies) else None
+            if deps is not None and deps != ([i - 1] if i > 0 else []):
+                output += f"   Depends on: {', '.join(map(str, deps)) or 'none'}\n"
             if notes:
                 output += f"   Notes: {notes}\n"
 
@@ -3,6 +3,10 @@ from open_manus.app.tool.search.base import WebSearchEngine
 from open_manus.app.tool.search.bing_search import BingSearchEngine
 from open_manus.app.tool.search.duckduckgo_search import DuckDuckGoSearchEngine
 from open_manus.app.tool.search.google_search import GoogleSearchEngine
+from open_manus.app.tool.search.health import (
+    EngineHealthTracker,
+    get_engine_health_tracker,
+)
 
 
 __all__ = [
@@ -11,4 +15,6 @@ __all__ = [
     "DuckDuckGoSearchEngine",
     "GoogleSearchEngine",
     "BingSearchEngine",
+    "EngineHealthTracker",
+    "get_engine_health_tracker",
 ]
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from open_manus.app.config import config
+from open_manus.app.logger import logger
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    query = query.lower().strip()
+    query = re.sub(r"\s+", " ", query)
+    return query.strip(" ?!.,;:")
+
+
+class SearchResultCache:
+    """LRU cache of search results with TTL and optional JSON persistence.
+
+    Entries are keyed by the normalized query, engine preference, language,
+    country and number of results. Results are stored as plain dicts without
+    fetched page content, which is cached separately by the content fetcher.
+    """
+
+    def __init__(
+        self, ttl: int = 3600, max_entries: int = 512, path: Optional[Path] = None
+    ):
+        """
+        Args:
+            ttl: Seconds a cached result set stays valid
+            max_entries: Maximum number of cached queries
+            path: JSON file the cache is persisted to (None to keep it in memory only)
+        """
+        self.ttl = ttl
+        self.max_entries = max(0, max_entries)
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._loaded = False
+        self._dirty = False
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    @staticmethod
+    def make_key(
+        query: str, engine: str, lang: str, country: str, num_results: int
+    ) -> str:
+        return json.dumps(
+            [normalize_query(query), engine, lang, country, num_results],
+            ensure_ascii=False,
+        )
+
+    def _load(self) -> None:
+        """Load persisted entries once, dropping expired ones."""
+        self._loaded = True
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Failed to load search cache from {self.path}: {e}")
+            return
+        now = time.time()
+        for key, entry in data.items():
+            if now - entry.get("stored_at", 0) < self.ttl:
+                self._entries[key] = entry
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached results for key, or None on a miss."""
+        if not self._loaded:
+            self._load()
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry["stored_at"] >= self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry["results"]
+
+    def set(self, key: str, results: List[Dict]) -> None:
+        """Store results for key, evicting the least recently used entries."""
+        if self.max_entries == 0:
+            return
+        if not self._loaded:
+            self._load()
+        self._entries[key] = {"stored_at": time.time(), "results": results}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.stats["stores"] += 1
+        self._dirty = True
+
+    async def persist(self) -> None:
+        """Write the cache to disk if persistence is enabled and it changed."""
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        snapshot = json.dumps(dict(self._entries), ensure_ascii=False)
+        try:
+            await asyncio.to_thread(self._write, snapshot)
+        except Exception as e:
+            logger.warning(f"Failed to persist search cache to {self.path}: {e}")
+
+    def _write(self, snapshot: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(snapshot, encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._entries.clear()
+        self._dirty = True
+
+
+_search_cache: Optional[SearchResultCache] = None
+
+
+def get_search_cache() -> SearchResultCache:
+    """Returns the process-wide search result cache."""
+    global _search_cache
+    if _search_cache is None:
+        settings = config.search_config
+        path = getattr(settings, "search_cache_path", None)
+        if path and not Path(path).is_absolute():
+            path = config.root_path / path
+        _search_cache = SearchResultCache(
+            ttl=getattr(settings, "search_cache_ttl", 3600),
+            max_entries=getattr(settings, "search_cache_size", 512),
+            path=path,
+        )
+    return _search_cache
@@ -0,0 +1,200 @@
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from open_manus.app.config import config
+
+
+class BreakerState:
+    """Circuit breaker states"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class EngineHealth(BaseModel):
+    """Health statistics of a single search engine."""
+
+    requests: int = Field(default=0, description="Number of recorded searches")
+    successes: int = Field(default=0, description="Number of successful searches")
+    success_ewma: float = Field(
+        default=1.0, description="Exponentially weighted recent success rate"
+    )
+    latency_ewma: Optional[float] = Field(
+        default=None, description="Exponentially weighted latency in seconds"
+    )
+    consecutive_failures: int = Field(default=0, description="Failures since the last success")
+    state: str = Field(default=BreakerState.CLOSED, description="Circuit breaker state")
+    opened_at: Optional[float] = Field(
+        default=None, description="Time the breaker was last opened"
+    )
+    last_failure_at: Optional[float] = Field(
+        default=None, description="Time of the last failed search"
+    )
+    probe_in_flight: bool = Field(
+        default=False, description="Whether a half-open probe request is running"
+    )
+
+
+class EngineHealthTracker:
+    """Process-wide health tracking and circuit breaking for search engines.
+
+    An engine's breaker opens after `failure_threshold` consecutive failures.
+    While open the engine is skipped; after `cooldown` seconds it becomes
+    half-open and a single probe request is let through. A successful probe
+    closes the breaker, a failed one opens it again.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 3, cooldown: float = 60.0, alpha: float = 0.2
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown: Seconds the breaker stays open before a probe is allowed
+            alpha: Smoothing factor of the success rate and latency EWMAs
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self._engines: Dict[str, EngineHealth] = {}
+
+    def _get(self, engine_name: str) -> EngineHealth:
+        if engine_name not in self._engines:
+            self._engines[engine_name] = EngineHealth()
+        return self._engines[engine_name]
+
+    def _refresh(self, health: EngineHealth, now: float) -> None:
+        """Move an open breaker to half-open once the cooldown has passed."""
+        if (
+            health.state == BreakerState.OPEN
+            and health.opened_at is not None
+            and now - health.opened_at >= self.cooldown
+        ):
+            health.state = BreakerState.HALF_OPEN
+            health.probe_in_flight = False
+
+    def allow_request(self, engine_name: str) -> bool:
+        """Check whether a search may be sent to the engine (claims the probe when half-open)."""
+        health = self._get(engine_name)
+        self._refresh(health, time.monotonic())
+        if health.state == BreakerState.CLOSED:
+            return True
+        if health.state == BreakerState.HALF_OPEN and not health.probe_in_flight:
+            health.probe_in_flight = True
+            return True
+        return False
+
+    def release(self, engine_name: str) -> None:
+        """Release a claimed probe without recording an outcome (e.g. cancelled request)."""
+        self._get(engine_name).probe_in_flight = False
+
+    def record_success(self, engine_name: str, latency: float) -> None:
+        """Record a successful search."""
+        health = self._get(engine_name)
+        self._record(health, latency, success=True)
+        health.successes += 1
+        health.consecutive_failures = 0
+        health.state = BreakerState.CLOSED
+        health.opened_at = None
+
+    def record_failure(self, engine_name: str, latency: float) -> None:
+        """Record a failed search, opening the breaker if needed."""
+        health = self._get(engine_name)
+        self._record(health, latency, success=False)
+        health.consecutive_failures += 1
+        health.last_failure_at = time.monotonic()
+        if (
+            health.state == BreakerState.HALF_OPEN
+            or health.consecutive_failures >= self.failure_threshold
+        ):
+            health.state = BreakerState.OPEN
+            health.opened_at = time.monotonic()
+
+    def _record(self, health: EngineHealth, latency: float, success: bool) -> None:
+        health.requests += 1
+        health.probe_in_flight = False
+        health.success_ewma += self.alpha * ((1.0 if success else 0.0) - health.success_ewma)
+        if health.latency_ewma is None:
+            health.latency_ewma = latency
+        else:
+            health.latency_ewma += self.alpha * (latency - health.latency_ewma)
+
+    def rank(self, engine_names: List[str]) -> List[str]:
+        """
+        Order engines by health: closed breakers first, then half-open, then open.
+        Within a state, engines that failed during the last cooldown period go
+        after the others, ordered by recent success rate and then latency. The
+        remaining engines keep the given (configured) order, so a preferred
+        engine gets its place back once it stops failing.
+        """
+        now = time.monotonic()
+        state_rank = {BreakerState.CLOSED: 0, BreakerState.HALF_OPEN: 1, BreakerState.OPEN: 2}
+
+        def key(engine_name: str):
+            health = self._get(engine_name)
+            self._refresh(health, now)
+            recently_failed = (
+                health.consecutive_failures > 0
+                and health.last_failure_at is not None
+                and now - health.last_failure_at < self.cooldown
+            )
+            if not recently_failed:
+                return state_rank[health.state], False, 0.0, 0.0
+            latency = health.latency_ewma if health.latency_ewma is not None else 0.0
+            return state_rank[health.state], True, -health.success_ewma, latency
+
+        return sorted(engine_names, key=key)
+
+    def seconds_until_available(self, engine_names: List[str]) -> float:
+        """Seconds until at least one of the engines accepts a request (0 if one does now)."""
+        now = time.monotonic()
+        waits = []
+        for engine_name in engine_names:
+            health = self._get(engine_name)
+            self._refresh(health, now)
+            if health.state != BreakerState.OPEN:
+                return 0.0
+            waits.append(max(0.0, health.opened_at + self.cooldown - now))
+        return min(waits, default=0.0)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Get health statistics of every tracked engine."""
+        now = time.monotonic()
+        stats = {}
+        for engine_name, health in self._engines.items():
+            self._refresh(health, now)
+            stats[engine_name] = {
+                "state": health.state,
+                "requests": health.requests,
+                "success_rate": health.successes / health.requests
+                if health.requests
+                else None,
+                "recent_success_rate": round(health.success_ewma, 3),
+                "latency_ewma": round(health.latency_ewma, 3)
+                if health.latency_ewma is not None
+                else None,
+                "consecutive_failures": health.consecutive_failures,
+            }
+        return stats
+
+    def reset(self) -> None:
+        """Forget all recorded health data."""
+        self._engines.clear()
+
+
+_tracker: Optional[EngineHealthTracker] = None
+
+
+def get_engine_health_tracker() -> EngineHealthTracker:
+    """Returns the process-wide engine health tracker."""
+    global _tracker
+    if _tracker is None:
+        settings = config.search_config
+        _tracker = EngineHealthTracker(
+            failure_threshold=getattr(settings, "breaker_failure_threshold", 3),
+            cooldown=getattr(settings, "breaker_cooldown", 60),
+        )
+    return _tracker
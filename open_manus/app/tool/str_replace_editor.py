@@ -10,6 +10,7 @@ from open_manus.app.tool import BaseTool
 from open_manus.app.tool.base import CLIResult, ToolResult
 from open_manus.app.tool.file_operators import (
     FileOperator,
+    FileStat,
     LocalFileOperator,
     PathLike,
     SandboxFileOperator,
@@ -128,11 +129,11 @@ class StrReplaceEditor(BaseTool):
         operator = self._get_operator()
 
         # Validate path and command combination
-        await self.validate_path(command, Path(path), operator)
+        path_stat = await self.validate_path(command, Path(path), operator)
 
         # Execute the appropriate command
         if command == "view":
-            result = await self.view(path, view_range, operator)
+            result = await self.view(path, view_range, operator, path_stat.is_dir)
         elif command == "create":
             if file_text is None:
                 raise ToolError("Parameter `file_text` is required for command: create")
@@ -165,43 +166,51 @@ class StrReplaceEditor(BaseTool):
 
     async def validate_path(
         self, command: str, path: Path, operator: FileOperator
-    ) -> None:
-        """Validate path and command combination based on execution environment."""
+    ) -> FileStat:
+        """Validate path and command combination based on execution environment.
+
+        Existence and type are checked in a single operator call; the result
+        is returned so that commands don't need to check again.
+        """
         # Check if path is absolute
         if not path.is_absolute():
             raise ToolError(f"The path {path} is not an absolute path")
 
+        path_stat = (await operator.stat_many([path]))[str(path)]
+
         # Only check if path exists for non-create commands
         if command != "create":
-            if not await operator.exists(path):
+            if not path_stat.exists:
                 raise ToolError(
                     f"The path {path} does not exist. Please provide a valid path."
                 )
 
             # Check if path is a directory
-            is_dir = await operator.is_directory(path)
-            if is_dir and command != "view":
+            if path_stat.is_dir and command != "view":
                 raise ToolError(
                     f"The path {path} is a directory and only the `view` command can be used on directories"
                 )
 
         # Check if file exists for create command
         elif command == "create":
-            exists = await operator.exists(path)
-            if exists:
+            if path_stat.exists:
                 raise ToolError(
                     f"File already exists at: {path}. Cannot overwrite files using command `create`."
                 )
 
+        return path_stat
+
     async def view(
         self,
         path: PathLike,
         view_range: Optional[List[int]] = None,
         operator: FileOperator = None,
+        is_dir: Optional[bool] = None,
     ) -> CLIResult:
         """Display file or directory content."""
-        # Determine if path is a directory
-        is_dir = await operator.is_directory(path)
+        # Determine if path is a directory, unless the caller already knows
+        if is_dir is None:
+            is_dir = await operator.is_directory(path)
 
         if is_dir:
             # Directory handling
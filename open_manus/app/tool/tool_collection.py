@@ -1,5 +1,5 @@
 """Collection classes for managing multiple tools."""
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from open_manus.app.exceptions import ToolError
 from open_manus.app.tool.base import BaseTool, ToolFailure, ToolResult
@@ -14,12 +14,18 @@ class ToolCollection:
     def __init__(self, *tools: BaseTool):
         self.tools = tools
         self.tool_map = {tool.name: tool for tool in tools}
+        self._params: Optional[List[Dict[str, Any]]] = None
+        self._params_tools: Optional[tuple] = None
 
     def __iter__(self):
         return iter(self.tools)
 
     def to_params(self) -> List[Dict[str, Any]]:
-        return [tool.to_param() for tool in self.tools]
+        """Tool schemas in function call format, cached until the tools change."""
+        if self._params is None or self._params_tools is not self.tools:
+            self._params = [tool.to_param() for tool in self.tools]
+            self._params_tools = self.tools
+        return self._params
 
     async def execute(
         self, *, name: str, tool_input: Dict[str, Any] = None
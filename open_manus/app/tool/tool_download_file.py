@@ -1,15 +1,556 @@
+import asyncio
+import hashlib
+import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
 
+import aiofiles
 import aiohttp
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 # Import BaseTool and ToolResult from the project's base tool module.
+from open_manus.app.config import config
+from open_manus.app.exceptions import ToolError
+from open_manus.app.logger import logger
 from open_manus.app.tool.base import BaseTool, ToolResult
 
 
+# Bytes read from the response per write
+CHUNK_SIZE = 256 * 1024
+# Files at least this large are fetched in parallel segments when the server accepts ranges
+SEGMENT_MIN_SIZE = 16 * 1024 * 1024
+MAX_SEGMENTS = 4
+
+
+@dataclass
+class DownloadInfo:
+    """Result of a verified download"""
+
+    path: Path
+    size: int
+    sha256: str
+    resumed_from: int = 0
+    segments: int = 1
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Parse 'bytes start-end/total' into (start, end, total or None)"""
+    if not value or not value.startswith("bytes "):
+        return None
+    try:
+        span, total = value[6:].split("/")
+        start, end = span.split("-")
+        return int(start), int(end), None if total == "*" else int(total)
+    except ValueError:
+        return None
+
+
+class FileDownloader:
+    """
+    Streams a URL to disk through a `.part` file, verifying it before the
+    final rename.
+
+    - The body is written in CHUNK_SIZE pieces with async file I/O, so memory
+      use does not grow with the file size.
+    - An existing `.part` file is resumed with a Range request. Its validators
+      (ETag / Last-Modified) are kept in a `.part.json` sidecar and sent as
+      If-Range, so a changed file is downloaded again from the start. A
+      partial file without validators is never resumed, since a change on
+      the server could not be detected.
+    - Large files on servers that accept ranges are fetched in concurrent
+      segments; finished segments are recorded in the sidecar and skipped
+      when the download is resumed.
+    - The size is checked against Content-Length / Content-Range and, when
+      given, the SHA-256 against the expected checksum.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_segments: int = MAX_SEGMENTS,
+        segment_min_size: int = SEGMENT_MIN_SIZE,
+    ):
+        self.session = session
+        self.max_segments = max(1, max_segments)
+        self.segment_min_size = segment_min_size
+        # Validators (etag, last_modified) of the last completed download
+        self.last_meta: Dict[str, Any] = {}
+
+    @staticmethod
+    def part_paths(save_path: Path) -> Tuple[Path, Path]:
+        part_path = save_path.with_name(save_path.name + ".part")
+        return part_path, part_path.with_name(part_path.name + ".json")
+
+    @staticmethod
+    def _read_meta(meta_path: Path, url: str) -> Dict[str, Any]:
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+        return meta if meta.get("url") == url else {}
+
+    @staticmethod
+    async def _write_meta(meta_path: Path, meta: Dict[str, Any]) -> None:
+        async with aiofiles.open(meta_path, "w", encoding="utf-8") as f:
+            await f.write(json.dumps(meta))
+
+    async def download(self, url: str, save_path: Path) -> DownloadInfo:
+        """Download url to save_path, resuming a previous partial download."""
+        part_path, meta_path = self.part_paths(save_path)
+        meta = self._read_meta(meta_path, url) if part_path.exists() else {}
+        if part_path.exists() and not (meta.get("etag") or meta.get("last_modified")):
+            # 没有元数据或校验器（ETag / Last-Modified），无法确认是同一个文件，从头下载
+            part_path.unlink()
+            meta = {}
+
+        if meta.get("segments"):
+            info = await self._download_segmented(url, part_path, meta_path, meta)
+        else:
+            info = await self._download_stream(url, part_path, meta_path, meta)
+
+        self.last_meta = self._read_meta(meta_path, url)
+        os.replace(part_path, save_path)
+        meta_path.unlink(missing_ok=True)
+        info.path = save_path
+        return info
+
+    async def _download_stream(
+        self, url: str, part_path: Path, meta_path: Path, meta: Dict[str, Any]
+    ) -> DownloadInfo:
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            validator = meta.get("etag") or meta.get("last_modified")
+            if validator:
+                headers["If-Range"] = validator
+
+        async with self.session.get(url, headers=headers) as response:
+            if response.status == 206 and offset:
+                content_range = parse_content_range(response.headers.get("Content-Range"))
+                if not content_range or content_range[0] != offset:
+                    raise ToolError(f"Server returned an unexpected range: {content_range}")
+                total = content_range[2]
+            elif response.status == 200:
+                if offset:
+                    logger.info(f"Server did not resume {url}, downloading from the start")
+                offset = 0
+                total = response.content_length
+            elif response.status == 416 and offset:
+                if offset == meta.get("total"):
+                    # 已经下载完整，只差校验和重命名
+                    return await self._finish(part_path, offset, resumed_from=offset)
+                # 部分文件与服务器上的文件对不上，从头下载
+                part_path.unlink()
+                return await self._download_stream(url, part_path, meta_path, {})
+            else:
+                raise ToolError(
+                    f"Failed to download file. HTTP status code: {response.status}"
+                )
+
+            meta = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "total": total,
+            }
+            if (
+                offset == 0
+                and total
+                and total >= self.segment_min_size
+                and self.max_segments > 1
+                and response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            ):
+                # 服务器支持 Range：放弃这个响应，改为分段并发下载
+                meta["segments"] = self._plan_segments(total)
+                await self._write_meta(meta_path, meta)
+                response.close()
+                return await self._download_segmented(url, part_path, meta_path, meta)
+
+            await self._write_meta(meta_path, meta)
+            digest = hashlib.sha256()
+            if offset:
+                # 续传时先把已有部分计入哈希
+                digest = await asyncio.to_thread(self._hash_prefix, part_path, offset)
+            size = offset
+            async with aiofiles.open(part_path, "ab" if offset else "wb") as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    await f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+
+        if total is not None and size != total:
+            raise ToolError(f"Incomplete download: got {size} of {total} bytes")
+        return DownloadInfo(
+            path=part_path, size=size, sha256=digest.hexdigest(), resumed_from=offset
+        )
+
+    @staticmethod
+    def _hash_prefix(path: Path, length: int):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            remaining = length
+            while remaining:
+                block = f.read(min(1024 * 1024, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest
+
+    def _plan_segments(self, total: int) -> List[Dict[str, Any]]:
+        step = -(-total // self.max_segments)
+        return [
+            {"start": start, "end": min(total, start + step) - 1, "done": False}
+            for start in range(0, total, step)
+        ]
+
+    async def _download_segmented(
+        self, url: str, part_path: Path, meta_path: Path, meta: Dict[str, Any]
+    ) -> DownloadInfo:
+        total = meta["total"]
+        segments = meta["segments"]
+        if not part_path.exists() or part_path.stat().st_size != total:
+            # 预分配文件，各分段按偏移写入
+            async with aiofiles.open(part_path, "wb") as f:
+                await f.truncate(total)
+            for segment in segments:
+                segment["done"] = False
+        resumed_from = sum(
+            s["end"] - s["start"] + 1 for s in segments if s["done"]
+        )
+        lock = asyncio.Lock()
+        changed = False
+
+        async def fetch(segment: Dict[str, Any]) -> None:
+            nonlocal changed
+            headers = {"Range": f"bytes={segment['start']}-{segment['end']}"}
+            validator = meta.get("etag") or meta.get("last_modified")
+            if validator:
+                headers["If-Range"] = validator
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 200:
+                    # If-Range 不匹配：服务器上的文件已经变化
+                    changed = True
+                content_range = parse_content_range(response.headers.get("Content-Range"))
+                if response.status != 206 or not content_range or content_range[:2] != (
+                    segment["start"],
+                    segment["end"],
+                ):
+                    raise ToolError(
+                        f"Segment {segment['start']}-{segment['end']} failed: "
+                        f"HTTP {response.status}"
+                    )
+                written = 0
+                async with aiofiles.open(part_path, "r+b") as f:
+                    await f.seek(segment["start"])
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        await f.write(chunk)
+                        written += len(chunk)
+            if written != segment["end"] - segment["start"] + 1:
+                raise ToolError(
+                    f"Segment {segment['start']}-{segment['end']} incomplete: {written} bytes"
+                )
+            async with lock:
+                segment["done"] = True
+                await self._write_meta(meta_path, meta)
+
+        tasks = [asyncio.create_task(fetch(s)) for s in segments if not s["done"]]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 一个分段失败时停止其余分段，已完成的分段保留以便续传
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not changed:
+                raise
+            logger.info(f"{url} changed since the partial download, downloading from the start")
+            part_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            return await self._download_stream(url, part_path, meta_path, {})
+        info = await self._finish(part_path, total, resumed_from=resumed_from)
+        info.segments = len(segments)
+        return info
+
+    @staticmethod
+    async def _finish(part_path: Path, expected_size: int, resumed_from: int) -> DownloadInfo:
+        size = part_path.stat().st_size
+        if size != expected_size:
+            raise ToolError(f"Incomplete download: got {size} of {expected_size} bytes")
+        sha256 = await asyncio.to_thread(hash_file, part_path)
+        return DownloadInfo(path=part_path, size=size, sha256=sha256, resumed_from=resumed_from)
+
+
+@dataclass
+class StoredFile:
+    """A file in the download store"""
+
+    path: Path
+    size: int
+    sha256: str
+    reused: bool = False
+
+
+class DownloadStore:
+    """
+    Content-addressed store of downloaded files.
+
+    File contents live once under objects/<sha256[:2]>/<sha256>; index.json
+    maps each URL to the content it last returned, with its ETag and
+    Last-Modified. Files handed out to callers are copies of the stored
+    object, so downloading the same file again, under any name or URL, costs
+    no extra network transfer, and editing a handed-out file never changes
+    the store.
+    """
+
+    def __init__(self, root: Path, ttl: int = 3600):
+        """
+        Args:
+            root: Store directory
+            ttl: Seconds a URL is served from the store without revalidation
+        """
+        self.root = Path(root)
+        self.ttl = ttl
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        # Downloads index their files from worker threads concurrently
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256[:2] / sha256
+
+    def staging_path(self, url: str) -> Path:
+        """Stable per-URL download location, so interrupted downloads resume."""
+        return self.root / "tmp" / hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            try:
+                self._index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._index = {}
+            except Exception as e:
+                logger.warning(f"Failed to load download index {self.index_path}: {e}")
+                self._index = {}
+        return self._index
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Index entry of a URL whose content is still in the store."""
+        with self._lock:
+            entry = self._load().get(url)
+        if entry and self.object_path(entry["sha256"]).exists():
+            return entry
+        return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def touch(self, url: str) -> None:
+        """Mark a URL as revalidated now."""
+        with self._lock:
+            self._load()[url]["fetched_at"] = time.time()
+            self._save()
+
+    def add(self, url: str, path: Path, sha256: str, size: int, meta: Dict[str, Any]) -> Path:
+        """Move a downloaded file into the store and index it under url."""
+        object_path = self.object_path(sha256)
+        if object_path.exists():
+            # 相同内容已存在（如镜像 URL），丢弃新下载的副本
+            path.unlink()
+        else:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, object_path)
+        with self._lock:
+            self._load()[url] = {
+                "sha256": sha256,
+                "size": size,
+                "etag": meta.get("etag"),
+                "last_modified": meta.get("last_modified"),
+                "fetched_at": time.time(),
+            }
+            self._save()
+        return object_path
+
+    def _save(self) -> None:
+        """Atomically rewrite index.json; the caller holds the lock."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.root, prefix="index.", suffix=".tmp", delete=False
+        ) as f:
+            json.dump(self._index, f)
+        os.replace(f.name, self.index_path)
+
+    @staticmethod
+    def materialize(object_path: Path, target: Path) -> None:
+        """Make target a copy of a stored object.
+
+        Never a hard link: callers edit downloaded files in place, which
+        would silently change the content-addressed object.
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(object_path, tmp_name)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+class DownloadManager:
+    """
+    Downloads files through a pooled HTTP session into a DownloadStore.
+
+    - One aiohttp session per event loop, with total and per-host connection
+      limits and a DNS cache, shared by every DownloadFile call.
+    - A URL already in the store is returned without a request within the
+      store's ttl; after that it is revalidated with If-None-Match /
+      If-Modified-Since and a 304 reuses the stored file.
+    - Concurrent requests for the same URL share a single transfer.
+    """
+
+    def __init__(self, store: DownloadStore, max_connections: int = 16, max_per_host: int = 4):
+        self.store = store
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"downloads": 0, "hits": 0, "revalidated": 0, "coalesced": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_per_host,
+                    ttl_dns_cache=300,
+                )
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def fetch(
+        self,
+        url: str,
+        max_segments: int = MAX_SEGMENTS,
+        segment_min_size: int = SEGMENT_MIN_SIZE,
+    ) -> StoredFile:
+        """Return the stored file for url, downloading it if needed."""
+        task = self._inflight.get(url)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.create_task(self._fetch(url, max_segments, segment_min_size))
+            self._inflight[url] = task
+            task.add_done_callback(lambda t: self._forget(url, t))
+        # shield: a cancelled caller must not cancel the transfer shared with others
+        return await asyncio.shield(task)
+
+    def _forget(self, url: str, task: asyncio.Task) -> None:
+        if self._inflight.get(url) is task:
+            del self._inflight[url]
+
+    async def _fetch(self, url: str, max_segments: int, segment_min_size: int) -> StoredFile:
+        entry = self.store.lookup(url)
+        if entry is not None:
+            if self.store.is_fresh(entry):
+                self.stats["hits"] += 1
+                return self._stored(entry, reused=True)
+            if await self._revalidate(url, entry):
+                self.stats["revalidated"] += 1
+                await asyncio.to_thread(self.store.touch, url)
+                return self._stored(entry, reused=True)
+
+        staging_path = self.store.staging_path(url)
+        staging_path.parent.mkdir(parents=True, exist_ok=True)
+        downloader = FileDownloader(
+            self._get_session(), max_segments=max_segments, segment_min_size=segment_min_size
+        )
+        info = await downloader.download(url, staging_path)
+        self.stats["downloads"] += 1
+        object_path = await asyncio.to_thread(
+            self.store.add, url, staging_path, info.sha256, info.size, downloader.last_meta
+        )
+        return StoredFile(path=object_path, size=info.size, sha256=info.sha256)
+
+    def _stored(self, entry: Dict[str, Any], reused: bool) -> StoredFile:
+        return StoredFile(
+            path=self.store.object_path(entry["sha256"]),
+            size=entry["size"],
+            sha256=entry["sha256"],
+            reused=reused,
+        )
+
+    async def _revalidate(self, url: str, entry: Dict[str, Any]) -> bool:
+        """Check with a conditional request whether the stored content is current."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return False
+        try:
+            async with self._get_session().get(url, headers=headers) as response:
+                return response.status == 304
+        except aiohttp.ClientError as e:
+            logger.warning(f"Revalidation of {url} failed: {e}")
+            return False
+
+    async def close(self) -> None:
+        """Close the HTTP session of the running event loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+def default_download_root() -> Path:
+    return config.workspace_root / "downloads"
+
+
+_download_manager: Optional[DownloadManager] = None
+
+
+def get_download_manager() -> DownloadManager:
+    """Returns the process-wide download manager for workspace/downloads."""
+    global _download_manager
+    if _download_manager is None:
+        _download_manager = DownloadManager(DownloadStore(default_download_root() / ".store"))
+    return _download_manager
+
+
+async def close_download_manager() -> None:
+    """Closes the HTTP session of the process-wide download manager, if one was created."""
+    if _download_manager is not None:
+        await _download_manager.close()
+
+
 class DownloadFile(BaseTool):
     name: str = "download_file"
     description: str = (
@@ -29,9 +570,38 @@ class DownloadFile(BaseTool):
                 "description": "Optional: The filename to save the file as. "
                                "If not provided, the filename will be extracted from the URL.",
             },
+            "sha256": {
+                "type": "string",
+                "description": "Optional: Expected SHA-256 checksum of the file.",
+            },
         },
         "required": ["url"],
     }
+    parallel_safe: bool = True
+    max_concurrency: int = 4
+
+    # Directory downloads are saved under (one subdirectory per day); None for workspace/downloads
+    download_root: Optional[Path] = None
+    max_segments: int = Field(default=MAX_SEGMENTS, description="Maximum parallel segments per file")
+    segment_min_size: int = Field(
+        default=SEGMENT_MIN_SIZE, description="Minimum file size for segmented downloads"
+    )
+    _manager: Optional[DownloadManager] = PrivateAttr(default=None)
+
+    @property
+    def manager(self) -> DownloadManager:
+        """Process-wide manager for the default root, a private one for a custom root."""
+        if self._manager is None:
+            if self.download_root is None:
+                self._manager = get_download_manager()
+            else:
+                self._manager = DownloadManager(DownloadStore(Path(self.download_root) / ".store"))
+        return self._manager
+
+    def get_download_dir(self) -> Path:
+        root = Path(self.download_root) if self.download_root is not None else default_download_root()
+        today_str = date.today().isoformat()          # e.g., "2025-04-10"
+        return root / today_str
 
     async def execute(self, **kwargs) -> ToolResult:
         url: Optional[str] = kwargs.get("url")
@@ -43,41 +613,31 @@ class DownloadFile(BaseTool):
             filename = os.path.basename(url) or "downloaded_file"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return ToolResult(
-                            error=f"Failed to download file. HTTP status code: {response.status}"
-                        )
-
-                    file_data = await response.read()
-
-                    # Construct download path based on script's location
-                    script_dir = Path(__file__).resolve().parent  # -> app/tool
-                    project_root = script_dir.parents[2]          # -> project root
-                    today_str = date.today().isoformat()          # e.g., "2025-04-10"
-                    download_dir = project_root / "open_manus" / "workspace" / "downloads" / today_str
-
-                    # Create the directory if it doesn't exist
-                    if not download_dir.exists():
-                        print(f"Creating directory: {download_dir}")
-                        download_dir.mkdir(parents=True, exist_ok=True)
-
-                    save_path = download_dir / filename
-
-                    # Save the file
-                    with save_path.open("wb") as f:
-                        f.write(file_data)
-
-                    print(f"✅ File downloaded and saved to: {save_path.resolve()}")
-
-                    return ToolResult(
-                        output=(
-                            f"✅ Download successful!\n"
-                            f"📄 File name: {filename}\n"
-                            f"📁 Saved at: {save_path.resolve()}"
-                        )
-                    )
+            stored = await self.manager.fetch(
+                url, max_segments=self.max_segments, segment_min_size=self.segment_min_size
+            )
+            expected_sha256 = kwargs.get("sha256")
+            if expected_sha256 and stored.sha256 != expected_sha256.lower():
+                return ToolResult(
+                    error=f"Error downloading file: Checksum mismatch: expected sha256 "
+                    f"{expected_sha256}, got {stored.sha256}"
+                )
+
+            save_path = self.get_download_dir() / filename
+            await asyncio.to_thread(DownloadStore.materialize, stored.path, save_path)
+
+            logger.info(f"✅ File downloaded and saved to: {save_path.resolve()}")
+
+            return ToolResult(
+                output=(
+                    f"✅ Download successful!{' (reused previous download)' if stored.reused else ''}\n"
+                    f"📄 File name: {filename}\n"
+                    f"📁 Saved at: {save_path.resolve()}\n"
+                    f"🔒 Size: {stored.size} bytes, SHA-256: {stored.sha256}"
+                )
+            )
 
+        except ToolError as e:
+            return ToolResult(error=f"Error downloading file: {e.message}")
         except Exception as e:
             return ToolResult(error=f"Error downloading file: {str(e)}")
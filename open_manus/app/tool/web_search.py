@@ -1,7 +1,13 @@
 import asyncio
+import hashlib
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
 
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -15,8 +21,10 @@ from open_manus.app.tool.search import (
     DuckDuckGoSearchEngine,
     GoogleSearchEngine,
     WebSearchEngine,
+    get_engine_health_tracker,
 )
 from open_manus.app.tool.search.base import SearchItem
+from open_manus.app.tool.search.cache import get_search_cache
 
 
 class SearchResult(BaseModel):
@@ -103,11 +111,80 @@ class SearchResponse(ToolResult):
         return self
 
 
+@dataclass
+class CachedPage:
+    """Cache entry for a fetched URL."""
+
+    content_hash: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
 class WebContentFetcher:
-    """Utility class for fetching web content."""
+    """Utility class for fetching web content.
 
-    @staticmethod
-    async def fetch_content(url: str, timeout: int = 10) -> Optional[str]:
+    Pages are fetched with a pooled aiohttp session (one per event loop) that
+    limits connections per host. Extracted text is cached by URL for ttl
+    seconds; after that the entry is revalidated with ETag / Last-Modified, so
+    an unchanged page costs a 304 instead of a download and a re-parse.
+
+    Extracted text is stored content-addressed (by hash of the response body),
+    so mirrors and unchanged pages served without validators are parsed once.
+    """
+
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+    ):
+        """
+        Args:
+            ttl: Seconds a cached page is served without revalidation
+            max_entries: Maximum number of cached URLs
+            max_connections: Total connection limit of the HTTP pool
+            max_per_host: Connection limit per host
+        """
+        settings = config.search_config
+        self.ttl = ttl if ttl is not None else getattr(settings, "fetch_cache_ttl", 600)
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else getattr(settings, "fetch_cache_size", 256)
+        )
+        self.max_connections = max_connections or getattr(
+            settings, "fetch_max_connections", 32
+        )
+        self.max_per_host = max_per_host or getattr(
+            settings, "fetch_max_per_host", 4
+        )
+
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._texts: Dict[str, Optional[str]] = {}
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "errors": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections, limit_per_host=self.max_per_host
+                ),
+                headers={"User-Agent": self.USER_AGENT},
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def fetch_content(self, url: str, timeout: int = 10) -> Optional[str]:
         """
         Fetch and extract the main content from a webpage.
 
@@ -118,39 +195,115 @@ class WebContentFetcher:
         Returns:
             Extracted text content or None if fetching fails
         """
-        headers = {
-            "WebSearch": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        now = time.time()
+        cached = self._pages.get(url)
+        if cached is not None:
+            self._pages.move_to_end(url)
+            if now - cached.fetched_at < self.ttl:
+                self.stats["hits"] += 1
+                return self._texts.get(cached.content_hash)
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
 
         try:
-            # Use asyncio to run requests in a thread pool
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: requests.get(url, headers=headers, timeout=timeout)
-            )
+            async with self._get_session().get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                if response.status == 304 and cached is not None:
+                    cached.fetched_at = now
+                    self.stats["revalidated"] += 1
+                    return self._texts.get(cached.content_hash)
+
+                if response.status != 200:
+                    logger.warning(
+                        f"Failed to fetch content from {url}: HTTP {response.status}"
+                    )
+                    self.stats["errors"] += 1
+                    return None
+
+                body = await response.read()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                encoding = response.get_encoding()
 
-            if response.status_code != 200:
-                logger.warning(
-                    f"Failed to fetch content from {url}: HTTP {response.status_code}"
-                )
-                return None
+        except Exception as e:
+            logger.warning(f"Error fetching content from {url}: {e}")
+            self.stats["errors"] += 1
+            return None
 
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(response.text, "html.parser")
+        self.stats["misses"] += 1
+        content_hash = hashlib.sha256(body).hexdigest()
+        if content_hash not in self._texts:
+            html = body.decode(encoding, errors="replace")
+            self._texts[content_hash] = await asyncio.to_thread(self.extract_text, html)
+        self._store(url, CachedPage(content_hash, now, etag, last_modified))
+        return self._texts[content_hash]
 
-            # Remove script and style elements
-            for script in soup(["script", "style", "header", "footer", "nav"]):
-                script.extract()
+    @staticmethod
+    def extract_text(html: str) -> Optional[str]:
+        """Extract readable text from an HTML document."""
+        # Parse HTML with BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
 
-            # Get text content
-            text = soup.get_text(separator="\n", strip=True)
+        # Remove script and style elements
+        for script in soup(["script", "style", "header", "footer", "nav"]):
+            script.extract()
 
-            # Clean up whitespace and limit size (100KB max)
-            text = " ".join(text.split())
-            return text[:10000] if text else None
+        # Get text content
+        text = soup.get_text(separator="\n", strip=True)
 
-        except Exception as e:
-            logger.warning(f"Error fetching content from {url}: {e}")
-            return None
+        # Clean up whitespace and limit size (100KB max)
+        text = " ".join(text.split())
+        return text[:10000] if text else None
+
+    def _store(self, url: str, page: CachedPage) -> None:
+        """Store a cache entry, evicting the least recently used URLs."""
+        self._pages[url] = page
+        self._pages.move_to_end(url)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+        # Drop texts no longer referenced by any URL
+        if len(self._texts) > len(self._pages):
+            live = {entry.content_hash for entry in self._pages.values()}
+            for content_hash in list(self._texts):
+                if content_hash not in live:
+                    del self._texts[content_hash]
+
+    def clear_cache(self) -> None:
+        """Remove all cached pages."""
+        self._pages.clear()
+        self._texts.clear()
+
+    async def close(self) -> None:
+        """Close the HTTP session of the running event loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# Shared by all WebSearch instances so the cache survives across agents
+_content_fetcher: Optional[WebContentFetcher] = None
+
+
+def get_content_fetcher() -> WebContentFetcher:
+    """Returns the process-wide web content fetcher."""
+    global _content_fetcher
+    if _content_fetcher is None:
+        _content_fetcher = WebContentFetcher()
+    return _content_fetcher
+
+
+async def close_content_fetcher() -> None:
+    """Closes the HTTP session of the process-wide content fetcher, if one was created."""
+    if _content_fetcher is not None:
+        await _content_fetcher.close()
 
 
 class WebSearch(BaseTool):
@@ -190,13 +343,15 @@ class WebSearch(BaseTool):
         },
         "required": ["query"],
     }
+    parallel_safe: bool = True
+    max_concurrency: int = 3
     _search_engine: dict[str, WebSearchEngine] = {
         "google": GoogleSearchEngine(),
         "baidu": BaiduSearchEngine(),
         "duckduckgo": DuckDuckGoSearchEngine(),
         "bing": BingSearchEngine(),
     }
-    content_fetcher: WebContentFetcher = WebContentFetcher()
+    content_fetcher: WebContentFetcher = Field(default_factory=get_content_fetcher)
 
     async def execute(
         self,
@@ -248,11 +403,40 @@ class WebSearch(BaseTool):
 
         search_params = {"lang": lang, "country": country}
 
+        # Serve repeated queries from the search result cache
+        search_cache = get_search_cache()
+        cache_key = search_cache.make_key(
+            query, self._cache_engine_key(), lang, country, num_results
+        )
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Search results for '{query}' served from cache")
+            results = [SearchResult(**item) for item in cached]
+            if fetch_content:
+                results = await self._fetch_content_for_results(results)
+            return SearchResponse(
+                status="success",
+                query=query,
+                results=results,
+                metadata=SearchMetadata(
+                    total_results=len(results),
+                    language=lang,
+                    country=country,
+                ),
+            )
+
         # Try searching with retries when all engines fail
         for retry_count in range(max_retries + 1):
             results = await self._try_all_engines(query, num_results, search_params)
 
             if results:
+                # Page content is cached by the content fetcher, not with the results
+                search_cache.set(
+                    cache_key,
+                    [result.model_dump(exclude={"raw_content"}) for result in results],
+                )
+                await search_cache.persist()
+
                 # Fetch content if requested
                 if fetch_content:
                     results = await self._fetch_content_for_results(results)
@@ -270,11 +454,17 @@ class WebSearch(BaseTool):
                 )
 
             if retry_count < max_retries:
-                # All engines failed, wait and retry
+                # All engines failed, wait and retry (no longer than until an engine can be probed again)
+                wait = retry_delay
+                open_wait = get_engine_health_tracker().seconds_until_available(
+                    list(self._search_engine)
+                )
+                if open_wait > 0:
+                    wait = min(retry_delay, open_wait)
                 logger.warning(
-                    f"All search engines failed. Waiting {retry_delay} seconds before retry {retry_count + 1}/{max_retries}..."
+                    f"All search engines failed. Waiting {wait:.0f} seconds before retry {retry_count + 1}/{max_retries}..."
                 )
-                await asyncio.sleep(retry_delay)
+                await asyncio.sleep(wait)
             else:
                 logger.error(
                     f"All search engines failed after {max_retries} retries. Giving up."
@@ -290,18 +480,46 @@ class WebSearch(BaseTool):
     async def _try_all_engines(
         self, query: str, num_results: int, search_params: Dict[str, Any]
     ) -> List[SearchResult]:
-        """Try all search engines in the configured order."""
+        """Try all search engines using the configured strategy."""
         engine_order = self._get_engine_order()
+        hedge_mode = (
+            getattr(config.search_config, "hedge_mode", "sequential")
+            if config.search_config
+            else "sequential"
+        )
+        hedge_delay = (
+            getattr(config.search_config, "hedge_delay", 2.0)
+            if config.search_config
+            else 2.0
+        )
+        merge_results = (
+            getattr(config.search_config, "merge_results", False)
+            if config.search_config
+            else False
+        )
+
+        if merge_results:
+            return await self._search_merged(
+                engine_order, query, num_results, search_params
+            )
+        if hedge_mode in ("hedged", "all"):
+            return await self._search_hedged(
+                engine_order,
+                query,
+                num_results,
+                search_params,
+                delay=0 if hedge_mode == "all" else hedge_delay,
+            )
+
         failed_engines = []
 
         for engine_name in engine_order:
-            engine = self._search_engine[engine_name]
-            logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
-            search_items = await self._perform_search_with_engine(
-                engine, query, num_results, search_params
+            search_items = await self._run_engine(
+                engine_name, query, num_results, search_params
             )
 
             if not search_items:
+                failed_engines.append(engine_name)
                 continue
 
             if failed_engines:
@@ -309,23 +527,168 @@ class WebSearch(BaseTool):
                     f"Search successful with {engine_name.capitalize()} after trying: {', '.join(failed_engines)}"
                 )
 
-            # Transform search items into structured results
-            return [
-                SearchResult(
-                    position=i + 1,
-                    url=item.url,
-                    title=item.title
-                    or f"Result {i+1}",  # Ensure we always have a title
-                    description=item.description or "",
-                    source=engine_name,
-                )
-                for i, item in enumerate(search_items)
-            ]
+            return self._to_search_results(engine_name, search_items)
 
         if failed_engines:
             logger.error(f"All search engines failed: {', '.join(failed_engines)}")
         return []
 
+    async def _run_engine(
+        self,
+        engine_name: str,
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+    ) -> List[SearchItem]:
+        """Search with one engine, returning an empty list if it fails or its breaker is open."""
+        health = get_engine_health_tracker()
+        if not health.allow_request(engine_name):
+            logger.info(f"Skipping {engine_name.capitalize()}: circuit breaker open")
+            return []
+
+        engine = self._search_engine[engine_name]
+        logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
+        start = time.monotonic()
+        try:
+            search_items = await self._perform_search_with_engine(
+                engine, query, num_results, search_params
+            )
+        except asyncio.CancelledError:
+            health.release(engine_name)
+            raise
+        except Exception as e:
+            logger.warning(f"{engine_name.capitalize()} search failed: {e}")
+            health.record_failure(engine_name, time.monotonic() - start)
+            return []
+
+        # An empty result set is a valid answer, not an engine failure
+        health.record_success(engine_name, time.monotonic() - start)
+        return search_items
+
+    @staticmethod
+    def get_engine_stats() -> Dict[str, Dict]:
+        """Health statistics per search engine (breaker state, success rate, latency)."""
+        return get_engine_health_tracker().get_stats()
+
+    async def _search_hedged(
+        self,
+        engine_order: List[str],
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+        delay: float,
+    ) -> List[SearchResult]:
+        """
+        Start engines one by one, each after `delay` seconds or as soon as the
+        previous ones have failed, and return the first non-empty result set.
+        Requests still running are cancelled (a search already running in a
+        worker thread finishes in the background and its result is dropped).
+        """
+        pending: Dict[asyncio.Task, str] = {}
+        remaining = list(engine_order)
+        try:
+            while remaining or pending:
+                if remaining:
+                    engine_name = remaining.pop(0)
+                    task = asyncio.create_task(
+                        self._run_engine(engine_name, query, num_results, search_params)
+                    )
+                    pending[task] = engine_name
+                    if remaining and delay > 0:
+                        # Give the running engines a head start before hedging
+                        done, _ = await asyncio.wait(
+                            pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                        )
+                    elif remaining:
+                        continue
+                    else:
+                        done, _ = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                for task in done:
+                    engine_name = pending.pop(task)
+                    search_items = task.result()
+                    if search_items:
+                        logger.info(f"Hedged search won by {engine_name.capitalize()}")
+                        return self._to_search_results(engine_name, search_items)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        logger.error(f"All search engines failed: {', '.join(engine_order)}")
+        return []
+
+    async def _search_merged(
+        self,
+        engine_order: List[str],
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+    ) -> List[SearchResult]:
+        """Query all engines concurrently and merge results, de-duplicated by URL."""
+        all_items = await asyncio.gather(
+            *(
+                self._run_engine(engine_name, query, num_results, search_params)
+                for engine_name in engine_order
+            )
+        )
+
+        # Interleave results by rank so every engine contributes its best hits first
+        merged: List[SearchResult] = []
+        seen = set()
+        for rank in range(max((len(items) for items in all_items), default=0)):
+            for engine_name, items in zip(engine_order, all_items):
+                if rank >= len(items):
+                    continue
+                item = items[rank]
+                key = self._normalize_url(item.url)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                merged.extend(self._to_search_results(engine_name, [item]))
+
+        merged = merged[:num_results]
+        for position, result in enumerate(merged, 1):
+            result.position = position
+        if not merged:
+            logger.error(f"All search engines failed: {', '.join(engine_order)}")
+        return merged
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Normalize a URL for de-duplication (case-insensitive host, no fragment or trailing slash)."""
+        if not url:
+            return ""
+        parts = urlsplit(url.strip())
+        host = parts.netloc.lower()
+        if host.startswith("www."):
+            host = host[4:]
+        return urlunsplit(
+            (parts.scheme.lower(), host, parts.path.rstrip("/"), parts.query, "")
+        )
+
+    @staticmethod
+    def _to_search_results(
+        engine_name: str, search_items: List[SearchItem]
+    ) -> List[SearchResult]:
+        """Transform search items into structured results."""
+        return [
+            SearchResult(
+                position=i + 1,
+                url=item.url,
+                title=item.title
+                or f"Result {i+1}",  # Ensure we always have a title
+                description=item.description or "",
+                source=engine_name,
+            )
+            for i, item in enumerate(search_items)
+        ]
+
     async def _fetch_content_for_results(
         self, results: List[SearchResult]
     ) -> List[SearchResult]:
@@ -357,6 +720,21 @@ class WebSearch(BaseTool):
                 result.raw_content = content
         return result
 
+    @staticmethod
+    def _cache_engine_key() -> str:
+        """Engine part of the search cache key: the preferred engine and merge mode."""
+        preferred = (
+            getattr(config.search_config, "engine", "google").lower()
+            if config.search_config
+            else "google"
+        )
+        merge_results = (
+            getattr(config.search_config, "merge_results", False)
+            if config.search_config
+            else False
+        )
+        return f"{preferred}+merged" if merge_results else preferred
+
     def _get_engine_order(self) -> List[str]:
         """Determines the order in which to try search engines."""
         preferred = (
@@ -382,7 +760,8 @@ class WebSearch(BaseTool):
         )
         engine_order.extend([e for e in self._search_engine if e not in engine_order])
 
-        return engine_order
+        # Healthy engines first, engines with an open breaker last
+        return get_engine_health_tracker().rank(engine_order)
 
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10)
@@ -2,6 +2,9 @@ import asyncio
 
 from open_manus.app.agent.manus import Manus
 from open_manus.app.logger import logger
+from open_manus.app.sandbox.client import SANDBOX_CLIENT
+from open_manus.app.tool.tool_download_file import close_download_manager
+from open_manus.app.tool.web_search import close_content_fetcher
 
  
 async def main():
@@ -20,6 +23,9 @@ async def main():
     finally:
         # Ensure agent resources are cleaned up before exiting
         await agent.cleanup()
+        await SANDBOX_CLIENT.shutdown()
+        await close_download_manager()
+        await close_content_fetcher()
 
 
 if __name__ == "__main__":
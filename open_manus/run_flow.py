@@ -4,6 +4,9 @@ import time
 from open_manus.app.agent.manus import Manus
 from open_manus.app.flow.flow_factory import FlowFactory, FlowType
 from open_manus.app.logger import logger
+from open_manus.app.sandbox.client import SANDBOX_CLIENT
+from open_manus.app.tool.tool_download_file import close_download_manager
+from open_manus.app.tool.web_search import close_content_fetcher
 
 
 async def run_flow():
@@ -21,6 +24,7 @@ async def run_flow():
         flow = FlowFactory.create_flow(
             flow_type=FlowType.PLANNING,
             agents=agents,
+            executor_factory=Manus,  # extra executors for steps that can run in parallel
         )
         logger.warning("Processing your request...")
 
@@ -43,6 +47,10 @@ async def run_flow():
         logger.info("Operation cancelled by user.")
     except Exception as e:
         logger.error(f"Error: {str(e)}")
+    finally:
+        await SANDBOX_CLIENT.shutdown()
+        await close_download_manager()
+        await close_content_fetcher()
 
 
 if __name__ == "__main__":
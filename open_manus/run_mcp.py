@@ -6,6 +6,9 @@ import sys
 from open_manus.app.agent.mcp import MCPAgent
 from open_manus.app.config import config
 from open_manus.app.logger import logger
+from open_manus.app.sandbox.client import SANDBOX_CLIENT
+from open_manus.app.tool.tool_download_file import close_download_manager
+from open_manus.app.tool.web_search import close_content_fetcher
 
 
 class MCPRunner:
@@ -63,6 +66,9 @@ class MCPRunner:
     async def cleanup(self) -> None:
         """Clean up agent resources."""
         await self.agent.cleanup()
+        await SANDBOX_CLIENT.shutdown()
+        await close_download_manager()
+        await close_content_fetcher()
         logger.info("Session ended")
 
 
@@ -0,0 +1,165 @@
+import asyncio
+import re
+from typing import List, Optional, Tuple
+
+import pytest
+from pydantic import Field
+
+from open_manus.app.agent.base import BaseAgent
+from open_manus.app.exceptions import ToolError
+from open_manus.app.flow.planning import PlanningFlow, PlanStepStatus
+from open_manus.app.schema import AgentState
+from open_manus.app.tool import PlanningTool
+
+
+class StepLog:
+    """Records when steps start and end, and the peak number running at once."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, int]] = []
+        self.running = 0
+        self.peak = 0
+
+    def index_of(self, event: str, step: int) -> int:
+        return self.events.index((event, step))
+
+
+class StubExecutor(BaseAgent):
+    """Executor that sleeps instead of calling the LLM and logs its steps."""
+
+    name: str = "stub"
+    log: StepLog = Field(default_factory=StepLog)
+    delay: float = 0.05
+    fail_steps: List[int] = Field(default_factory=list)
+    max_steps: int = 1
+
+    async def step(self) -> str:
+        prompt = self.memory.messages[-1].content
+        index = int(re.search(r"working on step (\d+)", prompt).group(1))
+        self.log.events.append(("start", index))
+        self.log.running += 1
+        self.log.peak = max(self.log.peak, self.log.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if index in self.fail_steps:
+                raise RuntimeError(f"step {index} failed")
+        finally:
+            self.log.running -= 1
+            self.log.events.append(("end", index))
+        self.state = AgentState.FINISHED
+        return f"done {index}"
+
+
+async def make_flow(
+    steps: List[str],
+    dependencies: Optional[List[List[int]]] = None,
+    max_parallel_steps: int = 4,
+    fail_steps: Optional[List[int]] = None,
+) -> Tuple[PlanningFlow, StepLog]:
+    """Creates a flow with a ready plan and a factory of stub executors sharing one log."""
+    log = StepLog()
+
+    def factory() -> StubExecutor:
+        return StubExecutor(log=log, fail_steps=fail_steps or [])
+
+    flow = PlanningFlow(
+        {"stub": factory()},
+        executor_factory=factory,
+        max_parallel_steps=max_parallel_steps,
+        plan_id="plan_test",
+    )
+    await flow.planning_tool.execute(
+        command="create",
+        plan_id="plan_test",
+        title="Test plan",
+        steps=steps,
+        step_dependencies=dependencies,
+    )
+    return flow, log
+
+
+def statuses(flow: PlanningFlow) -> List[str]:
+    return flow.planning_tool.plans[flow.active_plan_id]["step_statuses"]
+
+
+@pytest.mark.asyncio
+async def test_ready_steps_follow_dependencies():
+    """Tests that independent steps start together and dependents wait for them."""
+    flow, log = await make_flow(
+        ["search A", "search B", "compare", "report"], [[], [], [0, 1], [2]]
+    )
+
+    results = await flow._execute_ready_steps()
+
+    assert sorted(results) == [0, 1, 2, 3]
+    assert set(log.events[:2]) == {("start", 0), ("start", 1)}
+    assert log.index_of("start", 2) > max(log.index_of("end", 0), log.index_of("end", 1))
+    assert log.index_of("start", 3) > log.index_of("end", 2)
+    assert statuses(flow) == [PlanStepStatus.COMPLETED.value] * 4
+
+
+@pytest.mark.asyncio
+async def test_sequential_plan_runs_one_step_at_a_time():
+    """Tests that a plan without dependencies runs its steps in order."""
+    flow, log = await make_flow(["first", "second", "third"])
+
+    await flow._execute_ready_steps()
+
+    assert [step for event, step in log.events if event == "start"] == [0, 1, 2]
+    assert log.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_max_parallel_steps_limit():
+    """Tests that no more than max_parallel_steps steps run at once."""
+    flow, log = await make_flow(
+        [f"download {i}" for i in range(5)], [[] for _ in range(5)], max_parallel_steps=2
+    )
+
+    results = await flow._execute_ready_steps()
+
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert log.peak == 2
+    assert len(flow.agents) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_step_blocks_dependents():
+    """Tests that a failing step is blocked and its dependents never start."""
+    flow, log = await make_flow(
+        ["fetch", "parse", "independent"], [[], [0], []], fail_steps=[0]
+    )
+
+    results = await flow._execute_ready_steps()
+
+    assert sorted(results) == [0, 2]
+    assert ("start", 1) not in log.events
+    assert statuses(flow) == [
+        PlanStepStatus.BLOCKED.value,
+        PlanStepStatus.NOT_STARTED.value,
+        PlanStepStatus.COMPLETED.value,
+    ]
+
+
+@pytest.mark.parametrize(
+    "dependencies, message",
+    [
+        ([[], [1]], "only depend on earlier steps"),  # self-loop
+        ([[1], [0]], "only depend on earlier steps"),  # cycle
+        ([[], [5]], "only depend on earlier steps"),  # unknown step
+        ([[], [-1]], "only depend on earlier steps"),  # negative index
+        ([[]], "one list of step indices per step"),  # wrong length
+        ([[], ["0"]], "must be a list of step indices"),  # wrong type
+    ],
+)
+@pytest.mark.asyncio
+async def test_invalid_dependencies_are_rejected(dependencies, message):
+    """Tests that plans with cyclic or unknown dependencies are rejected."""
+    with pytest.raises(ToolError, match=message):
+        await PlanningTool().execute(
+            command="create",
+            plan_id="plan_invalid",
+            title="Invalid plan",
+            steps=["a", "b"],
+            step_dependencies=dependencies,
+        )
@@ -1,10 +1,14 @@
 """Tests for the AsyncDockerizedTerminal implementation."""
 
+import socket
+import subprocess
+import time
+
 import docker
 import pytest
 import pytest_asyncio
 
-from open_manus.app.sandbox.core.terminal import AsyncDockerizedTerminal
+from open_manus.app.sandbox.core.terminal import AsyncDockerizedTerminal, DockerSession
 
 
 @pytest.fixture(scope="module")
@@ -93,6 +97,62 @@ class TestAsyncDockerizedTerminal:
         assert terminal.session is not None
 
 
+
+@pytest_asyncio.fixture
+async def local_session():
+    """Fixture providing a DockerSession attached to a local bash over a socket pair."""
+    ours, theirs = socket.socketpair()
+    shell = subprocess.Popen(
+        ["bash", "--norc", "--noprofile", "--noediting"],
+        stdin=theirs,
+        stdout=theirs,
+        stderr=theirs,
+    )
+    theirs.close()
+    ours.setblocking(False)
+    session = DockerSession("local", api=object())
+    session.socket = ours
+    await session._run("true")
+    yield session
+    shell.kill()
+    shell.wait()
+    ours.close()
+
+
+class TestDockerSessionFraming:
+    """Test cases for the sentinel framing of DockerSession (no Docker needed)."""
+
+    @pytest.mark.asyncio
+    async def test_output_and_exit_code(self, local_session):
+        """Test that output is returned verbatim with the exit code."""
+        result = await local_session.execute("printf 'a\\n\\nb'; false")
+        assert result == "a\n\nb"
+        assert local_session.last_exit_code == 1
+
+        assert await local_session.execute("echo $?") == "0"
+
+    @pytest.mark.asyncio
+    async def test_short_commands_do_not_poll(self, local_session):
+        """Test that short commands complete without a polling delay."""
+        start = time.perf_counter()
+        for i in range(20):
+            assert await local_session.execute(f"echo {i}") == str(i)
+        assert time.perf_counter() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_large_output(self, local_session):
+        """Test that large outputs are read completely."""
+        result = await local_session.execute("head -c 5000000 /dev/zero | tr '\\0' x")
+        assert len(result) == 5_000_000
+
+    @pytest.mark.asyncio
+    async def test_output_after_timeout_is_discarded(self, local_session):
+        """Test that late output of a timed-out command does not leak."""
+        with pytest.raises(TimeoutError):
+            await local_session.execute("sleep 0.5; echo late", timeout=0.1)
+        assert await local_session.execute("echo next") == "next"
+
+
 # Configure pytest-asyncio
 def pytest_configure(config):
     """Configure pytest-asyncio."""
@@ -0,0 +1,331 @@
+"""Tests for streaming archive transfers of DockerSandbox against a fake container."""
+
+import io
+import os
+import subprocess
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator
+
+import pytest
+from docker.errors import NotFound
+
+from open_manus.app.sandbox.core.sandbox import DockerSandbox, _ChunkReader, _iter_tar
+
+
+class FakeContainer:
+    """Container stand-in whose filesystem is a host directory."""
+
+    id = "fake"
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.uploads = 0
+
+    def _host(self, path: str) -> Path:
+        return self.root / path.lstrip("/")
+
+    def put_archive(self, path: str, data: Iterator[bytes]) -> bool:
+        self.uploads += 1
+        archive = io.BytesIO(b"".join(data))
+        with tarfile.open(fileobj=archive) as tar:
+            tar.extractall(self._host(path), filter="data")
+        return True
+
+    def get_archive(self, path: str, chunk_size: int = 2097152):
+        host = self._host(path)
+        if not host.exists():
+            raise NotFound(f"No such container:path: {path}")
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            tar.add(host, arcname=host.name)
+        data = archive.getvalue()
+        chunks = (data[i : i + 1000] for i in range(0, len(data), 1000))
+        return chunks, {"name": host.name}
+
+
+class FakeAPI:
+    """Low-level API stand-in running exec commands on the host, relative to the root."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.execs: Dict[str, subprocess.Popen] = {}
+
+    def exec_create(self, container_id, cmd, stdout=True, stderr=True) -> dict:
+        assert cmd[:5] == ["tar", "-cf", "-", "-C", "/"]
+        cmd = cmd[:4] + [str(self.root)] + cmd[5:]
+        exec_id = str(len(self.execs))
+        self.execs[exec_id] = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, stream=True, demux=True):
+        process = self.execs[exec_id]
+        while chunk := process.stdout.read(4096):
+            yield chunk, None
+        yield None, process.stderr.read()
+
+    def exec_inspect(self, exec_id) -> dict:
+        return {"ExitCode": self.execs[exec_id].wait()}
+
+
+class FakeClient:
+    def __init__(self, root: Path):
+        self.api = FakeAPI(root)
+
+
+@pytest.fixture
+def dirs():
+    """Provides a fake container root and a host directory."""
+    with tempfile.TemporaryDirectory() as container_root, tempfile.TemporaryDirectory() as host:
+        yield Path(container_root), Path(host)
+
+
+@pytest.fixture
+def sandbox(dirs) -> DockerSandbox:
+    """Creates a sandbox attached to a fake container."""
+    container_root, _ = dirs
+    sandbox = DockerSandbox(client=FakeClient(container_root))
+    sandbox.container = FakeContainer(container_root)
+    return sandbox
+
+
+def test_iter_tar_round_trip(dirs):
+    """Tests that the generated archive is a valid tar with all contents."""
+    _, host = dirs
+    (host / "big.bin").write_bytes(os.urandom(3_000_001))
+    (host / "empty.txt").write_bytes(b"")
+
+    data = b"".join(
+        _iter_tar([(str(host / "big.bin"), "a/big.bin"), (str(host / "empty.txt"), "a/empty.txt")])
+    )
+    with tarfile.open(fileobj=_ChunkReader([data[:700], data[700:]]), mode="r|") as tar:
+        contents = {member.name: tar.extractfile(member).read() for member in tar}
+
+    assert contents["a/big.bin"] == (host / "big.bin").read_bytes()
+    assert contents["a/empty.txt"] == b""
+
+
+@pytest.mark.asyncio
+async def test_copy_to_file_and_directory(sandbox, dirs):
+    """Tests uploading a file and a directory tree."""
+    container_root, host = dirs
+    (host / "report.txt").write_text("annual report")
+    (host / "filings" / "2024").mkdir(parents=True)
+    (host / "filings" / "2024" / "10k.txt").write_text("10-K")
+    (host / "filings" / "empty").mkdir()
+
+    await sandbox.copy_to(str(host / "report.txt"), "docs/report.txt")
+    await sandbox.copy_to(str(host / "filings"), "/data/filings")
+
+    assert (container_root / "workspace/docs/report.txt").read_text() == "annual report"
+    assert (container_root / "data/filings/2024/10k.txt").read_text() == "10-K"
+    assert (container_root / "data/filings/empty").is_dir()
+
+
+@pytest.mark.asyncio
+async def test_copy_to_many_uses_one_upload(sandbox, dirs):
+    """Tests that a batch upload is a single archive round-trip."""
+    container_root, host = dirs
+    files = {}
+    for i in range(5):
+        (host / f"f{i}.txt").write_text(str(i))
+        files[str(host / f"f{i}.txt")] = f"batch/f{i}.txt"
+
+    await sandbox.copy_to_many(files)
+
+    assert sandbox.container.uploads == 1
+    assert (container_root / "workspace/batch/f3.txt").read_text() == "3"
+
+
+@pytest.mark.asyncio
+async def test_copy_to_missing_source(sandbox, dirs):
+    """Tests that a missing host file is reported."""
+    _, host = dirs
+    with pytest.raises(FileNotFoundError):
+        await sandbox.copy_to(str(host / "missing.txt"), "missing.txt")
+
+
+@pytest.mark.asyncio
+async def test_copy_from_file_and_directory(sandbox, dirs):
+    """Tests streaming a file and a directory out of the container."""
+    container_root, host = dirs
+    (container_root / "workspace/out/sub").mkdir(parents=True)
+    (container_root / "workspace/out/result.csv").write_text("a,b")
+    (container_root / "workspace/out/sub/log.txt").write_text("done")
+
+    await sandbox.copy_from("out/result.csv", str(host / "copy/result.csv"))
+    (host / "tree").mkdir()
+    await sandbox.copy_from("out", str(host / "tree"))
+
+    assert (host / "copy/result.csv").read_text() == "a,b"
+    assert (host / "tree/out/sub/log.txt").read_text() == "done"
+
+
+@pytest.mark.asyncio
+async def test_copy_from_directory_to_file_fails(sandbox, dirs):
+    """Tests that a directory cannot be copied onto a file path."""
+    container_root, host = dirs
+    (container_root / "workspace/out").mkdir(parents=True)
+    (container_root / "workspace/out/a.txt").write_text("a")
+
+    with pytest.raises(RuntimeError, match="destination is a file"):
+        await sandbox.copy_from("out", str(host / "a.txt"))
+
+
+@pytest.mark.asyncio
+async def test_copy_from_missing(sandbox, dirs):
+    """Tests that a missing container file is reported."""
+    _, host = dirs
+    with pytest.raises(FileNotFoundError):
+        await sandbox.copy_from("missing.txt", str(host / "missing.txt"))
+
+
+@pytest.mark.asyncio
+async def test_copy_from_many(sandbox, dirs):
+    """Tests downloading several paths in one archive."""
+    container_root, host = dirs
+    (container_root / "workspace/filings").mkdir(parents=True)
+    (container_root / "workspace/filings/a.txt").write_text("A")
+    (container_root / "workspace/summary.md").write_text("# Summary")
+
+    await sandbox.copy_from_many(
+        {"filings": str(host / "all_filings"), "/workspace/summary.md": str(host / "s.md")}
+    )
+
+    assert (host / "all_filings/a.txt").read_text() == "A"
+    assert (host / "s.md").read_text() == "# Summary"
+    assert len(sandbox.client.api.execs) == 1
+
+
+@pytest.mark.asyncio
+async def test_copy_from_many_missing(sandbox, dirs):
+    """Tests that missing sources of a batch download are reported."""
+    container_root, host = dirs
+    (container_root / "workspace").mkdir()
+    (container_root / "workspace/a.txt").write_text("A")
+
+    with pytest.raises(FileNotFoundError, match="/workspace/missing.txt"):
+        await sandbox.copy_from_many(
+            {"a.txt": str(host / "a.txt"), "missing.txt": str(host / "m.txt")}
+        )
+    assert (host / "a.txt").read_text() == "A"
+
+
+@pytest.mark.asyncio
+async def test_write_and_read_files(sandbox, dirs):
+    """Tests batch writes and reads of in-memory contents."""
+    container_root, _ = dirs
+
+    await sandbox.write_files({"src/a.py": "print('a')", "/etc/app.conf": b"debug=1"})
+    contents = await sandbox.read_files(["src/a.py", "/etc/app.conf"])
+
+    assert sandbox.container.uploads == 1
+    assert len(sandbox.client.api.execs) == 1
+    assert (container_root / "workspace/src/a.py").read_text() == "print('a')"
+    assert contents == {"src/a.py": b"print('a')", "/etc/app.conf": b"debug=1"}
+
+
+@pytest.mark.asyncio
+async def test_read_files_rejects_directories(sandbox, dirs):
+    """Tests that reading a directory fails."""
+    container_root, _ = dirs
+    (container_root / "workspace/src").mkdir(parents=True)
+
+    with pytest.raises(IsADirectoryError):
+        await sandbox.read_files(["src"])
+
+
+@pytest.mark.asyncio
+async def test_copy_from_hard_links(sandbox, dirs):
+    """Tests that hard-linked files are extracted as copies of their target."""
+    container_root, host = dirs
+    (container_root / "workspace/out").mkdir(parents=True)
+    (container_root / "workspace/out/data.csv").write_text("a,b")
+    os.link(container_root / "workspace/out/data.csv", container_root / "workspace/out/link.csv")
+
+    (host / "tree").mkdir()
+    await sandbox.copy_from("out", str(host / "tree"))
+    await sandbox.copy_from_many({"out": str(host / "many")})
+
+    for root in (host / "tree/out", host / "many"):
+        assert (root / "data.csv").read_text() == "a,b"
+        assert (root / "link.csv").read_text() == "a,b"
+        assert (root / "data.csv").stat().st_ino != (root / "link.csv").stat().st_ino
+
+
+@pytest.mark.asyncio
+async def test_copy_from_rejects_unsupported_types(sandbox, dirs):
+    """Tests that special files fail the copy instead of being skipped."""
+    container_root, host = dirs
+    (container_root / "workspace/out").mkdir(parents=True)
+    os.mkfifo(container_root / "workspace/out/pipe")
+
+    with pytest.raises(RuntimeError, match="Unsupported file type"):
+        await sandbox.copy_from_many({"out": str(host / "out")})
+
+
+@pytest.mark.asyncio
+async def test_read_files_follows_symlinks(sandbox, dirs):
+    """Tests that reading a symlink returns its target's content, like read_file."""
+    container_root, _ = dirs
+    (container_root / "workspace").mkdir()
+    (container_root / "workspace/config.yaml").write_text("debug: true")
+    os.symlink("config.yaml", container_root / "workspace/current.yaml")
+
+    assert await sandbox.read_files(["current.yaml"]) == {"current.yaml": b"debug: true"}
+    assert await sandbox.read_files(["config.yaml", "current.yaml"]) == {
+        "config.yaml": b"debug: true",
+        "current.yaml": b"debug: true",
+    }
+
+
+@pytest.mark.asyncio
+async def test_copy_from_keeps_absolute_symlinks(sandbox, dirs):
+    """Tests that symlinks pointing anywhere, like a venv interpreter, are kept."""
+    container_root, host = dirs
+    (container_root / "workspace/venv/bin").mkdir(parents=True)
+    os.symlink("/usr/bin/python3", container_root / "workspace/venv/bin/python")
+    os.symlink("../lib", container_root / "workspace/venv/bin/lib")
+
+    (host / "tree").mkdir()
+    await sandbox.copy_from("venv", str(host / "tree"))
+    await sandbox.copy_from_many({"venv": str(host / "many")})
+
+    for root in (host / "tree/venv", host / "many"):
+        assert os.readlink(root / "bin/python") == "/usr/bin/python3"
+        assert os.readlink(root / "bin/lib") == "../lib"
+
+
+@pytest.mark.asyncio
+async def test_copy_from_rejects_writes_through_escaping_symlink(sandbox, dirs):
+    """Tests that a member below a symlink leading out of the destination is rejected."""
+    _, host = dirs
+    outside = host / "outside"
+    outside.mkdir()
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        directory = tarfile.TarInfo("out")
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        link = tarfile.TarInfo("out/escape")
+        link.type = tarfile.SYMTYPE
+        link.linkname = str(outside)
+        tar.addfile(link)
+        data = b"owned"
+        evil = tarfile.TarInfo("out/escape/evil.txt")
+        evil.size = len(data)
+        tar.addfile(evil, io.BytesIO(data))
+    sandbox.container.get_archive = lambda path, chunk_size=0: (
+        iter([archive.getvalue()]),
+        {"name": "out"},
+    )
+
+    (host / "tree").mkdir()
+    with pytest.raises(RuntimeError, match="Unsafe path"):
+        await sandbox.copy_from("out", str(host / "tree"))
+
+    assert not (outside / "evil.txt").exists()
+    assert os.readlink(host / "tree/out/escape") == str(outside)
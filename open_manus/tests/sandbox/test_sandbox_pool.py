@@ -0,0 +1,304 @@
+import asyncio
+from typing import AsyncGenerator, Dict, List, Optional
+
+import pytest
+import pytest_asyncio
+
+from open_manus.app.config import SandboxSettings
+from open_manus.app.sandbox.client import LocalSandboxClient
+from open_manus.app.sandbox.core.manager import SandboxManager
+
+
+class FakeImages:
+    def get(self, name: str) -> dict:
+        return {"name": name}
+
+
+class FakeDockerClient:
+    """Docker client stand-in that only knows about local images."""
+
+    def __init__(self):
+        self.images = FakeImages()
+
+
+class FakeSandbox:
+    """Sandbox stand-in recording the commands it receives."""
+
+    instances: List["FakeSandbox"] = []
+
+    def __init__(
+        self,
+        config: Optional[SandboxSettings] = None,
+        volume_bindings: Optional[Dict[str, str]] = None,
+    ):
+        self.config = config or SandboxSettings()
+        self.volume_bindings = volume_bindings or {}
+        self.commands: List[str] = []
+        self.healthy = True
+        self.reset_fails = False
+        self.resets = 0
+        self.cleaned_up = False
+        FakeSandbox.instances.append(self)
+
+    async def create(self) -> "FakeSandbox":
+        await asyncio.sleep(0.05)  # container startup
+        return self
+
+    async def run_command(self, cmd: str, timeout: Optional[int] = None) -> str:
+        self.commands.append(cmd)
+        if not self.healthy:
+            raise RuntimeError("container is not running")
+        return "ok\n" if cmd.startswith("echo") else ""
+
+    async def reset(self) -> None:
+        if not self.healthy or self.reset_fails:
+            raise RuntimeError("container is not running")
+        self.resets += 1
+
+    async def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+@pytest_asyncio.fixture(scope="function")
+async def manager() -> AsyncGenerator[SandboxManager, None]:
+    """Creates a pooled sandbox manager backed by fake sandboxes."""
+    FakeSandbox.instances = []
+    manager = SandboxManager(
+        max_sandboxes=4,
+        cleanup_interval=3600,
+        pool_min_size=2,
+        pool_max_size=3,
+        client=FakeDockerClient(),
+        sandbox_factory=FakeSandbox,
+    )
+    try:
+        yield manager
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_prestarts_sandboxes(manager):
+    """Tests that the pool is filled to its minimum size."""
+    await manager.warm_pool()
+
+    assert manager.get_stats()["pool_size"] == 2
+    assert len(FakeSandbox.instances) == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_uses_pool_then_cold_starts(manager):
+    """Tests pool hits and the cold-start fallback when the pool is empty."""
+    await manager.warm_pool()
+
+    ids = [await manager.acquire() for _ in range(3)]
+    stats = manager.get_stats()
+
+    assert stats["pool_hits"] == 2
+    assert stats["cold_starts"] == 1
+    assert stats["acquire_p50_ms"] is not None
+    assert stats["acquire_p99_ms"] >= stats["acquire_p50_ms"]
+    assert all(sandbox_id in manager._sandboxes for sandbox_id in ids)
+
+
+@pytest.mark.asyncio
+async def test_pool_is_refilled_in_background(manager):
+    """Tests that acquiring from the pool triggers a refill."""
+    await manager.warm_pool()
+    await manager.acquire()
+
+    await manager.warm_pool()
+
+    assert manager.get_stats()["pool_size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_non_pool_config_bypasses_pool(manager):
+    """Tests that other configurations and volume bindings start fresh sandboxes."""
+    await manager.warm_pool()
+
+    await manager.acquire(SandboxSettings(image="ubuntu:latest"))
+    await manager.acquire(volume_bindings={"/tmp": "/data"})
+
+    stats = manager.get_stats()
+    assert stats["pool_hits"] == 0
+    assert stats["cold_starts"] == 2
+    assert stats["pool_size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_release_resets_and_returns_to_pool(manager):
+    """Tests that a released sandbox is cleaned and reused."""
+    await manager.warm_pool()
+    sandbox_id = await manager.acquire()
+    sandbox = manager._sandboxes[sandbox_id]
+
+    await manager.release(sandbox_id)
+
+    assert sandbox_id not in manager._sandboxes
+    assert sandbox.resets == 1
+    assert sandbox in manager._pool
+    assert not sandbox.cleaned_up
+
+
+@pytest.mark.asyncio
+async def test_release_recycles_when_reset_fails(manager):
+    """Tests that a sandbox that cannot be reset is destroyed."""
+    await manager.warm_pool()
+    sandbox_id = await manager.acquire()
+    sandbox = manager._sandboxes[sandbox_id]
+    sandbox.reset_fails = True
+
+    await manager.release(sandbox_id)
+
+    assert sandbox.cleaned_up
+    assert sandbox not in manager._pool
+    assert manager.get_stats()["recycled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_release_beyond_max_size_deletes(manager):
+    """Tests that the pool never grows beyond its maximum size."""
+    await manager.warm_pool()
+    ids = [await manager.acquire() for _ in range(4)]
+    await manager.warm_pool()
+
+    for sandbox_id in ids:
+        await manager.release(sandbox_id)
+
+    assert manager.get_stats()["pool_size"] == manager.pool_max_size
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_pooled_sandbox_is_replaced(manager):
+    """Tests that health checks drop dead pooled sandboxes."""
+    await manager.warm_pool()
+    dead = manager._pool[-1]
+    dead.healthy = False
+
+    sandbox_id = await manager.acquire()
+
+    assert manager._sandboxes[sandbox_id] is not dead
+    assert dead.cleaned_up
+    assert manager.get_stats()["unhealthy"] == 1
+
+    await manager.warm_pool()
+    manager._pool[0].healthy = False
+    await manager._check_pool_health()
+    await manager.warm_pool()
+
+    assert all(sandbox.healthy for sandbox in manager._pool)
+    assert manager.get_stats()["pool_size"] == 2
+    assert manager.get_stats()["unhealthy"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cleanup_drains_pool(manager):
+    """Tests that cleanup destroys pooled sandboxes."""
+    await manager.warm_pool()
+    pooled = list(manager._pool)
+
+    await manager.cleanup()
+
+    assert all(sandbox.cleaned_up for sandbox in pooled)
+    assert manager.get_stats()["pool_size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_pooled_sandbox(manager):
+    """Tests that the sandbox client releases to the pool instead of destroying."""
+    client = LocalSandboxClient(manager=manager)
+    await manager.warm_pool()
+
+    await client.create()
+    sandbox = client.sandbox
+    await client.cleanup()
+    await client.create()
+
+    assert client.sandbox is sandbox
+    assert not sandbox.cleaned_up
+    await client.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_acquired_sandbox_is_not_evicted_as_idle(manager):
+    """Tests that the idle sweep keeps sandboxes that are still acquired."""
+    manager.idle_timeout = 0
+    sandbox_id = await manager.acquire()
+    await asyncio.sleep(0.01)
+
+    await manager._cleanup_idle_sandboxes()
+
+    assert sandbox_id in manager._sandboxes
+    assert not manager._sandboxes[sandbox_id].cleaned_up
+
+
+@pytest.mark.asyncio
+async def test_client_shutdown_drains_pool(manager):
+    """Tests that shutting the client down destroys its sandbox and the pool."""
+    client = LocalSandboxClient(manager=manager)
+    await manager.warm_pool()
+    await client.create()
+
+    await client.shutdown()
+
+    assert all(sandbox.cleaned_up for sandbox in FakeSandbox.instances)
+    assert client.manager is None
+
+
+@pytest.mark.asyncio
+async def test_client_keep_alive_defers_cleanup(manager):
+    """Tests that cleanup inside keep_alive waits for the outermost block."""
+    client = LocalSandboxClient(manager=manager)
+    await client.create()
+    sandbox = client.sandbox
+
+    async with client.keep_alive():
+        async with client.keep_alive():
+            await client.cleanup()
+        assert client.sandbox is sandbox
+
+    assert client.sandbox is None
+    assert sandbox in manager._pool
+
+
+def live_sandboxes() -> int:
+    return sum(1 for sandbox in FakeSandbox.instances if not sandbox.cleaned_up)
+
+
+@pytest.mark.asyncio
+async def test_pooled_sandboxes_count_against_max(manager):
+    """Tests that acquired plus pooled and warming sandboxes never exceed max_sandboxes."""
+    manager.max_sandboxes = 3
+    await manager.warm_pool()
+
+    ids = [await manager.acquire() for _ in range(2)]
+    await manager.warm_pool()
+
+    assert manager.get_stats()["pool_size"] == 1  # only one slot left for the pool
+    assert live_sandboxes() == 3
+
+    ids.append(await manager.acquire())
+    await manager.warm_pool()
+
+    assert manager.get_stats()["pool_hits"] == 3
+    assert manager.get_stats()["pool_size"] == 0
+    with pytest.raises(RuntimeError, match="Maximum number of sandboxes"):
+        await manager.acquire()
+    assert live_sandboxes() == 3
+
+
+@pytest.mark.asyncio
+async def test_cold_start_at_limit_replaces_pooled_sandbox(manager):
+    """Tests that a pooled sandbox gives way to an on-demand one at the limit."""
+    manager.max_sandboxes = 3
+    await manager.warm_pool()
+    await manager.acquire()
+    await manager.warm_pool()
+    oldest = manager._pool[0]
+
+    await manager.acquire(SandboxSettings(image="ubuntu:latest"))
+
+    assert oldest.cleaned_up
+    assert manager.get_stats()["pool_size"] == 1
+    assert live_sandboxes() == 3
@@ -0,0 +1,122 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from open_manus.app import llm_cache
+from open_manus.app.llm_cache import CompletionCache, SQLiteCacheStore, make_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def store():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteCacheStore(Path(tmp) / "cache.sqlite", ttl=60, max_bytes=1000)
+        yield store
+        store.close()
+
+
+def test_cache_key_is_stable():
+    """Tests that keys ignore dict ordering but change with anything affecting the response."""
+    messages = [{"role": "user", "content": "hi"}]
+    key = make_cache_key("ask", "gpt-4o", messages, 0.0, tool_choice="auto")
+
+    assert key == make_cache_key(
+        "ask", "gpt-4o", [{"content": "hi", "role": "user"}], 0.0, tool_choice="auto"
+    )
+    assert key != make_cache_key("ask_tool", "gpt-4o", messages, 0.0, tool_choice="auto")
+    assert key != make_cache_key("ask", "gpt-4o-mini", messages, 0.0, tool_choice="auto")
+    assert key != make_cache_key("ask", "gpt-4o", messages, 0.7, tool_choice="auto")
+    assert key != make_cache_key("ask", "gpt-4o", messages, 0.0, tool_choice="none")
+
+
+@pytest.mark.parametrize(
+    "temperature, force, expected",
+    [
+        (0.0, None, True),
+        (None, None, True),
+        (0.7, None, False),
+        (0.7, True, True),
+        (0.0, False, False),
+    ],
+)
+def test_temperature_bypass_and_force(temperature, force, expected):
+    """Tests that only deterministic requests are cached unless forced either way."""
+    cache = CompletionCache()
+
+    assert cache.should_use(temperature, force) is expected
+    assert cache.get_stats()["bypassed"] == (0 if expected else 1)
+
+
+@pytest.mark.asyncio
+async def test_memory_entries_expire(clock):
+    """Tests that the memory tier honours the TTL."""
+    cache = CompletionCache(ttl=60)
+    await cache.set("key", "answer")
+
+    clock.now += 59
+    assert await cache.get("key") == "answer"
+    clock.now += 1
+    assert await cache.get("key") is None
+    assert cache.get_stats()["memory_size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disk_entries_expire(clock, store):
+    """Tests that disk entries expire, including copies promoted to memory."""
+    await CompletionCache(store=store).set("key", {"content": "answer"})
+    cache = CompletionCache(store=store)
+
+    clock.now += 30
+    assert await cache.get("key") == {"content": "answer"}
+    assert cache.get_stats()["disk_hits"] == 1
+
+    # The promoted copy keeps the disk expiry instead of a fresh TTL
+    clock.now += 30
+    assert await cache.get("key") is None
+    assert store.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_corrupt_disk_entry_is_a_miss(store):
+    """Tests that an undecodable row is treated as a miss and deleted."""
+    await CompletionCache(store=store).set("key", "answer")
+    with sqlite3.connect(str(store.path)) as conn:
+        conn.execute("UPDATE completions SET value = '{truncated' WHERE key = 'key'")
+
+    cache = CompletionCache(store=store)
+
+    assert await cache.get("key") is None
+    assert cache.get_stats()["misses"] == 1
+    assert store.get("key") is None
+
+
+def test_store_evicts_least_recently_used(clock, store):
+    """Tests that the store drops least recently used entries once over max_bytes."""
+    for key in ("a", "b", "c"):
+        store.set(key, "x" * 400)
+        clock.now += 1
+    assert store.get("a") is None  # 1200 bytes > 1000, oldest entry went first
+
+    store.get("b")
+    clock.now += 1
+    assert store.set("d", "x" * 400) == 1
+
+    assert store.get("b") is not None
+    assert store.get("c") is None
+    assert store.get("d") is not None
@@ -0,0 +1,74 @@
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from open_manus.app.tool.bash import Bash, _OutputBuffer
+
+
+@pytest_asyncio.fixture(scope="function")
+async def bash() -> AsyncGenerator[Bash, None]:
+    """Creates a bash tool with a running session."""
+    tool = Bash()
+    await tool.execute(restart=True)
+    try:
+        yield tool
+    finally:
+        tool._session.stop()
+        await tool._session._process.wait()
+
+
+@pytest.mark.asyncio
+async def test_output_error_and_exit_code(bash: Bash):
+    """Tests that stdout and stderr are separated and the exit code is kept."""
+    result = await bash.execute("echo out; echo err >&2; false")
+
+    assert result.output == "out"
+    assert result.error == "err"
+    assert bash._session.last_exit_code == 1
+
+
+@pytest.mark.asyncio
+async def test_commands_ending_in_background_job(bash: Bash):
+    """Tests that a command ending with & does not break the sentinel."""
+    await bash.execute("sleep 0.1 &")
+    result = await bash.execute("echo next")
+
+    assert result.output == "next"
+
+
+@pytest.mark.asyncio
+async def test_large_output_keeps_head_and_tail(bash: Bash):
+    """Tests that a large output is truncated in the middle."""
+    bash._session._readers["stdout"].limit = 1000
+    result = await bash.execute("seq 1 100000")
+
+    assert result.output.startswith("1\n2\n3\n")
+    assert result.output.endswith("99999\n100000")
+    assert "bytes truncated" in result.output
+
+
+@pytest.mark.asyncio
+async def test_output_callback_streams_chunks(bash: Bash):
+    """Tests that output is reported while the command runs."""
+    chunks = []
+
+    async def on_output(stream: str, text: str) -> None:
+        chunks.append((stream, text))
+
+    bash.output_callback = on_output
+    await bash.execute("echo step1; sleep 0.2; echo step2 >&2")
+
+    assert ("stdout", "step1\n") in chunks
+    assert ("stderr", "step2\n") in chunks
+
+
+def test_output_buffer_truncation():
+    """Tests head/tail retention of the output buffer."""
+    buffer = _OutputBuffer(limit=8)
+    for chunk in (b"abc", b"def", b"ghi", b"jkl"):
+        buffer.append(chunk)
+
+    assert buffer.head == b"abcd"
+    assert buffer.tail == b"ijkl"
+    assert buffer.dropped == 4
@@ -0,0 +1,82 @@
+import asyncio
+import gc
+
+import pytest
+
+from open_manus.app.tool import browser_use_tool
+from open_manus.app.tool.browser_manager import BrowserManager
+from open_manus.app.tool.browser_use_tool import BrowserUseTool
+
+
+class FakeContext:
+    def __init__(self, browser: "FakeBrowser"):
+        self.browser = browser
+        self.closed = False
+
+    async def get_current_page(self):
+        return object()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, config=None):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = BrowserManager(max_contexts=1)
+    browser = FakeBrowser()
+    monkeypatch.setattr(manager, "_select_browser", lambda: browser)
+    monkeypatch.setattr(browser_use_tool, "get_browser_manager", lambda: manager)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_collected_tool_releases_its_context(manager):
+    """Tests that a tool garbage-collected without cleanup() frees its context slot."""
+    tool = BrowserUseTool(llm=None)
+    context = await tool._ensure_browser_initialized()
+
+    del tool
+    gc.collect()
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert context.closed
+    assert manager.get_stats()["open_contexts"] == 0
+    await asyncio.wait_for(manager.new_context(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_cleanup_releases_context_on_owning_manager(manager):
+    """Tests that cleanup() frees the slot of the manager that opened the context."""
+    tool = BrowserUseTool(llm=None)
+    context = await tool._ensure_browser_initialized()
+
+    await tool.cleanup()
+
+    assert context.closed
+    assert tool.context is None
+    await asyncio.wait_for(manager.new_context(), timeout=1)
+
+
+def test_release_after_loop_closed_only_warns():
+    """Tests that releasing on a closed loop does not start a new one."""
+    manager = BrowserManager(max_contexts=1)
+    browser = FakeBrowser()
+    manager._select_browser = lambda: browser
+    loop = asyncio.new_event_loop()
+    context = loop.run_until_complete(manager.new_context())
+    loop.close()
+
+    manager.release_context_threadsafe(context)
+
+    assert not context.closed
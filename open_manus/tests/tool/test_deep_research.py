@@ -0,0 +1,138 @@
+from typing import List
+
+import pytest
+
+from open_manus.app.tool.deep_research import (
+    DEPTH_DISCOUNT,
+    DeepResearch,
+    ResearchBudget,
+    ResearchContext,
+    ResearchFrontier,
+    ResearchInsight,
+)
+
+
+def insights(*scores: float) -> List[ResearchInsight]:
+    return [
+        ResearchInsight(
+            content=f"insight {i}", source_url=f"https://example.com/{i}", relevance_score=score
+        )
+        for i, score in enumerate(scores)
+    ]
+
+
+def drain(frontier: ResearchFrontier) -> List[str]:
+    queries = []
+    while (item := frontier.pop()) is not None:
+        queries.append(item.query)
+    return queries
+
+
+def test_pop_order_follows_expected_value():
+    """Tests that queries are popped by descending expected value."""
+    frontier = ResearchFrontier(max_depth=3)
+    frontier.push("battery recycling costs", depth=1, parent_insights=insights(0.4))
+    frontier.push("lithium supply chain", depth=0)
+    frontier.push("cathode chemistry trends", depth=1, parent_insights=insights(0.9, 0.7))
+    frontier.push("grid storage demand", depth=2, parent_insights=insights(0.9))
+
+    assert drain(frontier) == [
+        "lithium supply chain",  # 1.0
+        "cathode chemistry trends",  # 0.8 * 0.8
+        "grid storage demand",  # 0.64 * 0.9
+        "battery recycling costs",  # 0.8 * 0.4
+    ]
+
+
+def test_ties_do_not_depend_on_push_order():
+    """Tests that equally valued queries pop in the same order however they were queued."""
+    queries = [("wind turbines", 1), ("solar panels", 1), ("hydro dams", 0), ("tidal power", 1)]
+    orders = []
+    for ordering in (queries, queries[::-1], queries[1:] + queries[:1]):
+        frontier = ResearchFrontier(max_depth=3)
+        for query, depth in ordering:
+            frontier.push(query, depth=depth, parent_insights=insights(0.8) if depth else None)
+        orders.append(drain(frontier))
+
+    assert orders[0] == orders[1] == orders[2]
+    assert orders[0] == ["hydro dams", "solar panels", "tidal power", "wind turbines"]
+
+
+def test_visited_results_halve_branch_value():
+    """Tests the novelty penalty for a branch whose search returned only visited URLs."""
+    frontier = ResearchFrontier(max_depth=3)
+    parent = insights(1.0)
+
+    stale = frontier.push("revenue by segment", depth=1, parent_insights=parent, result_novelty=0.0)
+    fresh = frontier.push("regional margins", depth=1, parent_insights=parent, result_novelty=1.0)
+
+    assert fresh.score == pytest.approx(DEPTH_DISCOUNT)
+    assert stale.score == pytest.approx(fresh.score / 2)
+    assert drain(frontier) == ["regional margins", "revenue by segment"]
+
+
+def test_overlapping_and_duplicate_queries_are_penalized():
+    """Tests that queries similar to queued ones lose value and duplicates are dropped."""
+    frontier = ResearchFrontier(max_depth=3)
+    frontier.push("apple quarterly revenue", depth=0)
+
+    assert frontier.push("Apple quarterly revenue?", depth=0) is None
+    similar = frontier.push("apple quarterly profit", depth=0)
+    assert similar.score == pytest.approx(0.5)  # 2 of 4 terms overlap
+    assert frontier.push("too deep", depth=3) is None
+
+
+@pytest.mark.parametrize(
+    "budget, usage",
+    [
+        (ResearchBudget(max_tokens=1000), {"tokens_used": 900}),
+        (ResearchBudget(max_requests=10), {"requests_used": 9}),
+        (ResearchBudget(time_limit=14.0), {"elapsed": 10.0, "rounds": 2}),
+    ],
+    ids=["tokens", "requests", "time"],
+)
+def test_frontier_stops_when_budget_is_exhausted(budget, usage):
+    """Tests that no more queries are scheduled once the next one would exceed the budget."""
+    frontier = ResearchFrontier(max_depth=3)
+    frontier.push("quarterly results", depth=0)
+    frontier.push("analyst forecasts", depth=0)
+    context = ResearchContext(query="earnings", expansions=3, **usage)
+
+    assert budget.can_afford(ResearchContext(query="earnings"))
+    assert frontier.next_batch(2, budget, context) == []
+    assert len(frontier) == 2
+
+
+def test_batch_is_cut_to_remaining_budget():
+    """Tests that a round only takes as many queries as the budget still covers."""
+    frontier = ResearchFrontier(max_depth=3)
+    for query in ("quarterly results", "analyst forecasts", "insider trading"):
+        frontier.push(query, depth=0)
+    # 300 tokens and 2 requests per expansion so far
+    context = ResearchContext(query="earnings", expansions=3, tokens_used=900, requests_used=6)
+
+    assert len(frontier.next_batch(3, ResearchBudget(max_tokens=1500), context)) == 1
+    assert len(frontier.next_batch(3, ResearchBudget(max_requests=11), context)) == 2
+    assert len(frontier) == 0
+
+
+@pytest.mark.asyncio
+async def test_non_positive_limits_are_normalized(monkeypatch):
+    """Tests that a zero time limit or budget does not fail the budget validation."""
+    budgets = []
+
+    async def optimize(self, query, context=None):
+        return query
+
+    async def research(self, context, query, results_count, budget):
+        budgets.append(budget)
+
+    monkeypatch.setattr(DeepResearch, "_generate_optimized_query", optimize)
+    monkeypatch.setattr(DeepResearch, "_research_graph", research)
+
+    summary = await DeepResearch.model_construct(search_tool=None, llm=None).execute(
+        "earnings", time_limit_seconds=0, token_budget=0, request_budget=-5
+    )
+
+    assert summary.query == "earnings"
+    assert budgets == [ResearchBudget(time_limit=1)]
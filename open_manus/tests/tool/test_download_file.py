@@ -0,0 +1,385 @@
+import asyncio
+import hashlib
+import json
+import tempfile
+from pathlib import Path
+from typing import AsyncGenerator
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from open_manus.app.exceptions import ToolError
+from open_manus.app.tool.tool_download_file import DownloadFile, DownloadStore, FileDownloader
+
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+ETAG = '"v1"'
+
+
+class StubServer:
+    """Local HTTP server serving PAYLOAD with optional Range support."""
+
+    def __init__(self):
+        self.payload = PAYLOAD
+        self.etag = ETAG
+        self.accept_ranges = True
+        self.truncate_to: int = 0
+        self.delay = 0.0
+        self.requests = []
+        self.bytes_sent = 0
+        self.runner = None
+        self.base_url = ""
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests.append(dict(request.headers))
+        headers = {"ETag": self.etag} if self.etag else {}
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers=headers)
+        range_header = request.headers.get("Range")
+        if_range = request.headers.get("If-Range")
+        use_range = (
+            self.accept_ranges
+            and range_header
+            and (if_range is None or if_range == self.etag)
+        )
+        if self.accept_ranges:
+            headers["Accept-Ranges"] = "bytes"
+
+        if use_range:
+            start, _, end = range_header[len("bytes="):].partition("-")
+            start = int(start)
+            end = int(end) if end else len(self.payload) - 1
+            if start >= len(self.payload):
+                return web.Response(status=416, headers=headers)
+            body = self.payload[start : end + 1]
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(self.payload)}"
+            status = 206
+        else:
+            body = self.payload
+            status = 200
+
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = len(body)
+        await response.prepare(request)
+        await asyncio.sleep(self.delay)
+        if self.truncate_to and not use_range:
+            # 模拟传输中断：只发送部分数据后断开连接
+            await response.write(body[: self.truncate_to])
+            self.bytes_sent += self.truncate_to
+            await asyncio.sleep(0.2)  # let the client consume what was sent
+            request.transport.close()
+            return response
+        await response.write(body)
+        self.bytes_sent += len(body)
+        await response.write_eof()
+        return response
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/{name}", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def server() -> AsyncGenerator[StubServer, None]:
+    """Starts a local stub file server."""
+    stub = StubServer()
+    await stub.start()
+    try:
+        yield stub
+    finally:
+        await stub.stop()
+
+
+@pytest.fixture(scope="function")
+def temp_dir() -> Path:
+    """Creates a temporary directory for testing."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield Path(tmp_dir)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def tool(temp_dir: Path) -> AsyncGenerator[DownloadFile, None]:
+    """Creates a download tool saving into the temporary directory."""
+    download_tool = DownloadFile(download_root=temp_dir)
+    try:
+        yield download_tool
+    finally:
+        await download_tool.manager.close()
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_download_streams_and_verifies(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests a plain download with checksum verification."""
+    result = await tool.execute(
+        url=f"{server.base_url}/report.pdf", sha256=sha256(PAYLOAD)
+    )
+
+    assert result.error is None
+    saved = next(temp_dir.rglob("report.pdf"))
+    assert saved.read_bytes() == PAYLOAD
+    assert not list(temp_dir.rglob("*.part*"))
+    assert sha256(PAYLOAD) in result.output
+
+
+@pytest.mark.asyncio
+async def test_checksum_mismatch(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that a checksum mismatch fails and leaves no file behind."""
+    result = await tool.execute(url=f"{server.base_url}/report.pdf", sha256="0" * 64)
+
+    assert result.error and "Checksum mismatch" in result.error
+    assert not list(temp_dir.glob("20*/*"))
+
+
+@pytest.mark.asyncio
+async def test_resume_after_interrupted_download(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that an interrupted download resumes with a Range request."""
+    url = f"{server.base_url}/report.pdf"
+
+    server.truncate_to = 300_000
+    result = await tool.execute(url=url)
+    assert result.error
+    part = next(temp_dir.rglob("*.part"))
+    assert part.stat().st_size == 300_000
+
+    server.truncate_to = 0
+    server.bytes_sent = 0
+    result = await tool.execute(url=url, sha256=sha256(PAYLOAD))
+
+    assert result.error is None
+    assert server.requests[-1]["Range"] == "bytes=300000-"
+    assert server.requests[-1]["If-Range"] == ETAG
+    assert server.bytes_sent == len(PAYLOAD) - 300_000
+    assert next(temp_dir.rglob("report.pdf")).read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_resume_restarts_when_file_changed(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that a partial file is discarded when the ETag changed."""
+    url = f"{server.base_url}/report.pdf"
+
+    server.truncate_to = 300_000
+    await tool.execute(url=url)
+
+    server.truncate_to = 0
+    server.etag = '"v2"'
+    server.payload = PAYLOAD[::-1]
+    result = await tool.execute(url=url, sha256=sha256(PAYLOAD[::-1]))
+
+    assert result.error is None
+    assert next(temp_dir.rglob("report.pdf")).read_bytes() == PAYLOAD[::-1]
+
+
+@pytest.mark.asyncio
+async def test_no_resume_without_validators(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that a partial file is downloaded again when the server sent no validators."""
+    url = f"{server.base_url}/report.pdf"
+    server.etag = None
+
+    server.truncate_to = 300_000
+    await tool.execute(url=url)
+    assert next(temp_dir.rglob("*.part")).stat().st_size == 300_000
+
+    # Same length, different content: only a restart can produce the right file
+    server.truncate_to = 0
+    server.payload = PAYLOAD[::-1]
+    result = await tool.execute(url=url, sha256=sha256(PAYLOAD[::-1]))
+
+    assert result.error is None
+    assert "Range" not in server.requests[-1]
+    assert next(temp_dir.rglob("report.pdf")).read_bytes() == PAYLOAD[::-1]
+
+
+@pytest.mark.asyncio
+async def test_no_segment_resume_without_validators(server: StubServer, temp_dir: Path):
+    """Tests that finished segments are not reused when the sidecar has no validators."""
+    url = f"{server.base_url}/data.bin"
+    server.etag = None
+    save_path = temp_dir / "data.bin"
+    part_path, meta_path = FileDownloader.part_paths(save_path)
+    half = len(PAYLOAD) // 2
+    part_path.write_bytes(PAYLOAD[:half] + bytes(len(PAYLOAD) - half))
+    meta_path.write_text(
+        json.dumps(
+            {
+                "url": url,
+                "etag": None,
+                "last_modified": None,
+                "total": len(PAYLOAD),
+                "segments": [
+                    {"start": 0, "end": half - 1, "done": True},
+                    {"start": half, "end": len(PAYLOAD) - 1, "done": False},
+                ],
+            }
+        )
+    )
+    server.payload = PAYLOAD[::-1]
+
+    async with aiohttp.ClientSession() as session:
+        info = await FileDownloader(session, max_segments=1).download(url, save_path)
+
+    assert info.resumed_from == 0
+    assert save_path.read_bytes() == PAYLOAD[::-1]
+
+
+@pytest.mark.asyncio
+async def test_segmented_download(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests concurrent segmented download on a server accepting ranges."""
+    tool.max_segments = 4
+    tool.segment_min_size = 64 * 1024
+    result = await tool.execute(
+        url=f"{server.base_url}/data.bin", sha256=sha256(PAYLOAD)
+    )
+
+    assert result.error is None
+    ranges = sorted(r["Range"] for r in server.requests if "Range" in r)
+    assert len(ranges) == 4
+    assert next(temp_dir.rglob("data.bin")).read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_no_segments_without_range_support(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that servers without range support get a single stream."""
+    server.accept_ranges = False
+    tool.segment_min_size = 64 * 1024
+    result = await tool.execute(url=f"{server.base_url}/data.bin")
+
+    assert result.error is None
+    assert len(server.requests) == 1
+    assert next(temp_dir.rglob("data.bin")).read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_incomplete_download_is_rejected(temp_dir: Path):
+    """Tests content-length verification of a short body."""
+
+    async def short(request: web.Request) -> web.Response:
+        # Claims a 5000-byte file but only ever serves the first 1000 bytes
+        return web.Response(
+            body=PAYLOAD[1:1000], headers={"Content-Range": "bytes 1-999/5000"}, status=206
+        )
+
+    app = web.Application()
+    app.router.add_get("/{name}", short)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        save_path = temp_dir / "short.bin"
+        part_path, meta_path = FileDownloader.part_paths(save_path)
+        part_path.write_bytes(b"x")
+        meta_path.write_text(
+            '{"url": "http://127.0.0.1:%d/short.bin", "etag": "\\"v1\\""}' % port
+        )
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(ToolError) as exc_info:
+                await FileDownloader(session).download(
+                    f"http://127.0.0.1:{port}/short.bin", save_path
+                )
+        assert "got 1000 of 5000 bytes" in exc_info.value.message
+        assert not save_path.exists()
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_repeated_download_reuses_stored_file(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that a URL fetched before is served from the store."""
+    url = f"{server.base_url}/report.pdf"
+
+    await tool.execute(url=url)
+    result = await tool.execute(url=url, filename="copy.pdf")
+
+    assert result.error is None
+    assert "reused" in result.output
+    assert len(server.requests) == 1
+    first, copy = next(temp_dir.rglob("report.pdf")), next(temp_dir.rglob("copy.pdf"))
+    assert copy.read_bytes() == PAYLOAD
+    assert first.stat().st_ino != copy.stat().st_ino
+
+
+@pytest.mark.asyncio
+async def test_editing_saved_file_keeps_store_intact(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that an in-place edit of a downloaded file does not change later cache hits."""
+    url = f"{server.base_url}/report.pdf"
+
+    await tool.execute(url=url)
+    with open(next(temp_dir.rglob("report.pdf")), "r+b") as f:
+        f.write(b"edited")
+    result = await tool.execute(url=url, filename="again.pdf")
+
+    assert "reused" in result.output
+    assert next(temp_dir.rglob("again.pdf")).read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated(server: StubServer, tool: DownloadFile):
+    """Tests that an expired entry is revalidated with its ETag."""
+    tool.manager.store.ttl = 0
+    url = f"{server.base_url}/report.pdf"
+
+    await tool.execute(url=url)
+    server.bytes_sent = 0
+    result = await tool.execute(url=url)
+
+    assert result.error is None
+    assert server.requests[-1]["If-None-Match"] == ETAG
+    assert server.bytes_sent == 0
+    assert tool.manager.stats["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced(server: StubServer, tool: DownloadFile, temp_dir: Path):
+    """Tests that concurrent downloads of one URL share a single transfer."""
+    server.delay = 0.2
+    url = f"{server.base_url}/report.pdf"
+
+    results = await asyncio.gather(
+        *(tool.execute(url=url, filename=f"report_{i}.pdf") for i in range(5))
+    )
+
+    assert all(result.error is None for result in results)
+    assert len(server.requests) == 1
+    assert tool.manager.stats["coalesced"] == 4
+    assert len(list(temp_dir.rglob("report_*.pdf"))) == 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_store_adds(temp_dir: Path):
+    """Tests that concurrent adds from worker threads keep every index entry."""
+    store = DownloadStore(temp_dir / ".store")
+
+    for round_ in range(10):
+        paths = []
+        for i in range(8):
+            path = temp_dir / f"staged_{round_}_{i}"
+            path.write_bytes(b"%d-%d" % (round_, i))
+            paths.append(path)
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    store.add, f"http://files/{path.name}", path, sha256(path.name.encode()), 3, {}
+                )
+                for path in paths
+            )
+        )
+
+    reloaded = DownloadStore(temp_dir / ".store")
+    assert len(reloaded._load()) == 80
+    assert not list((temp_dir / ".store").glob("*.tmp"))
@@ -0,0 +1,123 @@
+import pytest
+
+from open_manus.app.tool.search import health as health_module
+from open_manus.app.tool.search.health import BreakerState, EngineHealthTracker
+from open_manus.app.tool.web_search import WebSearch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(health_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def tracker(clock):
+    return EngineHealthTracker(failure_threshold=2, cooldown=60)
+
+
+def state(tracker: EngineHealthTracker, engine_name: str) -> str:
+    return tracker.get_stats()[engine_name]["state"]
+
+
+def test_breaker_cycle(tracker, clock):
+    """Tests closed -> open -> half-open probe -> closed."""
+    tracker.record_failure("google", 1.0)
+    assert state(tracker, "google") == BreakerState.CLOSED
+    assert tracker.allow_request("google")
+
+    tracker.record_failure("google", 1.0)
+    assert state(tracker, "google") == BreakerState.OPEN
+    assert not tracker.allow_request("google")
+    assert tracker.seconds_until_available(["google"]) == pytest.approx(60)
+
+    clock.now += 60
+    assert state(tracker, "google") == BreakerState.HALF_OPEN
+    assert tracker.allow_request("google")
+    assert not tracker.allow_request("google")  # only one probe at a time
+
+    tracker.record_success("google", 0.5)
+    assert state(tracker, "google") == BreakerState.CLOSED
+    assert tracker.allow_request("google")
+
+
+def test_failed_probe_reopens_breaker(tracker, clock):
+    """Tests that a failing half-open probe opens the breaker for another cooldown."""
+    tracker.record_failure("bing", 1.0)
+    tracker.record_failure("bing", 1.0)
+    clock.now += 60
+    assert tracker.allow_request("bing")
+
+    tracker.record_failure("bing", 1.0)
+
+    assert state(tracker, "bing") == BreakerState.OPEN
+    clock.now += 30
+    assert not tracker.allow_request("bing")
+
+
+def test_released_probe_can_be_claimed_again(tracker, clock):
+    """Tests that a cancelled probe does not keep the engine blocked."""
+    tracker.record_failure("bing", 1.0)
+    tracker.record_failure("bing", 1.0)
+    clock.now += 60
+    assert tracker.allow_request("bing")
+
+    tracker.release("bing")
+
+    assert tracker.allow_request("bing")
+
+
+def test_rank_orders_failing_engines_by_ewma(tracker, clock):
+    """Tests that healthy engines keep their order and failing ones go last by health."""
+    tracker.record_success("google", 2.0)
+    tracker.record_success("baidu", 0.1)
+    for _ in range(3):
+        tracker.record_success("bing", 0.5)
+    tracker.record_failure("bing", 0.5)
+    tracker.record_failure("duckduckgo", 0.5)
+    tracker.record_failure("duckduckgo", 0.5)
+    tracker.record_success("duckduckgo", 0.5)
+    tracker.record_failure("duckduckgo", 0.5)
+
+    order = tracker.rank(["duckduckgo", "bing", "google", "baidu"])
+
+    assert order == ["google", "baidu", "bing", "duckduckgo"]
+
+    clock.now += 60
+    assert tracker.rank(["duckduckgo", "bing", "google", "baidu"]) == [
+        "duckduckgo",
+        "bing",
+        "google",
+        "baidu",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_empty_result_is_not_a_failure(monkeypatch, tracker):
+    """Tests that only exceptions count against an engine, not empty result sets."""
+    monkeypatch.setattr(health_module, "_tracker", tracker)
+    web_search = WebSearch()
+    outcomes = iter([[], RuntimeError("rate limited")])
+
+    async def perform(engine, query, num_results, search_params):
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(web_search, "_perform_search_with_engine", perform)
+
+    assert await web_search._run_engine("google", "obscure query", 5, {}) == []
+    assert tracker.get_stats()["google"]["consecutive_failures"] == 0
+
+    assert await web_search._run_engine("google", "obscure query", 5, {}) == []
+    assert tracker.get_stats()["google"]["consecutive_failures"] == 1
@@ -0,0 +1,122 @@
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from open_manus.app.exceptions import ToolError
+from open_manus.app.tool.file_operators import (
+    FileStat,
+    LocalFileOperator,
+    SandboxFileOperator,
+)
+from open_manus.app.tool.str_replace_editor import StrReplaceEditor
+
+
+class FakeSandboxClient:
+    """Sandbox client stand-in running on the host that counts round-trips."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.sandbox = object()
+        self.calls: List[str] = []
+
+    def _host(self, path: str) -> Path:
+        return self.root / path
+
+    async def run_command(self, command: str, timeout=None) -> str:
+        self.calls.append("run_command")
+        process = await asyncio.create_subprocess_shell(
+            command, cwd=self.root, stdout=asyncio.subprocess.PIPE
+        )
+        stdout, _ = await process.communicate()
+        return stdout.decode().strip()
+
+    async def read_file(self, path: str) -> str:
+        self.calls.append("read_file")
+        return self._host(path).read_text()
+
+    async def write_file(self, path: str, content: str) -> None:
+        self.calls.append("write_file")
+        self._host(path).write_text(content)
+
+    async def read_files(self, paths: List[str]) -> Dict[str, bytes]:
+        self.calls.append("read_files")
+        return {path: self._host(path).read_bytes() for path in paths}
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        self.calls.append("write_files")
+        for path, content in files.items():
+            self._host(path).parent.mkdir(parents=True, exist_ok=True)
+            self._host(path).write_text(content)
+
+
+@pytest.fixture
+def temp_dir() -> Path:
+    """Creates a temporary directory for testing."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield Path(tmp_dir)
+
+
+@pytest.mark.asyncio
+async def test_local_batch_operations(temp_dir: Path):
+    """Tests batch write, read and stat on the local filesystem."""
+    operator = LocalFileOperator()
+    files = {temp_dir / f"f{i}.txt": f"content {i}" for i in range(3)}
+
+    await operator.write_many(files)
+    contents = await operator.read_many(list(files))
+    stats = await operator.stat_many([temp_dir, temp_dir / "f0.txt", temp_dir / "missing"])
+
+    assert contents == {str(path): content for path, content in files.items()}
+    assert stats == {
+        str(temp_dir): FileStat(exists=True, is_dir=True),
+        str(temp_dir / "f0.txt"): FileStat(exists=True, is_dir=False),
+        str(temp_dir / "missing"): FileStat(exists=False),
+    }
+
+
+@pytest.mark.asyncio
+async def test_local_read_many_missing_file(temp_dir: Path):
+    """Tests that a missing file fails the batch read."""
+    with pytest.raises(ToolError):
+        await LocalFileOperator().read_many([temp_dir / "missing.txt"])
+
+
+@pytest.mark.asyncio
+async def test_sandbox_stat_many_single_command(temp_dir: Path):
+    """Tests that the sandbox checks all paths with one command."""
+    (temp_dir / "dir with space").mkdir()
+    (temp_dir / "a.txt").write_text("a")
+    client = FakeSandboxClient(temp_dir)
+    operator = SandboxFileOperator()
+    operator.sandbox_client = client
+
+    stats = await operator.stat_many(
+        [temp_dir / "dir with space", temp_dir / "a.txt", temp_dir / "nope"]
+    )
+
+    assert client.calls == ["run_command"]
+    assert [stat.exists for stat in stats.values()] == [True, True, False]
+    assert [stat.is_dir for stat in stats.values()] == [True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_sandbox_edit_round_trips(temp_dir: Path, monkeypatch):
+    """Tests that a sandboxed str_replace takes one stat, read and write round-trip each."""
+    (temp_dir / "app.py").write_text("x = 1\n")
+    client = FakeSandboxClient(temp_dir)
+    editor = StrReplaceEditor()
+    editor._sandbox_operator.sandbox_client = client
+    monkeypatch.setattr(editor, "_get_operator", lambda: editor._sandbox_operator)
+
+    await editor.execute(
+        command="str_replace",
+        path=str(temp_dir / "app.py"),
+        old_str="x = 1",
+        new_str="x = 2",
+    )
+
+    assert client.calls == ["run_command", "read_file", "write_file"]
+    assert (temp_dir / "app.py").read_text() == "x = 2\n"
@@ -0,0 +1,57 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from open_manus.app.tool import pdf_extract
+from open_manus.app.tool.pdf_extract import PDFPageCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(pdf_extract, "time", FakeClock())
+    with tempfile.TemporaryDirectory() as tmp:
+        # Each two-page document below takes 1004 bytes
+        cache = PDFPageCache(Path(tmp) / "pages.sqlite", max_bytes=2500)
+        yield cache
+        cache.close()
+
+
+def store(cache: PDFPageCache, file_hash: str) -> None:
+    cache.put_pages(file_hash, [(1, "x" * 500, []), (2, "y" * 500, [])])
+    cache.mark_complete(file_hash, 2)
+
+
+def test_least_recently_used_document_is_evicted(cache):
+    """Tests that documents are dropped least recently used first once over max_bytes."""
+    store(cache, "report")
+    store(cache, "invoice")
+    assert cache.page_count("report") == 2  # now more recent than invoice
+
+    store(cache, "thesis")
+
+    assert cache.page_count("invoice") is None
+    assert cache.page_count("report") == 2
+    assert cache.page_count("thesis") == 2
+    assert [page for page, _, _ in cache.get_pages("thesis", 1, 2)] == [1, 2]
+
+
+def test_partially_cached_document_is_not_served(cache):
+    """Tests that a document whose pages were evicted mid-extraction is never marked complete."""
+    cache.put_pages("large", [(1, "x" * 2000, [])])
+    store(cache, "small")  # evicts the first page of the large document
+
+    cache.put_pages("large", [(2, "y" * 100, [])])
+    cache.mark_complete("large", 2)
+
+    assert cache.page_count("large") is None
+    assert cache.page_count("small") == 2